@@ -0,0 +1,26 @@
+# backend/blogify/benchmarks/__init__.py
+"""Benchmarks for the Blogify backend.
+
+Run them from backend/blogify, e.g. ``python -m benchmarks.feed_plan``. Each
+benchmark works on a throwaway test database, so the configured database is
+never touched.
+"""
+import contextlib
+import os
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogify.settings')
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def benchmark_database(verbosity=0):
+    from django.test.utils import setup_databases, teardown_databases
+
+    old_config = setup_databases(verbosity=verbosity, interactive=False, aliases={'default'})
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
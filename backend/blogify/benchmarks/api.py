@@ -0,0 +1,278 @@
+# backend/blogify/benchmarks/api.py
+"""Latency and query counts for every REST endpoint, with a regression gate.
+
+    python -m benchmarks.api --users 200 --blogs 2000 --comments 5000
+    python -m benchmarks.api --save-baseline
+    python -m benchmarks.api --check
+
+Seeds ``--users`` users, ``--blogs`` blogs and ``--comments`` comments
+nested up to ``--reply-depth`` levels, then sends ``--iterations`` requests
+(after ``--warmup`` untimed ones) to every route in blog_module/urls.py and
+user_module/urls.py through the Django test client. Reported per case: p50,
+p95 and p99 latency in ms and the most queries a single request ran.
+
+``--save-baseline`` writes the results to ``--baseline``; ``--check`` compares
+against it and exits with status 1 when a case runs more queries than
+recorded, or its p95 grows by more than ``--p95-tolerance``. Query counts are
+exact and portable; latencies are only comparable on the machine, database
+and seed sizes the baseline was recorded with, so record one per setup.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from . import benchmark_database, setup_django
+
+DEFAULT_BASELINE = Path(__file__).with_name('api_baseline.json')
+PASSWORD = 'BenchPassword123'
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Fixture:
+    """Seeded rows the cases draw on, plus helpers to make fresh ones."""
+
+    def __init__(self, users, blogs, comments, reply_depth, rng):
+        from django.contrib.auth import get_user_model
+        from blog_module.models import Blog, Comment
+        from user_module import hashing
+        from .seed import seed_blogs, seed_comments, seed_users
+
+        User = get_user_model()
+        self.rng = rng
+        self.sequence = 0
+        self.user_ids = seed_users(users)
+        seed_blogs(self.user_ids, blogs, rng=rng)
+        self.published_ids = list(Blog.objects.filter(status=Blog.PUBLISHED).values_list('id', flat=True))
+        seed_comments(self.published_ids, self.user_ids, comments, max_depth=reply_depth, rng=rng)
+        self.comment_ids = list(Comment.objects.values_list('id', flat=True))
+
+        self.author = User.objects.get(id=self.user_ids[0])
+        self.author.password = hashing.make_password(PASSWORD)
+        self.author.save(update_fields=['password'])
+        self.own_blog_ids = list(Blog.objects.filter(author=self.author).values_list('id', flat=True))
+        if not self.own_blog_ids:
+            self.own_blog_ids = [self.new_blog().id]
+
+    def unique(self):
+        self.sequence += 1
+        return self.sequence
+
+    def new_blog(self):
+        from blog_module.models import Blog
+        return Blog.objects.create(author=self.author, title=f'Scratch blog {self.unique()}',
+                                   content='Scratch content', status=Blog.PUBLISHED)
+
+    def new_user(self, **fields):
+        from django.contrib.auth import get_user_model
+        number = self.unique()
+        return get_user_model().objects.create(username=f'scratch{number}', email=f'scratch{number}@example.com',
+                                               password='!', **fields)
+
+
+def _access_token(user):
+    from user_module.tokens import tokens_for_user
+    return str(tokens_for_user(user).access_token)
+
+
+def build_cases(fixture):
+    """Map ``case name -> (url name, prepare)``.
+
+    ``prepare()`` runs untimed before every request and returns
+    ``(method, path, body, user)``; ``user`` is authenticated with a bearer
+    token. Cases that consume state (delete, activate, ...) create it there.
+    """
+    from django.urls import reverse
+    from user_module.models import EmailDelivery
+
+    rng = fixture.rng
+    author = fixture.author
+
+    def blog_detail():
+        return 'get', reverse('blog_detail', args=[rng.choice(fixture.published_ids)]), None, None
+
+    def blog_delete():
+        return 'delete', reverse('blog_delete', args=[fixture.new_blog().id]), None, author
+
+    def comment_reply():
+        comment_id = rng.choice(fixture.comment_ids)
+        return 'post', reverse('comment_reply', args=[comment_id]), {'content': 'Benchmark reply'}, author
+
+    def register():
+        number = fixture.unique()
+        body = {'username': f'signup{number}', 'email': f'signup{number}@example.com', 'password': PASSWORD}
+        return 'post', reverse('register'), body, None
+
+    def activate():
+        user = fixture.new_user(activation_pin='123456')
+        return 'post', reverse('activate'), {'email': user.email, 'pin': '123456'}, None
+
+    def password_reset_confirm():
+        user = fixture.new_user(is_active=True, activation_pin='654321')
+        body = {'email': user.email, 'pin': '654321', 'new_password': PASSWORD}
+        return 'post', reverse('password_reset_confirmation'), body, None
+
+    def email_delivery_status():
+        delivery = EmailDelivery.objects.create(user=author, email=author.email, purpose=EmailDelivery.PASSWORD_RESET)
+        return 'get', reverse('email_delivery_status', args=[delivery.id]), None, None
+
+    def token_refresh():
+        from user_module.tokens import tokens_for_user
+        return 'post', reverse('token_refresh'), {'refresh': str(tokens_for_user(author))}, None
+
+    return {
+        'blog_list': ('blog_list', lambda: ('get', reverse('blog_list'), None, None)),
+        'blog_list (signed in)': ('blog_list', lambda: ('get', reverse('blog_list'), None, author)),
+        'blog_list (cursor)': ('blog_list', lambda: ('get', reverse('blog_list') + '?pagination=cursor', None, None)),
+        'blog_search': ('blog_search', lambda: ('get', reverse('blog_search') + '?q=benchmark', None, None)),
+        'blog_create': ('blog_create', lambda: ('post', reverse('blog_create'),
+                                                {'title': 'Benchmark post', 'content': 'Body', 'status': 'published'},
+                                                author)),
+        'blog_detail': ('blog_detail', blog_detail),
+        'blog_edit': ('blog_edit', lambda: ('put', reverse('blog_edit', args=[rng.choice(fixture.own_blog_ids)]),
+                                            {'title': 'Edited', 'content': 'Edited body', 'status': 'published'},
+                                            author)),
+        'blog_delete': ('blog_delete', blog_delete),
+        'comment_create': ('comment_create', lambda: ('post', reverse('comment_create', args=[
+            rng.choice(fixture.published_ids)]), {'content': 'Benchmark comment'}, author)),
+        'comment_reply': ('comment_reply', comment_reply),
+        'user-blogs': ('user-blogs', lambda: ('get', reverse('user-blogs'), None, author)),
+        'register': ('register', register),
+        'activate': ('activate', activate),
+        'login': ('login', lambda: ('post', reverse('login'), {'email': author.email, 'password': PASSWORD}, None)),
+        'logout': ('logout', lambda: ('post', reverse('logout'), None, author)),
+        'password_reset': ('password_reset', lambda: ('post', reverse('password_reset'), {'email': author.email},
+                                                      None)),
+        'password_reset_confirmation': ('password_reset_confirmation', password_reset_confirm),
+        'email_delivery_status': ('email_delivery_status', email_delivery_status),
+        'token': ('token', lambda: ('post', reverse('token'), {'email': author.email, 'password': PASSWORD}, None)),
+        'token_verify': ('token_verify', lambda: ('get', reverse('token_verify'), None, author)),
+        'token_refresh': ('token_refresh', token_refresh),
+    }
+
+
+def run_cases(cases, iterations, warmup=1, only=None):
+    """Time every case; returns ``{name: {p50_ms, p95_ms, p99_ms, queries, status}}``."""
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    results = {}
+    for name, (_, prepare) in cases.items():
+        if only and name not in only:
+            continue
+        latencies, queries, statuses = [], [], set()
+        for iteration in range(warmup + iterations):
+            method, path, body, user = prepare()
+            headers = {'HTTP_AUTHORIZATION': f'Bearer {_access_token(user)}'} if user else {}
+            send = getattr(client, method)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                if body is None:
+                    response = send(path, secure=True, **headers)
+                else:
+                    response = send(path, body, content_type='application/json', secure=True, **headers)
+                elapsed = (time.perf_counter() - started) * 1000
+            if iteration >= warmup:
+                latencies.append(elapsed)
+                queries.append(len(captured))
+                statuses.add(response.status_code)
+        results[name] = {
+            'p50_ms': round(_percentile(latencies, 0.50), 3),
+            'p95_ms': round(_percentile(latencies, 0.95), 3),
+            'p99_ms': round(_percentile(latencies, 0.99), 3),
+            'queries': max(queries, default=0),
+            'status': sorted(statuses),
+        }
+    return results
+
+
+def find_regressions(results, baseline, p95_tolerance):
+    """Return one message per case that got worse than ``baseline``."""
+    regressions = []
+    for name, recorded in baseline.get('cases', {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current['queries'] > recorded['queries']:
+            regressions.append(f'{name}: {current["queries"]} queries, baseline {recorded["queries"]}')
+        limit = recorded['p95_ms'] * (1 + p95_tolerance)
+        if current['p95_ms'] > limit:
+            regressions.append(f'{name}: p95 {current["p95_ms"]:.2f} ms, baseline {recorded["p95_ms"]:.2f} ms '
+                               f'(+{p95_tolerance:.0%} allowed)')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--blogs', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=3000)
+    parser.add_argument('--reply-depth', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', default='', help='Comma separated case names to run.')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results to --baseline.')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 if a case regressed against --baseline.')
+    parser.add_argument('--p95-tolerance', type=float, default=0.25,
+                        help='Allowed relative p95 growth for --check (default: 0.25).')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import override_settings
+
+    params = {key: getattr(args, key) for key in ('users', 'blogs', 'comments', 'reply_depth', 'seed')}
+    with benchmark_database(), override_settings(
+        ALLOWED_HOSTS=['testserver'],
+        EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        EMAIL_DISPATCH_MODE='sync',
+        PASSWORD_HASH_WORKERS=0,
+    ):
+        cache.clear()
+        fixture = Fixture(args.users, args.blogs, args.comments, args.reply_depth, random.Random(args.seed))
+        only = {name.strip() for name in args.only.split(',') if name.strip()}
+        results = run_cases(build_cases(fixture), args.iterations, args.warmup, only)
+
+    print(f'{args.users} users, {args.blogs} blogs, {args.comments} comments (depth {args.reply_depth}), '
+          f'{args.iterations} requests per case, {connection.vendor}')
+    print(f'{"case":<30} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"queries":>8}  status')
+    for name, result in results.items():
+        print(f'{name:<30} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f} '
+              f'{result["queries"]:>8}  {",".join(map(str, result["status"]))}')
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({'params': params, 'vendor': connection.vendor, 'cases': results},
+                                            indent=2, sort_keys=True) + '\n')
+        print(f'\nBaseline written to {args.baseline}')
+
+    if args.check:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get('params') != params:
+            print(f'\nBaseline was recorded with {baseline.get("params")}; latencies are not comparable.',
+                  file=sys.stderr)
+            return 2
+        regressions = find_regressions(results, baseline, args.p95_tolerance)
+        if regressions:
+            print('\nRegressions against the baseline:', file=sys.stderr)
+            for regression in regressions:
+                print(f'  {regression}', file=sys.stderr)
+            return 1
+        print('\nNo regressions against the baseline.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# backend/blogify/benchmarks/email_throughput.py
+"""Measure SMTP delivery throughput against a local debugging server.
+
+    python -m benchmarks.email_throughput --messages 500
+
+Compares a fresh connection per message (django.core.mail.send_mail, the
+old behaviour) with the pooled connection behind send_plain_email and with
+send_plain_email_batch.
+"""
+import argparse
+import time
+from . import setup_django
+from .smtp_sink import SMTPSink
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.core.mail import send_mail
+    from django.test.utils import override_settings
+    from user_module.utils import send_plain_email, send_plain_email_batch, smtp_pool
+
+    recipients = [f'reader{index}@example.com' for index in range(args.messages)]
+
+    def per_message_connection():
+        for recipient in recipients:
+            send_mail('Benchmark', 'Body', 'bench@example.com', [recipient], fail_silently=False)
+
+    def pooled():
+        for recipient in recipients:
+            send_plain_email('Benchmark', 'Body', recipient)
+
+    def batch():
+        send_plain_email_batch('Benchmark', 'Body', recipients)
+
+    with SMTPSink() as sink, override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+        EMAIL_HOST='127.0.0.1', EMAIL_PORT=sink.port,
+        EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+        EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        EMAIL_DELIVERY_PROVIDER='smtp', RESEND_API_KEY='', BREVO_API_KEY='',
+    ):
+        for label, run in (('connection per message', per_message_connection),
+                           ('pooled send_plain_email', pooled),
+                           ('send_plain_email_batch', batch)):
+            smtp_pool.close()
+            connections_before = sink.connections
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            print(f'{label:<26} {args.messages / elapsed:8.0f} msg/s  '
+                  f'({sink.connections - connections_before} connections)')
+
+
+if __name__ == '__main__':
+    main()
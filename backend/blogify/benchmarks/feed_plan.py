@@ -0,0 +1,67 @@
+# backend/blogify/benchmarks/feed_plan.py
+"""Compare the old UNION feed query with the indexed OR filter.
+
+    python -m benchmarks.feed_plan --rows 1000000
+
+Seeds ``--rows`` blogs, then prints the query plan and the median time of
+the page query and its COUNT for both shapes of the authenticated feed.
+"""
+import argparse
+import random
+import statistics
+import time
+from . import benchmark_database, setup_django
+
+
+def _timed(callable_, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callable_()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=9)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.db import connection
+    from django.db.models import Q
+    from blog_module.models import Blog
+    from .seed import seed_blogs, seed_users
+
+    with benchmark_database():
+        rng = random.Random(42)
+        user_ids = seed_users(args.users)
+        seed_blogs(user_ids, args.rows, rng=rng)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        user_id = rng.choice(user_ids)
+
+        published = Blog.objects.filter(status=Blog.PUBLISHED).select_related('author')
+        drafts = Blog.objects.filter(author_id=user_id, status=Blog.DRAFT).select_related('author')
+        shapes = {
+            'union (before)': published.union(drafts).order_by('-updated_at'),
+            'or filter (after)': Blog.objects.select_related('author').filter(
+                Q(status=Blog.PUBLISHED) | Q(author_id=user_id, status=Blog.DRAFT)
+            ).order_by('-updated_at', '-id'),
+        }
+
+        print(f'{args.rows} blogs, {args.users} users, {connection.vendor}')
+        for label, queryset in shapes.items():
+            page = queryset[:args.page_size]
+            print(f'\n== {label}')
+            print(page.explain())
+            page_ms = _timed(lambda: list(page.all()), args.repeat)
+            count_ms = _timed(lambda: queryset.all().count(), args.repeat)
+            print(f'page: {page_ms:.2f} ms  count: {count_ms:.2f} ms (median of {args.repeat})')
+
+
+if __name__ == '__main__':
+    main()
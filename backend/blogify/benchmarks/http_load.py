@@ -0,0 +1,124 @@
+# backend/blogify/benchmarks/http_load.py
+"""Compare concurrent-connection throughput of running servers.
+
+Start the same database behind both profiles, e.g.
+
+    SERVER_MODE=wsgi GUNICORN_BIND=127.0.0.1:8000 gunicorn -c gunicorn.conf.py
+    SERVER_MODE=asgi GUNICORN_BIND=127.0.0.1:8001 gunicorn -c gunicorn.conf.py
+
+then
+
+    python -m benchmarks.http_load wsgi=http://127.0.0.1:8000 asgi=http://127.0.0.1:8001 \\
+        --path /api/blogs/ --path /api/blogs/1/ --connections 200 --seconds 10
+
+Every connection is a keep-alive HTTP/1.1 client that sends GETs back to
+back for ``--seconds``. Reported per target: requests/s, errors and the
+median / p95 / p99 latency. Needs no Django setup and no third-party client.
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+import urllib.parse
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('server closed the connection')
+    status = int(status_line.split()[1])
+    # HTTP/1.0 servers close after each response unless told otherwise.
+    length, chunked, close = 0, False, status_line.startswith(b'HTTP/1.0')
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection':
+            close = value != 'keep-alive'
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def _connection(host, port, paths, headers, deadline, latencies, errors):
+    reader = writer = None
+    for path in itertools.cycle(paths):
+        if time.perf_counter() >= deadline:
+            break
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            request = (f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n{headers}'
+                       'Connection: keep-alive\r\n\r\n').encode()
+            started = time.perf_counter()
+            writer.write(request)
+            status, close = await _read_response(reader)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                errors.append(status)
+            if close:
+                writer.close()
+                writer = None
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors.append('connection')
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _run(url, paths, connections, seconds, headers):
+    parsed = urllib.parse.urlsplit(url)
+    host, port = parsed.hostname, parsed.port or 80
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _connection(host, port, paths, headers, deadline, latencies, errors) for _ in range(connections)
+    ))
+    return latencies, errors, time.perf_counter() - started
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('targets', nargs='+', help='NAME=URL of each running server.')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Path to request, may be repeated (default: /api/blogs/).')
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--token', help='Bearer token sent with every request.')
+    args = parser.parse_args(argv)
+
+    paths = args.paths or ['/api/blogs/']
+    headers = f'Authorization: Bearer {args.token}\r\n' if args.token else ''
+    for target in args.targets:
+        name, _, url = target.partition('=')
+        if not url or '://' in name:
+            name, url = '', target
+        latencies, errors, elapsed = asyncio.run(_run(url, paths, args.connections, args.seconds, headers))
+        print(f'{name or url:<8} {len(latencies) / elapsed:8.0f} req/s  {len(errors):6d} errors  '
+              f'p50 {statistics.median(latencies) if latencies else 0:7.1f} ms  '
+              f'p95 {_percentile(latencies, 0.95):7.1f} ms  p99 {_percentile(latencies, 0.99):7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# backend/blogify/benchmarks/login_throughput.py
+"""Measure login throughput and blog-list latency during a login storm.
+
+    python -m benchmarks.login_throughput --clients 32 --workers 0,1,2,4
+
+For every PASSWORD_HASH_WORKERS value, ``--clients`` threads post logins as
+fast as they can for ``--seconds`` while one reader thread keeps fetching
+the blog list. Reported per run: successful logins/s, 503 rejections and the
+median and p95 latency of the read endpoint. 0 workers is the old inline
+hashing.
+
+All threads share one process, so this models one gthread gunicorn worker
+with ``--clients`` + 1 threads (the wsgi profile in gunicorn.conf.py). It
+says nothing about plain sync workers, which serve one request at a time
+and gain nothing from the pool.
+"""
+import argparse
+import statistics
+import threading
+import time
+from . import benchmark_database, setup_django
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', default='0,1,2,4',
+                        help='Comma separated PASSWORD_HASH_WORKERS values to compare.')
+    parser.add_argument('--queue-depth', type=int, default=None,
+                        help='PASSWORD_HASH_QUEUE_DEPTH (default: 4 x workers).')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+    from user_module import hashing
+    from .seed import seed_blogs, seed_users
+
+    User = get_user_model()
+    with benchmark_database():
+        user_ids = seed_users(args.clients)
+        seed_blogs(user_ids, 500)
+        # The seeded accounts have no usable password; give them all one.
+        User.objects.filter(id__in=user_ids).update(password=hashing.make_password('BenchPassword123'))
+
+        for workers in (int(value) for value in args.workers.split(',')):
+            queue_depth = args.queue_depth if args.queue_depth is not None else workers * 4
+            with override_settings(PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_QUEUE_DEPTH=queue_depth,
+                                   ALLOWED_HOSTS=['testserver']):
+                if hashing._pool is not None:
+                    hashing._pool.shutdown()
+                hashing._pool = None
+                pool = hashing.get_hashing_pool()
+                if pool is not None:
+                    # Start the processes before the clock does.
+                    pool.run(hashing._make_password, 'warm-up')
+
+                stop = threading.Event()
+                logins, rejected, read_ms = [], [], []
+
+                def login(index):
+                    client = Client()
+                    body = {'email': f'bench{index}@example.com', 'password': 'BenchPassword123'}
+                    try:
+                        while not stop.is_set():
+                            response = client.post('/api/auth/login/', body, content_type='application/json', secure=True)
+                            if response.status_code == 200:
+                                logins.append(1)
+                            elif response.status_code == 503:
+                                rejected.append(1)
+                    finally:
+                        connection.close()
+
+                def read():
+                    client = Client()
+                    try:
+                        while not stop.is_set():
+                            started = time.perf_counter()
+                            client.get('/api/blogs/', secure=True)
+                            read_ms.append((time.perf_counter() - started) * 1000)
+                    finally:
+                        connection.close()
+
+                threads = [threading.Thread(target=login, args=(index,)) for index in range(args.clients)]
+                threads.append(threading.Thread(target=read))
+                for thread in threads:
+                    thread.start()
+                time.sleep(args.seconds)
+                stop.set()
+                for thread in threads:
+                    thread.join()
+
+                print(f'workers={workers:<3} {len(logins) / args.seconds:7.1f} logins/s  '
+                      f'{len(rejected):5d} rejected  '
+                      f'blog list p50 {statistics.median(read_ms) if read_ms else 0:6.1f} ms  '
+                      f'p95 {_percentile(read_ms, 0.95):6.1f} ms')
+
+        if hashing._pool is not None:
+            hashing._pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# backend/blogify/benchmarks/seed.py
+"""Deterministic data generator shared by the benchmarks."""
+import contextlib
+import random
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from blog_module.models import Blog, Comment, make_excerpt
+
+User = get_user_model()
+
+
+@contextlib.contextmanager
+def _manual_timestamps():
+    # auto_now/auto_now_add would stamp every seeded row with the same time.
+    fields = [Blog._meta.get_field('created_at'), Blog._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def seed_users(count, batch_size=5000):
+    User.objects.bulk_create(
+        (User(username=f'bench{index}', email=f'bench{index}@example.com', password='!', is_active=True)
+         for index in range(count)),
+        batch_size=batch_size,
+    )
+    return list(User.objects.filter(email__startswith='bench').values_list('id', flat=True))
+
+
+def seed_blogs(user_ids, count, published_ratio=0.8, rng=None, batch_size=5000):
+    rng = rng or random.Random(42)
+    now = timezone.now()
+    created = 0
+    with _manual_timestamps():
+        while created < count:
+            batch = []
+            for index in range(created, min(created + batch_size, count)):
+                stamp = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+                content = f'Benchmark content {index} ' * 20
+                batch.append(Blog(
+                    author_id=rng.choice(user_ids),
+                    title=f'Benchmark blog {index}',
+                    content=content,
+                    # bulk_create skips save(), which fills the excerpt.
+                    excerpt=make_excerpt(content),
+                    status=Blog.PUBLISHED if rng.random() < published_ratio else Blog.DRAFT,
+                    created_at=stamp,
+                    updated_at=stamp,
+                ))
+            Blog.objects.bulk_create(batch)
+            created += len(batch)
+    return created
+
+
+def seed_comments(blog_ids, user_ids, count, max_depth=2, rng=None, batch_size=5000):
+    """Create ``count`` comments spread evenly over depths 0..``max_depth``.
+
+    Depth 0 comments land on random blogs; every deeper comment replies to a
+    random comment one level up. The denormalised counters are rebuilt at
+    the end, since bulk_create skips the signals that maintain them.
+    """
+    rng = rng or random.Random(42)
+    per_level = [count // (max_depth + 1)] * (max_depth + 1)
+    per_level[0] += count - sum(per_level)
+    parents = []
+    created = 0
+    for depth, level_count in enumerate(per_level):
+        if depth and not parents:
+            break
+        comments = []
+        for index in range(level_count):
+            parent = rng.choice(parents) if depth else None
+            comments.append(Comment(
+                blog_id=parent.blog_id if parent else rng.choice(blog_ids),
+                user_id=rng.choice(user_ids),
+                parent=parent,
+                content=f'Benchmark comment {created + index} at depth {depth}',
+            ))
+        # bulk_create only sets primary keys on backends that return them.
+        parents = Comment.objects.bulk_create(comments, batch_size=batch_size)
+        if parents and parents[0].pk is None:
+            parents = list(Comment.objects.order_by('-id')[:len(parents)])
+        created += len(comments)
+    call_command('rebuild_comment_counters', stdout=StringIO())
+    return created
@@ -0,0 +1,77 @@
+# backend/blogify/benchmarks/serialization.py
+"""Serialize + render cost of feed cards, per 100 blogs.
+
+    python -m benchmarks.serialization --blogs 100 --repeat 200
+    python -m benchmarks.serialization --fields id,title,content --with-query
+
+Seeds ``--blogs`` blogs and times turning them into a response body with
+BlogListSerializer and with the compiled values() serializer, each rendered
+by DRF's JSONRenderer and by ORJSONRenderer. The rows are fetched once up
+front, so only Python work is measured; ``--with-query`` puts the fetch back
+in. Reported: the median over ``--repeat`` runs, scaled to 100 blogs.
+"""
+import argparse
+import random
+import statistics
+import time
+from . import benchmark_database, setup_django
+
+
+def _timed(callable_, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callable_()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blogs', type=int, default=100)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--fields', help='comma-separated sparse fieldset, as in ?fields=')
+    parser.add_argument('--with-query', action='store_true', help='include fetching the rows')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from blog_module.serializers import BlogListSerializer, compiled_blog_list_serializer
+    from blog_module.views import blog_queryset
+    from blogify.renderers import ORJSONRenderer, orjson
+    from .seed import seed_blogs, seed_users
+
+    fields = [name.strip() for name in args.fields.split(',')] if args.fields else None
+    with benchmark_database():
+        seed_blogs(seed_users(args.users), args.blogs, rng=random.Random(42))
+        blogs = blog_queryset().order_by('-updated_at', '-id')
+        if fields is None or 'content' not in fields:
+            instances = blogs.defer('content')
+        else:
+            instances = blogs
+        compiled = compiled_blog_list_serializer(fields)
+        rows = compiled.rows(blogs)
+
+        def fetch(queryset, cached):
+            return queryset.all() if args.with_query else cached
+
+        cached_instances, cached_rows = list(instances), list(rows)
+        serializers = {
+            'BlogListSerializer': lambda: BlogListSerializer(fetch(instances, cached_instances), many=True, fields=fields).data,
+            'compiled values()': lambda: compiled.serialize(fetch(rows, cached_rows)),
+        }
+        renderers = {'JSONRenderer': JSONRenderer(), 'ORJSONRenderer': ORJSONRenderer()}
+
+        scale = 100 / args.blogs
+        print(f'{args.blogs} blogs, fields={args.fields or "default"}, '
+              f'{"with" if args.with_query else "without"} query, orjson {"on" if orjson else "missing"}')
+        print(f'{"serializer":<20} {"renderer":<16} {"ms / 100 blogs":>14}')
+        for serializer_name, serialize in serializers.items():
+            for renderer_name, renderer in renderers.items():
+                ms = _timed(lambda: renderer.render({'success': True, 'data': serialize()}), args.repeat)
+                print(f'{serializer_name:<20} {renderer_name:<16} {ms * scale:>14.3f}')
+
+
+if __name__ == '__main__':
+    main()
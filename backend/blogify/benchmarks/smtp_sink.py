@@ -0,0 +1,55 @@
+# backend/blogify/benchmarks/smtp_sink.py
+"""A minimal local SMTP server that accepts and discards every message."""
+import socketserver
+import threading
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+
+    def _reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply('220 blogify-sink ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', errors='replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self._reply('250 blogify-sink')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.messages += 1
+                self._reply('250 OK')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                # MAIL, RCPT, RSET and NOOP are all simply accepted.
+                self._reply('250 OK')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.connections = 0
+        self.messages = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
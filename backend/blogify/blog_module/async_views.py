@@ -0,0 +1,169 @@
+# backend/blogify/blog_module/async_views.py
+"""Async variants of the read-heavy blog endpoints for the ASGI profile.
+
+DRF's APIView is synchronous, so these are plain Django async views that
+query through the async ORM and return the same JSON payloads as
+BlogListView, BlogDetailView and UserBlogsView. List pages are built by the
+same DRF paginators and helpers as the sync views, run through
+sync_to_async, so the two cannot drift apart. blog_module.urls routes to
+them when BLOG_ASYNC_VIEWS is on, which is the default under SERVER_MODE=asgi.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from .models import Blog
+from .serializers import BlogSerializer, CommentSerializer
+from .view_counter import record_view
+from .comment_tree import abuild_comment_tree
+from .cache import get_cached_page, list_page_cache_key, set_cached_page
+from .etags import (blog_etag, detail_etag_key, etag_matches, list_etag, list_etag_key,
+                    not_modified, remember_etag, remembered_etag, with_etag)
+from .views import (BlogPagination, blog_list_queryset, blog_queryset, cacheable_page_payload,
+                    cursor_paginated_response, feed_data, feed_fields, feed_queryset, page_payload,
+                    wants_cursor_pagination)
+
+
+def json_response(payload, status=status.HTTP_200_OK, headers=None):
+    # Rendered by the same renderer (and so in the same format) as the DRF views.
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(payload), status=status, headers=headers,
+                        content_type=renderer.media_type)
+
+
+def _authenticate(request):
+    for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        authenticator = authenticator_class()
+        try:
+            result = authenticator.authenticate(request)
+        except APIException as exc:
+            exc.auth_header = authenticator.authenticate_header(request)
+            raise
+        if result is not None:
+            return result[0]
+    return AnonymousUser()
+
+
+class AsyncBlogView(View):
+    """Authenticates like DRF, then hands over to an async ``get``."""
+    http_method_names = ['get', 'head', 'options']
+    require_authentication = False
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            # Token checks may load the user from the database.
+            request.user = await sync_to_async(_authenticate)(request)
+            if self.require_authentication and not request.user.is_authenticated:
+                exc = NotAuthenticated()
+                exc.auth_header = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]().authenticate_header(request)
+                raise exc
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+            auth_header = getattr(exc, 'auth_header', None)
+            return json_response(detail, status=exc.status_code,
+                                 headers={'WWW-Authenticate': auth_header} if auth_header else None)
+
+
+async def cursor_page(blogs, request):
+    # CursorPagination evaluates the queryset synchronously.
+    response = await sync_to_async(cursor_paginated_response)(blogs, Request(request), None)
+    return json_response(response.data, status=response.status_code)
+
+
+class AsyncBlogListView(AsyncBlogView):
+
+    async def get(self, request):
+        etag_key = await sync_to_async(list_etag_key)(request)
+        remembered = await sync_to_async(remembered_etag)(etag_key)
+        if remembered is not None and etag_matches(request, remembered['etag']):
+            return not_modified(remembered['etag'])
+
+        payload, headers = await self.page(request)
+        etag = list_etag(payload)
+        await sync_to_async(remember_etag)(etag_key, etag)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return with_etag(json_response(payload, headers=headers), etag)
+
+    async def page(self, request):
+        """Return the list payload and any extra response headers."""
+        paginator = BlogPagination()
+        fields = feed_fields(Request(request))
+        blogs = feed_queryset(blog_list_queryset(request.user, request.GET.get('status')), fields)
+
+        if wants_cursor_pagination(Request(request)):
+            response = await sync_to_async(cursor_paginated_response)(blogs, Request(request), None)
+            return response.data, None
+
+        if not request.user.is_authenticated:
+            cache_key = await sync_to_async(list_page_cache_key)(
+                request.get_host(),
+                request.GET.get(paginator.page_query_param, '1'),
+                paginator.get_page_size(Request(request)),
+                fields,
+            )
+            payload = await sync_to_async(get_cached_page)(cache_key)
+            if payload is not None:
+                return payload, {'X-Cache': 'HIT'}
+            payload = await sync_to_async(cacheable_page_payload)(paginator, blogs, Request(request), fields)
+            await sync_to_async(set_cached_page)(cache_key, payload)
+            return payload, {'X-Cache': 'MISS'}
+
+        return await sync_to_async(page_payload)(paginator, blogs, Request(request), fields), None
+
+
+class AsyncBlogDetailView(AsyncBlogView):
+
+    async def get(self, request, blog_id):
+        etag_key = await sync_to_async(detail_etag_key)(blog_id)
+        remembered = await sync_to_async(remembered_etag)(etag_key)
+        if (remembered is not None and etag_matches(request, remembered['etag'])
+                and (remembered['status'] == Blog.PUBLISHED or remembered['author_id'] == request.user.id)):
+            if remembered['status'] == Blog.PUBLISHED and remembered['author_id'] != request.user.id:
+                await sync_to_async(record_view)(blog_id)
+            return not_modified(remembered['etag'])
+
+        try:
+            blog = await blog_queryset().aget(id=blog_id)
+        except Blog.DoesNotExist:
+            return json_response({'success': False, 'message': 'Blog not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        if blog.status == Blog.DRAFT and blog.author != request.user:
+            return json_response({'success': False,
+                                  'message': 'Draft blog only view by Author'
+                                  }, status=status.HTTP_403_FORBIDDEN)
+
+        if blog.status == Blog.PUBLISHED and blog.author != request.user:
+            await sync_to_async(record_view)(blog.id)
+
+        etag = blog_etag(blog)
+        await sync_to_async(remember_etag)(etag_key, etag, status=blog.status, author_id=blog.author_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        comments = await abuild_comment_tree(blog)
+        return with_etag(json_response({
+            'success': True,
+            'blog': BlogSerializer(blog).data,
+            'comments': CommentSerializer(comments, many=True).data
+        }), etag)
+
+
+class AsyncUserBlogsView(AsyncBlogView):
+    require_authentication = True
+
+    async def get(self, request):
+        user_blogs = blog_queryset().filter(author=request.user).order_by('-updated_at', '-id')
+        if wants_cursor_pagination(Request(request)):
+            return await cursor_page(user_blogs, request)
+
+        fields = feed_fields(Request(request))
+        return json_response({
+            'success': True,
+            'data': feed_data([blog async for blog in feed_queryset(user_blogs, fields)], fields)
+        })
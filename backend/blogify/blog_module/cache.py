@@ -0,0 +1,53 @@
+# backend/blogify/blog_module/cache.py
+from django.conf import settings
+from django.core.cache import cache
+from blogify.metrics import record_cache
+import threading
+import time
+
+CONTENT_VERSION_KEY = 'blog_module:content_version'
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def content_version():
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        # Seed from the clock rather than 1 so that, if the key is evicted,
+        # pages cached under an older version can never match again.
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CONTENT_VERSION_KEY, 0)
+    return version
+
+
+def bump_content_version():
+    """Invalidate every cached blog page by moving to a new version."""
+    try:
+        cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def list_page_cache_key(host, page, page_size, fields=None):
+    # Old versions are never read again and simply age out via the TTL, which
+    # works the same on the local-memory and Redis backends.
+    fieldset = ','.join(fields) if fields else 'default'
+    return f'blog_module:list:v{content_version()}:{host}:p{page}:s{page_size}:f{fieldset}'
+
+
+def get_cached_page(key):
+    payload = cache.get(key)
+    record_cache(payload is not None)
+    with _stats_lock:
+        _stats['hits' if payload is not None else 'misses'] += 1
+    return payload
+
+
+def set_cached_page(key, payload):
+    cache.set(key, payload, timeout=getattr(settings, 'BLOG_LIST_CACHE_TIMEOUT', 300))
+
+
+def cache_stats():
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,37 @@
+# backend/blogify/blog_module/comment_tree.py
+from .models import Comment
+
+
+def build_comment_tree(blog):
+    """Load every comment of ``blog`` in one query and nest it in memory.
+
+    Each returned top-level comment carries a ``tree_replies`` list, which in
+    turn carry their own, to any depth. CommentSerializer reads that attribute
+    instead of hitting the ``replies`` related manager.
+    """
+    return nest_comments(list(blog_comments(blog)))
+
+
+async def abuild_comment_tree(blog):
+    """Async ORM version of build_comment_tree."""
+    return nest_comments([comment async for comment in blog_comments(blog)])
+
+
+def blog_comments(blog):
+    return Comment.objects.filter(blog=blog).select_related('user').order_by('id')
+
+
+def nest_comments(comments):
+    by_id = {}
+    for comment in comments:
+        comment.tree_replies = []
+        by_id[comment.id] = comment
+
+    roots = []
+    for comment in comments:
+        parent = by_id.get(comment.parent_id)
+        if parent is None:
+            roots.append(comment)
+        else:
+            parent.tree_replies.append(comment)
+    return roots
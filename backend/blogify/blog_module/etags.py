@@ -0,0 +1,91 @@
+# backend/blogify/blog_module/etags.py
+"""Strong ETags and conditional GETs for the blog list and detail endpoints.
+
+An ETag is a hash of what can change on a response: the id, updated_at and
+comment_count of a blog, and every field shown on a list page together with
+its count and page links.
+View counts are left out on purpose. They are buffered and flushed in
+batches, so like the cached list pages they trail the other fields anyway.
+
+Computing an ETag needs the rows, so each one issued is also remembered
+under a key that contains the content version (see blog_module.cache).
+Until a blog or comment changes, a request whose If-None-Match equals the
+remembered value gets a 304 straight from the cache, with no query and no
+serialization. Any write moves the version on, so a stale entry is never
+read again.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from blogify.metrics import record_cache
+from .cache import content_version
+import hashlib
+import json
+
+ETAG_KEY = 'blog_module:etag:v{}:{}'
+
+
+def _etag(parts):
+    digest = hashlib.sha256(json.dumps(parts, default=str, separators=(',', ':')).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def blog_etag(blog):
+    return _etag(['blog', blog.id, blog.status, blog.updated_at, blog.comment_count])
+
+
+def list_etag(payload):
+    # Every field a card shows except the view count, so a sparse fieldset
+    # without updated_at still changes its ETag when the blog does.
+    rows = [{name: value for name, value in blog.items() if name != 'views'} for blog in payload.get('data', [])]
+    return _etag(['list', rows, payload.get('count'), payload.get('next'), payload.get('previous')])
+
+
+def detail_etag_key(blog_id):
+    return ETAG_KEY.format(content_version(), f'detail:{blog_id}')
+
+
+def list_etag_key(request):
+    # Signed-in feeds include the viewer's drafts, so the viewer is part of
+    # the variant; the host is because the page links are absolute.
+    variant = f'{request.get_host()}|{request.user.id}|{request.get_full_path()}'
+    return ETAG_KEY.format(content_version(), 'list:' + hashlib.sha256(variant.encode()).hexdigest())
+
+
+def remembered_etag(key):
+    """Return ``{'etag', ...}`` stored by remember_etag(), or None."""
+    remembered = cache.get(key)
+    record_cache(remembered is not None)
+    return remembered
+
+
+def remember_etag(key, etag, **extra):
+    cache.set(key, {'etag': etag, **extra}, timeout=getattr(settings, 'BLOG_ETAG_CACHE_TIMEOUT', 300))
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses the weak comparison (RFC 9110, 13.1.2).
+    return etag in (tag.removeprefix('W/') for tag in parse_etags(header))
+
+
+def _revalidation_headers(response, etag):
+    response['ETag'] = etag
+    # Caches may keep the body but must ask us before reusing it.
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def not_modified(etag):
+    return _revalidation_headers(HttpResponseNotModified(), etag)
+
+
+def with_etag(response, etag):
+    return _revalidation_headers(response, etag)
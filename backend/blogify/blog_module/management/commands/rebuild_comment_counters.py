@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from blog_module.models import Blog, Comment
+
+
+class Command(BaseCommand):
+    help = 'Recompute Blog.comment_count and Comment.reply_count from the comment table in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of rows recomputed per UPDATE statement (default: 1000).')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        comment_totals = (Comment.objects.filter(blog=OuterRef('pk')).order_by()
+                          .values('blog').annotate(total=Count('id')).values('total'))
+        blogs = self._rebuild(Blog, batch_size, comment_count=Coalesce(Subquery(comment_totals), 0))
+
+        reply_totals = (Comment.objects.filter(parent=OuterRef('pk')).order_by()
+                        .values('parent').annotate(total=Count('id')).values('total'))
+        comments = self._rebuild(Comment, batch_size, reply_count=Coalesce(Subquery(reply_totals), 0))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt comment_count for {blogs} blogs and reply_count for {comments} comments.'
+        ))
+
+    def _rebuild(self, model, batch_size, **expressions):
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return updated
+            with transaction.atomic():
+                updated += model.objects.filter(id__in=ids).update(**expressions)
+            last_id = ids[-1]
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from blog_module.models import Blog
+from blog_module.search import install_search_triggers, reindex_blogs
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the blog full-text search index in batches (e.g. after bulk imports).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of blogs reindexed per statement (default: 1000).')
+        parser.add_argument('--database', default='default',
+                            help='Database alias to rebuild (default: default).')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        using = options['database']
+        install_search_triggers(using)
+        indexed = 0
+        last_id = 0
+        while True:
+            ids = list(Blog.objects.using(using).filter(id__gt=last_id).order_by('id')
+                       .values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            reindex_blogs(ids, using=using)
+            indexed += len(ids)
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the search index for {indexed} blogs.'))
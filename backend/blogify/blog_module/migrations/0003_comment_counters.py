@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Blog = apps.get_model('blog_module', 'Blog')
+    Comment = apps.get_model('blog_module', 'Comment')
+
+    comment_totals = Comment.objects.filter(blog=OuterRef('pk')).order_by().values('blog').annotate(total=Count('id')).values('total')
+    Blog.objects.update(comment_count=Coalesce(Subquery(comment_totals), 0))
+
+    reply_totals = Comment.objects.filter(parent=OuterRef('pk')).order_by().values('parent').annotate(total=Count('id')).values('total')
+    Comment.objects.update(reply_count=Coalesce(Subquery(reply_totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_module', '0002_blog_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
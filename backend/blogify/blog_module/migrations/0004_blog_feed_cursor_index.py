@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_module', '0003_comment_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-updated_at', '-id'], name='blog_feed_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_module', '0004_blog_feed_cursor_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['status', 'updated_at'], name='blog_status_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['author', 'status', 'updated_at'], name='blog_author_status_upd_idx'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:02
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+SEARCH_INDEX = 'blog_search_vector_gin'
+FTS_TABLE = 'blog_module_blog_fts'
+
+POSTGRESQL_TRIGGER = """
+CREATE OR REPLACE FUNCTION blog_search_vector_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector(TG_ARGV[0]::regconfig, coalesce(NEW.title, '')), 'A')
+        || setweight(to_tsvector(TG_ARGV[0]::regconfig, coalesce(NEW.content, '')), 'B');
+    RETURN NEW;
+END
+$$;
+DROP TRIGGER IF EXISTS blog_search_vector_trigger ON blog_module_blog;
+CREATE TRIGGER blog_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON blog_module_blog
+    FOR EACH ROW EXECUTE FUNCTION blog_search_vector_update({config});
+"""
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER blog_fts_insert AFTER INSERT ON blog_module_blog BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER blog_fts_update AFTER UPDATE OF title, content ON blog_module_blog BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER blog_fts_delete AFTER DELETE ON blog_module_blog BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {SEARCH_INDEX} ON blog_module_blog USING gin (search_vector)')
+        config = getattr(settings, 'BLOG_SEARCH_CONFIG', 'english').replace("'", "''")
+        schema_editor.execute(POSTGRESQL_TRIGGER.format(config=f"'{config}'"))
+        # Fires the trigger for the existing rows.
+        schema_editor.execute('UPDATE blog_module_blog SET title = title')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, content)')
+        for trigger in SQLITE_TRIGGERS:
+            schema_editor.execute(trigger)
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, content) SELECT id, title, content FROM blog_module_blog'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP TRIGGER IF EXISTS blog_search_vector_trigger ON blog_module_blog')
+        schema_editor.execute('DROP FUNCTION IF EXISTS blog_search_vector_update()')
+        schema_editor.execute(f'DROP INDEX IF EXISTS {SEARCH_INDEX}')
+    elif vendor == 'sqlite':
+        for trigger in ('blog_fts_insert', 'blog_fts_update', 'blog_fts_delete'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_module', '0005_blog_feed_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # The GIN index and tsvector trigger only exist on PostgreSQL and the
+        # FTS5 table only on SQLite, so they are created by hand per vendor
+        # and kept out of the model state, where SQLite table rebuilds would
+        # turn the index into a plain one.
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    # Frozen copy of blog_module.models.make_excerpt.
+    text = ' '.join(content.split())
+    if len(text) <= length:
+        return text
+    cut = text.rfind(' ', 0, length + 1)
+    return text[:cut if cut > length // 2 else length].rstrip()
+
+
+def fill_excerpts(apps, schema_editor):
+    Blog = apps.get_model('blog_module', 'Blog')
+    blogs = Blog.objects.using(schema_editor.connection.alias).only('id', 'content').order_by('id')
+    last_id = 0
+    while True:
+        batch = list(blogs.filter(id__gt=last_id)[:1000])
+        if not batch:
+            break
+        for blog in batch:
+            blog.excerpt = make_excerpt(blog.content)
+        Blog.objects.using(schema_editor.connection.alias).bulk_update(batch, ['excerpt'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_module', '0006_blog_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
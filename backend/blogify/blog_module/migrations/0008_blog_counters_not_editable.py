@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_module', '0007_blog_excerpt'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blog',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='blog',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
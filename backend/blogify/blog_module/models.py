@@ -2,9 +2,22 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.search import SearchVectorField
 
 User = get_user_model()
 
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    """The first ``length`` characters of ``content`` on one line, cut at a word."""
+    text = ' '.join(content.split())
+    if len(text) <= length:
+        return text
+    # Break at the last space that fits unless that loses half the excerpt.
+    cut = text.rfind(' ', 0, length + 1)
+    return text[:cut if cut > length // 2 else length].rstrip()
+
 class Blog(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     DRAFT = 'draft'
@@ -14,21 +27,92 @@ class Blog(models.Model):
             ]
     title = models.CharField(max_length=200)
     content = models.TextField()
+    # Start of the content for feed cards, refreshed by save() whenever the
+    # content is loaded, so feeds can defer the content column.
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default='', editable=False)
     status = models.CharField(max_length=200, choices=MOODS, default=DRAFT)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     # author = models.ForeignKey(User, on_delete=models.CASCADE)
-    views = models.PositiveIntegerField(default=0)
+    # Buffered and added with F() updates by blog_module.view_counter; never
+    # written by save().
+    views = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained with F() updates by blog_module.signals; never written by save().
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Full-text index column on PostgreSQL (see blog_module.search); filled
+    # in by a database trigger, unused on SQLite.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    COUNTER_FIELDS = ('views', 'comment_count')
+    DERIVED_FIELDS = ('search_vector',)
+
+    class Meta:
+        indexes = [
+            # Backs the cursor pagination order of the blog feed.
+            models.Index(fields=['-updated_at', '-id'], name='blog_feed_cursor_idx'),
+            # Published feed, and the two arms of the published-or-own-draft filter.
+            models.Index(fields=['status', 'updated_at'], name='blog_status_updated_idx'),
+            models.Index(fields=['author', 'status', 'updated_at'], name='blog_author_status_upd_idx'),
+            # search_vector's GIN index is created on PostgreSQL only, by
+            # migration 0006; SQLite searches an FTS5 table instead.
+        ]
     
     def __str__(self):
         return self.title
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can enforce the
+        # published -> draft rule without re-reading the row.
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_counters = instance._counter_values()
+        return instance
+
+    def _counter_values(self):
+        return tuple(self.__dict__.get(name) for name in self.COUNTER_FIELDS)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or 'status' in fields:
+            self._loaded_status = self.status
+        self._loaded_counters = self._counter_values()
+
+    def _was_published(self):
+        loaded_status = getattr(self, '_loaded_status', None)
+        if loaded_status is not None:
+            return loaded_status == self.PUBLISHED
+        # Built by hand or loaded with status deferred: ask the database.
+        return Blog.objects.filter(id=self.id, status=self.PUBLISHED).exists()
+
     def save(self, *args, **kwargs):
+        if 'content' in self.__dict__:
+            self.excerpt = make_excerpt(self.content)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'content' in update_fields and 'excerpt' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'excerpt']
         if self.id:
-            old_one = Blog.objects.filter(id=self.id).first()
-            if old_one and old_one.status == self.PUBLISHED and self.status == self.DRAFT:
+            if self.status == self.DRAFT and self._was_published():
                 raise ValidationError('Published posts cannot be changed to draft mood.')
+            if not self._state.adding and kwargs.get('update_fields') is None:
+                # A full save must not overwrite counters that were bumped
+                # concurrently since this instance was loaded, nor the search
+                # vector the database trigger maintains. Changing a counter
+                # on the instance would be lost, so it is an error.
+                if self._counter_values() != getattr(self, '_loaded_counters', self._counter_values()):
+                    raise ValueError(
+                        f'{", ".join(self.COUNTER_FIELDS)} are not written by save(); '
+                        'change them with an F() update on Blog.objects.filter(...).'
+                    )
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key
+                    and field.name not in self.COUNTER_FIELDS + self.DERIVED_FIELDS
+                ]
         super().save(*args, **kwargs)
+        self._loaded_status = self.status
+        self._loaded_counters = self._counter_values()
     
 class Comment(models.Model):
     blog = models.ForeignKey(Blog, related_name='comments',on_delete=models.CASCADE)
@@ -36,6 +120,8 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
+    # Number of direct replies, maintained by blog_module.signals.
+    reply_count = models.PositiveIntegerField(default=0)
 
 
     def __str__(self):
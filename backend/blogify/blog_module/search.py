@@ -0,0 +1,174 @@
+# backend/blogify/blog_module/search.py
+"""Full-text search over blog titles and content.
+
+PostgreSQL keeps a weighted tsvector in ``Blog.search_vector`` (GIN
+indexed) and ranks with ts_rank. SQLite, used locally and by the tests,
+keeps the same text in the FTS5 table ``blog_module_blog_fts`` (rowid = blog
+id) and ranks with bm25. Both are kept current by database triggers (see
+install_search_triggers), so saves, queryset updates and deletes need no
+extra queries from Django; reindex_blogs() is only for rebuilds.
+
+Results are ordered by (rank, id) descending and paginated by keyset on that
+pair, so later pages cost the same as the first.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, router, transaction
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from .models import Blog
+import base64
+import binascii
+import json
+
+FTS_TABLE = 'blog_module_blog_fts'
+# Title matches count ten times as much as content matches on both backends.
+FTS_WEIGHTS = (10.0, 1.0)
+
+
+def search_config():
+    return getattr(settings, 'BLOG_SEARCH_CONFIG', 'english')
+
+
+def search_vector_expression():
+    return (SearchVector('title', weight='A', config=search_config())
+            + SearchVector('content', weight='B', config=search_config()))
+
+
+SQLITE_TRIGGERS = {
+    'blog_fts_insert': 'AFTER INSERT ON {blogs} BEGIN '
+                       'INSERT INTO {fts} (rowid, title, content) VALUES (new.id, new.title, new.content); END',
+    'blog_fts_update': 'AFTER UPDATE OF title, content ON {blogs} BEGIN '
+                       'DELETE FROM {fts} WHERE rowid = old.id; '
+                       'INSERT INTO {fts} (rowid, title, content) VALUES (new.id, new.title, new.content); END',
+    'blog_fts_delete': 'AFTER DELETE ON {blogs} BEGIN DELETE FROM {fts} WHERE rowid = old.id; END',
+}
+
+
+def install_search_triggers(using='default'):
+    """(Re)create the triggers that keep the search index current.
+
+    SQLite drops a table's triggers whenever a migration rebuilds the table
+    (e.g. to add a column), so this runs after every migrate. On PostgreSQL
+    it re-points the trigger at the current BLOG_SEARCH_CONFIG. Does nothing
+    until migration 0006 has created the index.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            if FTS_TABLE not in connection.introspection.table_names(cursor):
+                return
+            for name, body in SQLITE_TRIGGERS.items():
+                cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} '
+                               + body.format(blogs=Blog._meta.db_table, fts=FTS_TABLE))
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT 1 FROM pg_proc WHERE proname = 'blog_search_vector_update'")
+            if cursor.fetchone() is None:
+                return
+            config = search_config().replace("'", "''")
+            # CREATE OR REPLACE TRIGGER needs PostgreSQL 14. In one transaction
+            # no write can land between the drop and the create.
+            with transaction.atomic(using=using):
+                cursor.execute(f'DROP TRIGGER IF EXISTS blog_search_vector_trigger ON {Blog._meta.db_table}')
+                cursor.execute(
+                    f'CREATE TRIGGER blog_search_vector_trigger '
+                    f'BEFORE INSERT OR UPDATE OF title, content ON {Blog._meta.db_table} '
+                    f"FOR EACH ROW EXECUTE FUNCTION blog_search_vector_update('{config}')"
+                )
+
+
+def reindex_blogs(blog_ids, using='default'):
+    """Rebuild the search index entries of ``blog_ids``."""
+    blog_ids = list(blog_ids)
+    if not blog_ids:
+        return
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        Blog.objects.using(using).filter(id__in=blog_ids).update(search_vector=search_vector_expression())
+    elif connection.vendor == 'sqlite':
+        placeholders = ', '.join(['%s'] * len(blog_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', blog_ids)
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, content) '
+                f'SELECT id, title, content FROM {Blog._meta.db_table} WHERE id IN ({placeholders})',
+                blog_ids,
+            )
+
+
+def encode_cursor(rank, blog_id):
+    return base64.urlsafe_b64encode(json.dumps([rank, blog_id]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the (rank, id) pair of a cursor; raises ValueError if malformed."""
+    try:
+        rank, blog_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(blog_id)
+    except (TypeError, ValueError, UnicodeDecodeError, binascii.Error) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+def _fts5_query(query):
+    # Quote every term so user input cannot use FTS5 operators or columns;
+    # space-separated strings are ANDed.
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search_blogs(query, limit, after=None):
+    """Return up to ``limit`` ``(blog_id, rank)`` of published blogs matching ``query``.
+
+    ``after`` is the (rank, id) of the last result of the previous page.
+    """
+    using = router.db_for_read(Blog)
+    vendor = connections[using].vendor
+    if vendor == 'postgresql':
+        return _search_postgresql(query, limit, after, using)
+    if vendor == 'sqlite':
+        return _search_sqlite(query, limit, after, using)
+    return _search_fallback(query, limit, after, using)
+
+
+def _search_postgresql(query, limit, after, using):
+    search_query = SearchQuery(query, search_type='websearch', config=search_config())
+    # ts_rank returns a real; as a double the rank survives the round trip
+    # through the cursor exactly, which the keyset comparison relies on.
+    blogs = (Blog.objects.using(using)
+             .filter(status=Blog.PUBLISHED, search_vector=search_query)
+             .annotate(rank=Cast(SearchRank(F('search_vector'), search_query), FloatField())))
+    if after is not None:
+        rank, blog_id = after
+        blogs = blogs.filter(Q(rank__lt=rank) | Q(rank=rank, id__lt=blog_id))
+    return list(blogs.order_by('-rank', '-id').values_list('id', 'rank')[:limit])
+
+
+def _search_sqlite(query, limit, after, using):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    sql = (
+        f'SELECT id, score FROM ('
+        f'  SELECT {FTS_TABLE}.rowid AS id, -bm25({FTS_TABLE}, %s, %s) AS score'
+        f'  FROM {FTS_TABLE} JOIN {Blog._meta.db_table} blog ON blog.id = {FTS_TABLE}.rowid'
+        f'  WHERE {FTS_TABLE} MATCH %s AND blog.status = %s'
+        f')'
+    )
+    params = [*FTS_WEIGHTS, match, Blog.PUBLISHED]
+    if after is not None:
+        sql += ' WHERE score < %s OR (score = %s AND id < %s)'
+        params += [after[0], after[0], after[1]]
+    sql += ' ORDER BY score DESC, id DESC LIMIT %s'
+    params.append(limit)
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(blog_id, score) for blog_id, score in cursor.fetchall()]
+
+
+def _search_fallback(query, limit, after, using):
+    # Unranked substring match for other databases.
+    blogs = Blog.objects.using(using).filter(status=Blog.PUBLISHED)
+    for term in query.split():
+        blogs = blogs.filter(Q(title__icontains=term) | Q(content__icontains=term))
+    if after is not None:
+        blogs = blogs.filter(id__lt=after[1])
+    return [(blog_id, 0.0) for blog_id in blogs.order_by('-id').values_list('id', flat=True)[:limit]]
@@ -1,42 +1,117 @@
 # backend/blogify/blog_module/serializers.py
+from functools import lru_cache
 from rest_framework import serializers
 from .models import Blog, Comment
 
 class BlogSerializer(serializers.ModelSerializer):
     author = serializers.CharField(source='author.username', read_only =True)
-    comment_count = serializers.SerializerMethodField()
-
-    def get_comment_count(self, object):
-        comments = Comment.objects.filter(blog=object, parent=None)
-        total_count = comments.count()
-
-        for comment in comments:
-            total_count += Comment.objects.filter(parent=comment).count()
-        return total_count
     
     class Meta:
         model = Blog
         fields = ['id','author','title','content','status','views','created_at','updated_at','comment_count']
+        read_only_fields = ['comment_count']
 
-    
+
+class BlogListSerializer(BlogSerializer):
+    """Feed card: the stored excerpt instead of the full content.
+
+    ``fields`` picks a subset of Meta.fields (the ``fields`` query
+    parameter); ``content`` is only sent when asked for by name.
+    """
+    DEFAULT_FIELDS = ['id','author','title','excerpt','status','views','created_at','updated_at','comment_count']
+
+    class Meta(BlogSerializer.Meta):
+        fields = BlogSerializer.Meta.fields + ['excerpt']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = set(fields or self.DEFAULT_FIELDS)
+        for name in set(self.fields) - keep:
+            self.fields.pop(name)
+
+
+def _datetime_representation():
+    # DRF's DateTimeField with the active timezone fixed up front; looking it
+    # up costs more than formatting the value, so it is done once per page.
+    return serializers.DateTimeField(default_timezone=serializers.DateTimeField().default_timezone()).to_representation
+
+
+class CompiledBlogListSerializer:
+    """BlogListSerializer's output built straight from ``values()`` rows.
+
+    The hot feed endpoints skip model instances and DRF field objects: the
+    mapping from card field to column is worked out once per fieldset (see
+    compiled_blog_list_serializer) and each row becomes a dict in one pass.
+    The result must equal BlogListSerializer's, which the tests check.
+    """
+    # Card field -> (values() lookup, factory of its conversion or None).
+    COLUMNS = {
+        'id': ('id', None),
+        'author': ('author__username', None),
+        'title': ('title', None),
+        'content': ('content', None),
+        'status': ('status', None),
+        'views': ('views', None),
+        'created_at': ('created_at', _datetime_representation),
+        'updated_at': ('updated_at', _datetime_representation),
+        'comment_count': ('comment_count', None),
+        'excerpt': ('excerpt', None),
+    }
+    # Selected even when not shown: cursor pagination reads its position
+    # from the rows and search matches them up by id.
+    ALWAYS_SELECTED = ('id', 'updated_at')
+
+    def __init__(self, fields=None):
+        keep = set(fields or BlogListSerializer.DEFAULT_FIELDS)
+        self.mapping = tuple((name, *self.COLUMNS[name]) for name in BlogListSerializer.Meta.fields if name in keep)
+        self.lookups = tuple(dict.fromkeys([lookup for _, lookup, _ in self.mapping] + list(self.ALWAYS_SELECTED)))
+
+    def rows(self, blogs):
+        return blogs.values(*self.lookups)
+
+    def serialize(self, rows):
+        mapping = [(name, lookup, factory and factory()) for name, lookup, factory in self.mapping]
+        return [
+            {name: row[lookup] if convert is None else convert(row[lookup]) for name, lookup, convert in mapping}
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=64)
+def _compiled(fields):
+    return CompiledBlogListSerializer(fields)
+
+
+def compiled_blog_list_serializer(fields=None):
+    return _compiled(tuple(fields) if fields else None)
         
 class ReplySerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
 
     class Meta:
         model = Comment
-        fields = ['id','user','username','content','created_at']
+        fields = ['id','user','username','content','created_at','reply_count']
+        read_only_fields = ['reply_count']
         extra_kwargs = {
             'user' : { 'required' : False},
             # 'blog' : { 'required' : False},
         }
 class CommentSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
-    replies = ReplySerializer(many=True, read_only=True)
+    replies = serializers.SerializerMethodField()
+
+    def get_replies(self, comment):
+        # Comments assembled by comment_tree.build_comment_tree already carry
+        # their children; only fall back to a query for standalone comments.
+        replies = getattr(comment, 'tree_replies', None)
+        if replies is None:
+            replies = comment.replies.select_related('user')
+        return CommentSerializer(replies, many=True, context=self.context).data
 
     class Meta:
         model = Comment
-        fields = ['id','user','username','blog','content','created_at','replies','parent']
+        fields = ['id','user','username','blog','content','created_at','replies','parent','reply_count']
+        read_only_fields = ['reply_count']
 
         extra_kwargs = {
             'user' : { 'required' : False},
@@ -1,25 +1,72 @@
-# backend/blogify/blog_module/signals.py
 from django.conf import settings
-from django.db.models.signals import post_migrate
+from django.db.models import F
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
-from django_celery_beat.models import PeriodicTask, IntervalSchedule
+from .models import Blog, Comment
+from .cache import bump_content_version
+from .search import install_search_triggers
 import json
 
+@receiver(post_migrate)
+def restore_search_triggers(sender, using='default', **kwargs):
+    if sender.name == 'blog_module':
+        install_search_triggers(using)
+
 @receiver(post_migrate)
 def create_periodic_tasks(sender, **kwargs):
     if not getattr(settings, 'ENABLE_CELERY', False):
         return
 
+    from django_celery_beat.models import PeriodicTask, IntervalSchedule
+
     if sender.name == 'blog_module':
         schedule, created = IntervalSchedule.objects.get_or_create(
             every=12,
             period=IntervalSchedule.HOURS,
         )
-        
+
         PeriodicTask.objects.get_or_create(
             name='Notify users of new blogs',
             task='blog_module.tasks.notify_users_of_new_blog',
             interval=schedule,
             kwargs=json.dumps({}),
             enabled=True,
-        )
\ No newline at end of file
+        )
+
+        flush_schedule, created = IntervalSchedule.objects.get_or_create(
+            every=getattr(settings, 'BLOG_VIEW_FLUSH_INTERVAL', 10) or 10,
+            period=IntervalSchedule.SECONDS,
+        )
+
+        PeriodicTask.objects.get_or_create(
+            name='Flush buffered blog views',
+            task='blog_module.tasks.flush_blog_views',
+            interval=flush_schedule,
+            kwargs=json.dumps({}),
+            enabled=True,
+        )
+
+@receiver(post_save, sender=Comment)
+def increment_comment_counters(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    Blog.objects.filter(id=instance.blog_id).update(comment_count=F('comment_count') + 1)
+    if instance.parent_id:
+        Comment.objects.filter(id=instance.parent_id).update(reply_count=F('reply_count') + 1)
+    bump_content_version()
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_counters(sender, instance, origin=None, **kwargs):
+    # When a whole blog is deleted its comments cascade with it; there is no
+    # counter left to maintain.
+    if not (isinstance(origin, Blog) and origin.id == instance.blog_id):
+        Blog.objects.filter(id=instance.blog_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+    if instance.parent_id:
+        Comment.objects.filter(id=instance.parent_id, reply_count__gt=0).update(reply_count=F('reply_count') - 1)
+    bump_content_version()
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def invalidate_blog_pages(sender, instance, **kwargs):
+    bump_content_version()
@@ -1,8 +1,10 @@
 # backend/blogify/blog_module/tasks.py
-from celery import shared_task
+from celery import group, shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from .models import Blog
-from user_module.utils import send_plain_email
+from .view_counter import flush_view_counts
+from user_module.utils import send_plain_email, send_plain_email_batch
 from datetime import timedelta
 from django.utils import timezone
 
@@ -36,35 +38,51 @@ def send_comment_notification_email(blog_id, commenter_username, comment_content
     except Exception as e:
         return f"Failed to send email: {str(e)}"
 
+@shared_task
+def flush_blog_views():
+    flushed = flush_view_counts()
+    return f"Flushed {flushed} buffered blog views"
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+@shared_task
+def send_new_blog_notification_chunk(subject, message, recipient_emails):
+    results = send_plain_email_batch(subject, message, recipient_emails)
+    failed = [recipient for recipient, sent in results.items() if not sent]
+    if failed:
+        print(f"Failed to send '{subject}' to {len(failed)} of {len(results)} recipients")
+    return f"Sent {len(results) - len(failed)} of {len(results)} notifications"
+
 @shared_task
 def notify_users_of_new_blog():
    
     print("Starting notify_users_of_new_blog task")
 
     one_hour_ago = timezone.now() - timedelta(hours=12)
-    new_blogs = Blog.objects.filter(created_at__gte=one_hour_ago, status=Blog.PUBLISHED)
+    new_blogs = list(
+        Blog.objects.filter(created_at__gte=one_hour_ago, status=Blog.PUBLISHED).select_related('author')
+    )
     
-    print(f"Found {new_blogs.count()} new blogs published in the last minute")
+    print(f"Found {len(new_blogs)} new blogs published in the last 12 hours")
 
-    if not new_blogs.exists():
+    if not new_blogs:
         print("No new blogs to notify about")
         return "No new blogs to notify about"
     
-    active_users = User.objects.filter(is_active=True)
-    print(f"Found {active_users.count()} active users to notify")
+    chunk_size = getattr(settings, 'BLOG_NOTIFICATION_CHUNK_SIZE', 500)
     notification_count = 0
+    chunk_count = 0
     
     for blog in new_blogs:
         subject = f"New Blog Post: {blog.title}"
-        
-        recipients = [user.email for user in active_users if user.id != blog.author.id]
-        
-        if not recipients:
-            continue
-
-        print(f"Sending notifications about blog '{blog.title}' to {len(recipients)} users")
-
-        
         message = f'''
         Hello Blogify User,
         
@@ -78,15 +96,20 @@ def notify_users_of_new_blog():
         Regards,
         Blogify
         '''
-        success_count = 0
-        for recipient in recipients:
-            if send_plain_email(subject=subject, message=message, recipient_email=recipient):
-                success_count += 1
-            else:
-                print(f"Failed to send email for blog '{blog.title}' to {recipient}")
 
-        if success_count:
-            notification_count += 1
-            print(f"Successfully sent {success_count} notifications for blog: {blog.title}")
+        # Stream addresses straight from the database and fan them out in
+        # chunks; each chunk task sends over a single mail connection.
+        recipients = (User.objects.filter(is_active=True).exclude(id=blog.author_id)
+                      .order_by('id').values_list('email', flat=True).iterator(chunk_size=chunk_size))
+        jobs = [send_new_blog_notification_chunk.s(subject, message, chunk)
+                for chunk in _chunked(recipients, chunk_size)]
+        
+        if not jobs:
+            continue
+
+        group(jobs).apply_async()
+        notification_count += 1
+        chunk_count += len(jobs)
+        print(f"Queued {len(jobs)} notification chunks for blog: {blog.title}")
     
-    return f"Notified users about {notification_count} new blog posts"
\ No newline at end of file
+    return f"Queued {chunk_count} notification chunks for {notification_count} new blog posts"
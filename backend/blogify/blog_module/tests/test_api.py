@@ -4,14 +4,27 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient, force_authenticate
 from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from ..models import Blog, Comment
+from ..serializers import BlogListSerializer, compiled_blog_list_serializer
+from ..views import blog_queryset
+from ..cache import cache_stats
+from ..view_counter import LocalViewCounter, RedisViewCounter, flush_view_counts, get_view_counter
 from unittest.mock import patch
+from django.core.management import call_command
+from io import StringIO
 
 User = get_user_model()
 
 class BlogApiTestCase(APITestCase):
     
     def setUp(self):
+        get_view_counter().drain()
+        cache.clear()
         
         self.user = User.objects.create_user(
             username='testuser',
@@ -46,7 +59,13 @@ class BlogApiTestCase(APITestCase):
         )
         
         self.client = APIClient()
-    
+
+    def _add_comments(self, blog, top_level, replies_each):
+        for index in range(top_level):
+            parent = Comment.objects.create(content=f'Comment {index}', user=self.another_user, blog=blog)
+            for reply_index in range(replies_each):
+                Comment.objects.create(content=f'Reply {reply_index}', user=self.user, blog=blog, parent=parent)
+
     def test_blog_list_unauthenticated(self):
         
         self.client.force_authenticate(user=None)
@@ -115,34 +134,24 @@ class BlogApiTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertEqual(Blog.objects.count(), 2)  
 
+    @override_settings(BLOG_VIEW_FLUSH_INTERVAL=0)
     def test_blog_detail_published(self):
-        
         self.client.force_authenticate(user=None)
-        
         url = reverse('blog_detail', kwargs={'blog_id': self.published_blog.id})
+
         response = self.client.get(url)
-        
+
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data['success'])
         self.assertEqual(response.data['blog']['id'], self.published_blog.id)
-        
-        self.published_blog.views = 0
-        self.published_blog.save()
-        self.published_blog.refresh_from_db()
-        initial_views = self.published_blog.views
 
-        # print(f"Initial views: {initial_views}")
-        
+        # Views are buffered (see blog_module.view_counter); flushing applies
+        # this one and the next.
         self.client.force_authenticate(user=self.another_user)
-        # print(f"Request user: {self.another_user.username}")
-        # print(f"Blog author: {self.published_blog.author.username}")
-        
-        response = self.client.get(url)
+        self.client.get(url)
+        flush_view_counts()
         self.published_blog.refresh_from_db()
-        
-        # print(f"After view - views: {self.published_blog.views}")
-        expected_views = initial_views + 1
-        self.assertEqual(self.published_blog.views, expected_views)
+        self.assertEqual(self.published_blog.views, 2)
 
     def test_blog_detail_draft(self):
         
@@ -282,4 +291,341 @@ class BlogApiTestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data['success'])
-        self.assertEqual(len(response.data['data']), 2)
\ No newline at end of file
+        self.assertEqual(len(response.data['data']), 2)
+
+    def test_blog_list_comment_count_query_count_is_fixed(self):
+        self.client.force_authenticate(user=None)
+        url = reverse('blog_list')
+
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        self._add_comments(self.published_blog, top_level=5, replies_each=3)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.data['data'][0]['comment_count'], 1 + 5 + 5 * 3)
+
+    def test_user_blogs_comment_count_query_count_is_fixed(self):
+        self.client.force_authenticate(user=self.user)
+        self._add_comments(self.published_blog, top_level=4, replies_each=2)
+        self._add_comments(self.draft_blog, top_level=2, replies_each=1)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('user-blogs'))
+
+        counts = {blog['id']: blog['comment_count'] for blog in response.data['data']}
+        self.assertEqual(counts[self.published_blog.id], 1 + 4 + 4 * 2)
+        self.assertEqual(counts[self.draft_blog.id], 2 + 2)
+
+    @patch('blog_module.views.send_comment_notification_email.delay')
+    def test_comment_counters_follow_create_and_delete(self, mock_notification):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(reverse('comment_create', kwargs={'blog_id': self.published_blog.id}),
+                                    {'content': 'Another comment'}, format='json')
+        comment_id = response.data['comment']['id']
+        self.client.post(reverse('comment_reply', kwargs={'comment_id': comment_id}),
+                         {'content': 'A reply'}, format='json')
+
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.comment_count, 3)
+        self.assertEqual(Comment.objects.get(id=comment_id).reply_count, 1)
+
+        Comment.objects.get(id=comment_id).delete()
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.comment_count, 1)
+
+    def test_blog_save_does_not_overwrite_comment_count(self):
+        stale_blog = Blog.objects.get(id=self.published_blog.id)
+        Comment.objects.create(content='Late comment', user=self.another_user, blog=self.published_blog)
+
+        stale_blog.title = 'Edited title'
+        stale_blog.save()
+
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.title, 'Edited title')
+        self.assertEqual(self.published_blog.comment_count, 2)
+
+    def test_blog_save_does_not_lose_flushed_views(self):
+        stale_blog = Blog.objects.get(id=self.published_blog.id)
+        get_view_counter().incr(self.published_blog.id, 4)
+        flush_view_counts()
+
+        stale_blog.title = 'Edited title'
+        stale_blog.save()
+
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.title, 'Edited title')
+        self.assertEqual(self.published_blog.views, 4)
+
+    def test_blog_save_refuses_counter_assignments(self):
+        self.published_blog.views = 5
+        with self.assertRaises(ValueError):
+            self.published_blog.save()
+
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.views, 0)
+        self.published_blog.title = 'Edited title'
+        self.published_blog.save()
+
+    def test_rebuild_comment_counters_command(self):
+        self._add_comments(self.published_blog, top_level=3, replies_each=2)
+        Blog.objects.update(comment_count=0)
+        Comment.objects.update(reply_count=0)
+
+        call_command('rebuild_comment_counters', batch_size=1, stdout=StringIO())
+
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.comment_count, 1 + 3 + 3 * 2)
+        self.assertEqual(
+            sorted(Comment.objects.filter(parent=None).values_list('reply_count', flat=True)),
+            [0, 2, 2, 2],
+        )
+
+    @override_settings(BLOG_VIEW_FLUSH_INTERVAL=0)
+    def test_blog_detail_views_are_buffered_until_flush(self):
+        self.client.force_authenticate(user=self.another_user)
+        url = reverse('blog_detail', kwargs={'blog_id': self.published_blog.id})
+
+        for _ in range(3):
+            self.client.get(url)
+
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.views, 0)
+
+        self.assertEqual(flush_view_counts(), 3)
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.views, 3)
+        self.assertEqual(flush_view_counts(), 0)
+
+    def test_flush_view_counts_requeues_hits_on_failure(self):
+        counter = LocalViewCounter()
+        counter.incr(self.published_blog.id, 4)
+
+        with patch('blog_module.view_counter.Blog.objects.filter', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                flush_view_counts(counter)
+
+        self.assertEqual(counter.drain(), {self.published_blog.id: 4})
+
+    def test_redis_view_counter_flush(self):
+        counter = RedisViewCounter(client=FakeRedis())
+        counter.incr(self.published_blog.id)
+        counter.incr(self.published_blog.id)
+        counter.incr(self.draft_blog.id)
+
+        self.assertEqual(flush_view_counts(counter), 3)
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.views, 2)
+        self.assertEqual(counter.drain(), {})
+
+
+    def test_blog_save_is_a_single_statement(self):
+        blog = Blog.objects.get(id=self.published_blog.id)
+        blog.title = 'Edited without a lookup'
+
+        with self.assertNumQueries(1):
+            blog.save()
+
+    def test_blog_save_rejects_published_to_draft_without_lookup(self):
+        blog = Blog.objects.get(id=self.published_blog.id)
+        blog.status = Blog.DRAFT
+
+        with self.assertNumQueries(0):
+            with self.assertRaises(ValidationError):
+                blog.save()
+
+    def test_blog_save_checks_status_when_it_was_not_loaded(self):
+        blog = Blog(id=self.published_blog.id, author=self.user, title='Rebuilt', content='x', status=Blog.DRAFT)
+
+        with self.assertRaises(ValidationError):
+            blog.save()
+
+        draft = Blog.objects.get(id=self.draft_blog.id)
+        draft.status = Blog.PUBLISHED
+        draft.save()
+        draft.status = Blog.DRAFT
+        with self.assertRaises(ValidationError):
+            draft.save()
+
+    @override_settings(BLOG_VIEW_FLUSH_INTERVAL=0)
+    def test_blog_detail_loads_comment_tree_in_one_query(self):
+        reply = Comment.objects.create(content='Reply', user=self.another_user, blog=self.published_blog, parent=self.comment)
+        Comment.objects.create(content='Nested reply', user=self.user, blog=self.published_blog, parent=reply)
+        self._add_comments(self.published_blog, top_level=3, replies_each=2)
+        self.client.force_authenticate(user=None)
+        url = reverse('blog_detail', kwargs={'blog_id': self.published_blog.id})
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        comments = response.data['comments']
+        self.assertEqual(len(comments), 4)
+        self.assertEqual(comments[0]['id'], self.comment.id)
+        self.assertEqual(comments[0]['replies'][0]['username'], 'anotheruser')
+        self.assertEqual(comments[0]['replies'][0]['replies'][0]['content'], 'Nested reply')
+        self.assertEqual([len(comment['replies']) for comment in comments[1:]], [2, 2, 2])
+
+    def test_blog_list_cursor_pagination(self):
+        for index in range(5):
+            Blog.objects.create(title=f'Cursor Blog {index}', content='x', status=Blog.PUBLISHED, author=self.another_user)
+        self.client.force_authenticate(user=None)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('blog_list'), {'pagination': 'cursor', 'page_size': 4})
+
+        self.assertTrue(response.data['success'])
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+        first_page = [blog['id'] for blog in response.data['data']]
+        self.assertEqual(len(first_page), 4)
+
+        response = self.client.get(response.data['next'])
+        second_page = [blog['id'] for blog in response.data['data']]
+        self.assertEqual(len(second_page), 2)
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertIsNone(response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+
+    def test_blog_list_cursor_pagination_includes_own_drafts(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse('blog_list'), {'pagination': 'cursor'})
+
+        self.assertEqual({blog['id'] for blog in response.data['data']}, {self.published_blog.id, self.draft_blog.id})
+
+    def test_user_blogs_cursor_pagination(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse('user-blogs'), {'pagination': 'cursor', 'page_size': 1})
+
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_blog_list_all_uses_single_filtered_query(self):
+        Blog.objects.create(title='Other draft', content='x', status=Blog.DRAFT, author=self.another_user)
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('blog_list'), {'status': 'all'})
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([blog['id'] for blog in response.data['data']], [self.draft_blog.id, self.published_blog.id])
+
+    @patch('blog_module.views.send_comment_notification_email.delay')
+    def test_anonymous_blog_list_is_served_from_versioned_cache(self, mock_notification):
+        url = reverse('blog_list')
+        stats = cache_stats()
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['data'][0]['title'], 'Published Test Blog')
+        self.assertEqual(cache_stats()['hits'], stats['hits'] + 1)
+        self.assertEqual(cache_stats()['misses'], stats['misses'] + 1)
+
+        self.assertEqual(self.client.get(url, {'page_size': 1})['X-Cache'], 'MISS')
+
+        self.client.force_authenticate(user=self.another_user)
+        self.client.post(reverse('comment_create', kwargs={'blog_id': self.published_blog.id}),
+                         {'content': 'Fresh comment'}, format='json')
+        self.client.force_authenticate(user=None)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data'][0]['comment_count'], 2)
+
+        Comment.objects.get(content='Fresh comment').delete()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data'][0]['comment_count'], 1)
+
+        self.published_blog.title = 'Renamed Blog'
+        self.published_blog.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data'][0]['title'], 'Renamed Blog')
+
+    def test_feeds_send_the_excerpt_without_reading_content(self):
+        long_blog = Blog.objects.create(title='Long read', content='word ' * 5000, status=Blog.PUBLISHED,
+                                        author=self.user)
+        self.client.force_authenticate(user=self.user)
+
+        for url, params in ((reverse('blog_list'), {}), (reverse('blog_list'), {'pagination': 'cursor'}),
+                            (reverse('user-blogs'), {})):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(url, params)
+            card = next(blog for blog in response.data['data'] if blog['id'] == long_blog.id)
+            self.assertNotIn('content', card)
+            self.assertEqual(len(card['excerpt']), 199)
+            self.assertTrue(all('"content"' not in query['sql'] for query in captured.captured_queries), url)
+
+    def test_feed_sparse_fieldset(self):
+        response = self.client.get(reverse('blog_list'), {'fields': 'id,title'})
+        self.assertEqual(response.data['data'], [{'id': self.published_blog.id, 'title': 'Published Test Blog'}])
+
+        response = self.client.get(reverse('blog_list'), {'fields': 'id,content'})
+        self.assertEqual(response.data['data'][0]['content'], 'This is a published test blog content')
+
+        response = self.client.get(reverse('blog_list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', str(response.data['fields']))
+
+    def test_excerpt_follows_content_edits(self):
+        self.assertEqual(self.published_blog.excerpt, 'This is a published test blog content')
+        self.published_blog.content = 'Rewritten\n\nfrom   scratch'
+        self.published_blog.save(update_fields=['content'])
+        self.published_blog.refresh_from_db()
+        self.assertEqual(self.published_blog.excerpt, 'Rewritten from scratch')
+
+    def test_compiled_serializer_matches_blog_list_serializer(self):
+        Blog.objects.create(title='Ünïcode\u2028title', content='Body ' * 100, status=Blog.PUBLISHED, author=self.another_user)
+        blogs = blog_queryset().order_by('-updated_at', '-id')
+        for fields in (None, ['id', 'title'], ['content', 'author', 'created_at'], BlogListSerializer.Meta.fields):
+            compiled = compiled_blog_list_serializer(fields)
+            self.assertEqual(compiled.serialize(compiled.rows(blogs)),
+                             BlogListSerializer(blogs, many=True, fields=fields).data, fields)
+
+    def test_fast_serialization_renders_the_same_bytes(self):
+        self.client.force_authenticate(user=self.user)
+        for url, params in ((reverse('blog_list'), {}), (reverse('blog_list'), {'pagination': 'cursor'}),
+                            (reverse('blog_list'), {'fields': 'id,content,updated_at'}),
+                            (reverse('blog_search'), {'q': 'published'}), (reverse('user-blogs'), {})):
+            bodies = []
+            for fast in (True, False):
+                with self.settings(BLOG_FAST_SERIALIZATION=fast):
+                    cache.clear()
+                    bodies.append(self.client.get(url, params).content)
+            self.assertEqual(bodies[0], bodies[1], (url, params))
+
+
+class FakeRedis:
+    """Just enough of the redis-py client for RedisViewCounter."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hincrby(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[str(field).encode()] = bucket.get(str(field).encode(), 0) + amount
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def hgetall(self, key):
+        self.commands.append(lambda: dict(self.client.hashes.get(key, {})))
+
+    def delete(self, key):
+        self.commands.append(lambda: int(self.client.hashes.pop(key, None) is not None))
+
+    def execute(self):
+        return [command() for command in self.commands]
@@ -0,0 +1,113 @@
+# backend/blogify/blog_module/tests/test_async_views.py
+import json
+from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from ..async_views import AsyncBlogDetailView, AsyncBlogListView, AsyncUserBlogsView
+from ..models import Blog, Comment
+from ..view_counter import get_view_counter
+
+User = get_user_model()
+
+
+@override_settings(BLOG_VIEW_FLUSH_INTERVAL=0)
+class AsyncBlogViewTests(TestCase):
+
+    def setUp(self):
+        get_view_counter().drain()
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@gmail.com', password='test@gmail.com',
+                                             is_active=True)
+        self.published_blog = Blog.objects.create(title='Published', content='Published content',
+                                                  status=Blog.PUBLISHED, author=self.user)
+        self.draft_blog = Blog.objects.create(title='Draft', content='Draft content',
+                                              status=Blog.DRAFT, author=self.user)
+        comment = Comment.objects.create(content='Top', user=self.user, blog=self.published_blog)
+        Comment.objects.create(content='Reply', user=self.user, blog=self.published_blog, parent=comment)
+        self.factory = AsyncRequestFactory()
+        self.token = f'Bearer {AccessToken.for_user(self.user)}'
+        self.auth = {'headers': {'Authorization': self.token}}
+
+    @sync_to_async
+    def sync_payload(self, url, token=None):
+        client = APIClient()
+        if token:
+            client.credentials(HTTP_AUTHORIZATION=token)
+        return json.loads(client.get(url).content)
+
+    async def test_list_matches_sync_view(self):
+        response = await AsyncBlogListView.as_view()(self.factory.get(reverse('blog_list')))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        cache.clear()
+        self.assertEqual(json.loads(response.content), await self.sync_payload(reverse('blog_list')))
+
+    async def test_list_includes_own_drafts_when_authenticated(self):
+        response = await AsyncBlogListView.as_view()(self.factory.get(reverse('blog_list'), **self.auth))
+        payload = json.loads(response.content)
+        self.assertEqual(payload['count'], 2)
+        self.assertEqual(payload, await self.sync_payload(reverse('blog_list'), self.token))
+
+    async def test_list_invalid_page_is_404(self):
+        response = await AsyncBlogListView.as_view()(self.factory.get(reverse('blog_list'), {'page': 5}, **self.auth))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_list_pagination_matches_sync_view(self):
+        for params in ({'page_size': 1, 'page': 2}, {'page_size': 1, 'page': 'last'}, {'page_size': 500},
+                       {'page': 'abc'}, {'page': 0}):
+            url = f"{reverse('blog_list')}?{urlencode(params)}"
+            response = await AsyncBlogListView.as_view()(self.factory.get(url, **self.auth))
+            self.assertEqual(json.loads(response.content), await self.sync_payload(url, self.token), params)
+
+    async def test_list_cursor_pagination(self):
+        request = self.factory.get(reverse('blog_list'), {'pagination': 'cursor', 'page_size': 1}, **self.auth)
+        payload = json.loads((await AsyncBlogListView.as_view()(request)).content)
+        self.assertEqual(len(payload['data']), 1)
+        self.assertIsNotNone(payload['next'])
+
+    async def test_detail_returns_nested_comments_and_counts_view(self):
+        request = self.factory.get(reverse('blog_detail', args=[self.published_blog.id]))
+        response = await AsyncBlogDetailView.as_view()(request, blog_id=self.published_blog.id)
+        payload = json.loads(response.content)
+        self.assertEqual(payload['blog']['id'], self.published_blog.id)
+        self.assertEqual(payload['comments'][0]['replies'][0]['content'], 'Reply')
+        self.assertEqual(get_view_counter().drain(), {self.published_blog.id: 1})
+
+    async def test_detail_etag_matches_sync_view_and_revalidates(self):
+        url = reverse('blog_detail', args=[self.published_blog.id])
+        response = await AsyncBlogDetailView.as_view()(self.factory.get(url), blog_id=self.published_blog.id)
+        etag = response['ETag']
+        sync_response = await sync_to_async(APIClient().get)(url)
+        self.assertEqual(sync_response['ETag'], etag)
+
+        request = self.factory.get(url, headers={'If-None-Match': etag})
+        response = await AsyncBlogDetailView.as_view()(request, blog_id=self.published_blog.id)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_list_revalidates(self):
+        response = await AsyncBlogListView.as_view()(self.factory.get(reverse('blog_list')))
+        request = self.factory.get(reverse('blog_list'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual((await AsyncBlogListView.as_view()(request)).status_code, 304)
+
+    async def test_detail_hides_drafts_from_other_users(self):
+        request = self.factory.get(reverse('blog_detail', args=[self.draft_blog.id]))
+        response = await AsyncBlogDetailView.as_view()(request, blog_id=self.draft_blog.id)
+        self.assertEqual(response.status_code, 403)
+
+    async def test_user_blogs_requires_authentication(self):
+        response = await AsyncUserBlogsView.as_view()(self.factory.get(reverse('user-blogs')))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+        response = await AsyncUserBlogsView.as_view()(self.factory.get(reverse('user-blogs'), **self.auth))
+        self.assertEqual(len(json.loads(response.content)['data']), 2)
+
+    async def test_invalid_token_is_rejected(self):
+        request = self.factory.get(reverse('blog_list'), headers={'Authorization': 'Bearer not-a-token'})
+        response = await AsyncBlogListView.as_view()(request)
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,112 @@
+# backend/blogify/blog_module/tests/test_conditional_get.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from ..models import Blog, Comment
+from ..view_counter import get_view_counter
+
+User = get_user_model()
+
+
+@override_settings(BLOG_VIEW_FLUSH_INTERVAL=0)
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        get_view_counter().drain()
+        cache.clear()
+        self.author = User.objects.create_user(username='author', email='author@gmail.com', password='author@gmail.com',
+                                               is_active=True)
+        self.blog = Blog.objects.create(title='Cached', content='Body', status=Blog.PUBLISHED, author=self.author)
+        self.draft = Blog.objects.create(title='Draft', content='Body', status=Blog.DRAFT, author=self.author)
+        self.detail_url = reverse('blog_detail', args=[self.blog.id])
+        self.list_url = reverse('blog_list')
+
+    def sign_in(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.author)}')
+
+    def test_detail_revalidates_without_queries(self):
+        first = self.client.get(self.detail_url)
+        etag = first['ETag']
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], etag)
+        self.assertEqual(second.content, b'')
+        # A revalidated read is still a view.
+        self.assertEqual(get_view_counter().drain(), {self.blog.id: 2})
+
+    def test_detail_etag_changes_with_comments_and_edits(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        Comment.objects.create(content='New', user=self.author, blog=self.blog)
+        after_comment = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(after_comment.status_code, 200)
+        self.assertNotEqual(after_comment['ETag'], etag)
+
+        self.blog.title = 'Edited'
+        self.blog.save()
+        after_edit = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=after_comment['ETag'])
+        self.assertEqual(after_edit.status_code, 200)
+        self.assertEqual(after_edit.data['blog']['title'], 'Edited')
+
+    def test_comment_delete_changes_the_detail_and_list_etags(self):
+        comment = Comment.objects.create(content='Going', user=self.author, blog=self.blog)
+        detail_etag = self.client.get(self.detail_url)['ETag']
+        list_etag = self.client.get(self.list_url)['ETag']
+
+        comment.delete()
+
+        detail = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.data['blog']['comment_count'], 0)
+        listing = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(listing.status_code, 200)
+        self.assertEqual(listing.data['data'][0]['comment_count'], 0)
+
+    def test_detail_matches_without_a_remembered_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        cache.clear()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_draft_etag_does_not_bypass_the_author_check(self):
+        self.sign_in()
+        etag = self.client.get(reverse('blog_detail', args=[self.draft.id]))['ETag']
+        self.client.credentials()
+
+        response = self.client.get(reverse('blog_detail', args=[self.draft.id]), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_list_revalidates_without_queries(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+        Blog.objects.create(title='Newer', content='Body', status=Blog.PUBLISHED, author=self.author)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_list_etag_depends_on_the_viewer_and_page(self):
+        anonymous = self.client.get(self.list_url)['ETag']
+        cursor = self.client.get(self.list_url, {'pagination': 'cursor'})['ETag']
+        self.sign_in()
+        signed_in = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=anonymous)
+
+        self.assertEqual(signed_in.status_code, 200)
+        self.assertEqual(signed_in.data['count'], 2)
+        self.assertEqual(len({anonymous, cursor, signed_in['ETag']}), 3)
+        self.assertIn('Authorization', signed_in['Vary'])
@@ -0,0 +1,88 @@
+# backend/blogify/blog_module/tests/test_search.py
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APITestCase
+from ..models import Blog
+
+User = get_user_model()
+
+
+class BlogSearchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', email='search@gmail.com', password='search@gmail.com')
+        self.url = reverse('blog_search')
+
+    def create_blog(self, title, content, status=Blog.PUBLISHED):
+        return Blog.objects.create(title=title, content=content, status=status, author=self.user)
+
+    def search(self, **params):
+        return self.client.get(self.url, params)
+
+    def test_title_matches_rank_above_content_matches(self):
+        in_content = self.create_blog('Weekend notes', 'We tried a new sourdough recipe.')
+        in_title = self.create_blog('Sourdough basics', 'Flour, water and patience.')
+        self.create_blog('Unrelated', 'Nothing to see here.')
+
+        response = self.search(q='sourdough')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([blog['id'] for blog in response.data['data']], [in_title.id, in_content.id])
+        self.assertGreater(response.data['data'][0]['rank'], response.data['data'][1]['rank'])
+
+    def test_drafts_are_not_searchable(self):
+        self.create_blog('Secret sourdough', 'Not yet.', status=Blog.DRAFT)
+
+        self.assertEqual(self.search(q='sourdough').data['data'], [])
+
+    def test_index_follows_edits_and_deletes(self):
+        blog = self.create_blog('Bread', 'Rye')
+        blog.content = 'Spelt'
+        blog.save()
+
+        self.assertEqual(self.search(q='rye').data['data'], [])
+        self.assertEqual(len(self.search(q='spelt').data['data']), 1)
+
+        blog.delete()
+        self.assertEqual(self.search(q='spelt').data['data'], [])
+
+    def test_keyset_pagination_walks_every_result_once(self):
+        ids = {self.create_blog(f'Bread {index}', 'Crust ' * (index + 1)).id for index in range(5)}
+
+        seen = []
+        response = self.search(q='crust', page_size=2)
+        while True:
+            seen += [blog['id'] for blog in response.data['data']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(sorted(seen), sorted(ids))
+        self.assertEqual(len(seen), len(ids))
+
+    def test_user_input_cannot_break_the_match_syntax(self):
+        self.create_blog('Quotes', 'He said "hello" AND left')
+
+        response = self.search(q='"hello" AND NEAR(')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_query_and_bad_cursor_are_rejected(self):
+        self.assertEqual(self.search().status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.search(q='bread', cursor='nope').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_search_index_command(self):
+        self.create_blog('Bulk', 'imported')
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM blog_module_blog_fts')
+        self.assertEqual(self.search(q='imported').data['data'], [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('1 blogs', out.getvalue())
+        self.assertEqual(len(self.search(q='imported').data['data']), 1)
@@ -0,0 +1,50 @@
+# backend/blogify/blog_module/tests/test_tasks.py
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from ..models import Blog
+from ..tasks import notify_users_of_new_blog, send_new_blog_notification_chunk
+from user_module.utils import smtp_pool
+from unittest.mock import patch
+
+User = get_user_model()
+
+class NotifyUsersOfNewBlogTestCase(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@gmail.com', password='x', is_active=True)
+        for index in range(5):
+            User.objects.create_user(username=f'reader{index}', email=f'reader{index}@gmail.com', password='x', is_active=True)
+        User.objects.create_user(username='inactive', email='inactive@gmail.com', password='x')
+
+        self.blog = Blog.objects.create(title='Fresh Blog', content='content', status=Blog.PUBLISHED, author=self.author)
+
+    @override_settings(BLOG_NOTIFICATION_CHUNK_SIZE=2)
+    @patch('blog_module.tasks.group')
+    def test_recipients_are_fanned_out_in_chunks(self, mock_group):
+        result = notify_users_of_new_blog()
+
+        signatures = mock_group.call_args[0][0]
+        chunks = [signature.args[2] for signature in signatures]
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(sorted(sum(chunks, [])), [f'reader{index}@gmail.com' for index in range(5)])
+        self.assertEqual(signatures[0].args[0], 'New Blog Post: Fresh Blog')
+        mock_group.return_value.apply_async.assert_called_once()
+        self.assertIn('Queued 3 notification chunks for 1 new blog posts', result)
+
+    @patch('blog_module.tasks.group')
+    def test_nothing_is_queued_without_new_blogs(self, mock_group):
+        Blog.objects.update(status=Blog.DRAFT)
+
+        self.assertEqual(notify_users_of_new_blog(), 'No new blogs to notify about')
+        mock_group.assert_not_called()
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='smtp')
+    def test_chunk_shares_one_connection(self):
+        smtp_pool.close()
+        with patch('user_module.utils.get_connection', wraps=mail.get_connection) as mock_connection:
+            result = send_new_blog_notification_chunk('Subject', 'Body', ['a@gmail.com', 'b@gmail.com', 'c@gmail.com'])
+
+        mock_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(result, 'Sent 3 of 3 notifications')
@@ -1,10 +1,15 @@
 # backend/blogify/blog_module/urls.py
+from django.conf import settings
 from django.urls import path
-from .views import BlogListView, BlogCreateView, BlogDetailView, BlogEditView, BlogDeleteView, CommentCreateView,CommentReplyView, UserBlogsView
+from .views import BlogListView, BlogCreateView, BlogDetailView, BlogEditView, BlogDeleteView, CommentCreateView,CommentReplyView, UserBlogsView, BlogSearchView
+
+if getattr(settings, 'BLOG_ASYNC_VIEWS', False):
+    from .async_views import AsyncBlogListView as BlogListView, AsyncBlogDetailView as BlogDetailView, AsyncUserBlogsView as UserBlogsView
 
 urlpatterns = [
     
     path('blogs/', BlogListView.as_view(), name='blog_list'),
+    path('blogs/search/', BlogSearchView.as_view(), name='blog_search'),
     path('blogs/create/', BlogCreateView.as_view(), name='blog_create'),
     path('blogs/<int:blog_id>/', BlogDetailView.as_view(), name='blog_detail'),
     path('blogs/<int:blog_id>/edit/', BlogEditView.as_view(), name='blog_edit'),
@@ -0,0 +1,143 @@
+# backend/blogify/blog_module/view_counter.py
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.module_loading import import_string
+from .models import Blog
+import atexit
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class LocalViewCounter:
+    """Buffers view hits in the memory of the current process."""
+
+    # Other processes (e.g. the Celery worker) cannot see this buffer, so it
+    # has to be flushed from inside the web process itself.
+    shared = False
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, blog_id, amount=1):
+        with self._lock:
+            self._counts[blog_id] += amount
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return dict(counts)
+
+
+class RedisViewCounter:
+    """Buffers view hits in a Redis hash shared by every web worker."""
+
+    shared = True
+
+    def __init__(self, url=None, key='blogify:blog_views', client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url or settings.BLOG_VIEW_COUNTER_REDIS_URL)
+        self.client = client
+        self.key = key
+
+    def incr(self, blog_id, amount=1):
+        self.client.hincrby(self.key, blog_id, amount)
+
+    def drain(self):
+        # HGETALL + DEL run in one MULTI/EXEC, so hits recorded while we
+        # flush land in a fresh hash instead of being dropped.
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hgetall(self.key)
+        pipe.delete(self.key)
+        counts, _ = pipe.execute()
+        return {int(blog_id): int(amount) for blog_id, amount in counts.items()}
+
+
+_counter = None
+_counter_lock = threading.Lock()
+_flusher_pid = None
+
+
+def get_view_counter():
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                backend = getattr(settings, 'BLOG_VIEW_COUNTER_BACKEND', 'blog_module.view_counter.LocalViewCounter')
+                _counter = import_string(backend)()
+    return _counter
+
+
+def flush_view_counts(counter=None):
+    """Apply buffered hits with one ``views = views + n`` UPDATE per distinct n."""
+    counter = counter or get_view_counter()
+    counts = counter.drain()
+    if not counts:
+        return 0
+
+    by_amount = defaultdict(list)
+    for blog_id, amount in counts.items():
+        by_amount[amount].append(blog_id)
+
+    try:
+        with transaction.atomic():
+            for amount, blog_ids in by_amount.items():
+                Blog.objects.filter(id__in=blog_ids).update(views=F('views') + amount)
+    except Exception:
+        # Put the hits back so the next flush retries them instead of losing them.
+        for blog_id, amount in counts.items():
+            counter.incr(blog_id, amount)
+        raise
+    return sum(counts.values())
+
+
+def record_view(blog_id):
+    counter = get_view_counter()
+    counter.incr(blog_id)
+    _ensure_flusher(counter)
+
+
+def _ensure_flusher(counter):
+    """Start a per-process flush thread unless Celery beat flushes a shared buffer."""
+    global _flusher_pid
+    interval = getattr(settings, 'BLOG_VIEW_FLUSH_INTERVAL', 10)
+    if interval <= 0 or _flusher_pid == os.getpid():
+        return
+    if counter.shared and getattr(settings, 'ENABLE_CELERY', False):
+        return
+
+    with _counter_lock:
+        # The pid check restarts the thread in forked gunicorn workers.
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        stop = threading.Event()
+        thread = threading.Thread(target=_flush_loop, args=(counter, interval, stop),
+                                  name='blog-view-flusher', daemon=True)
+        thread.start()
+        atexit.register(_flush_on_exit, counter, stop)
+
+
+def _flush_loop(counter, interval, stop):
+    while not stop.wait(interval):
+        _flush_quietly(counter)
+
+
+def _flush_on_exit(counter, stop):
+    stop.set()
+    _flush_quietly(counter)
+
+
+def _flush_quietly(counter):
+    try:
+        flush_view_counts(counter)
+    except Exception as exc:
+        logger.warning('Flushing buffered blog views failed: %s', exc)
+    finally:
+        connection.close()
@@ -1,69 +1,235 @@
 # backend/blogify/blog_module/views.py
 from django.shortcuts import render
 from django.conf import settings
+from django.db.models import Q
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response 
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .models import Blog,Comment
-from .serializers import BlogSerializer,CommentSerializer,ReplySerializer
+from .serializers import BlogSerializer,BlogListSerializer,CommentSerializer,ReplySerializer,compiled_blog_list_serializer
 from .tasks import send_comment_notification_email
-from rest_framework.pagination import PageNumberPagination
+from .view_counter import record_view
+from .comment_tree import build_comment_tree
+from .cache import get_cached_page, list_page_cache_key, set_cached_page
+from blogify.routers import use_primary
+from .search import decode_cursor, encode_cursor, search_blogs
+from .etags import (blog_etag, detail_etag_key, etag_matches, list_etag, list_etag_key,
+                    not_modified, remember_etag, remembered_etag, with_etag)
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 import logging
 
 logger = logging.getLogger(__name__)
 
+def blog_queryset():
+    # comment_count is a maintained column, so listings need no aggregate.
+    # The search vector is only ever read by the database.
+    return Blog.objects.select_related('author').defer('search_vector')
+
+def feed_fields(request):
+    """The sparse fieldset of ``?fields=id,title,...``, or None for the default card."""
+    requested = request.query_params.get('fields')
+    if not requested:
+        return None
+    fields = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = sorted(set(fields) - set(BlogListSerializer.Meta.fields))
+    if unknown:
+        raise ValidationError({'fields': f'Unknown fields: {", ".join(unknown)}.'})
+    return fields
+
+def fast_serialization():
+    return getattr(settings, 'BLOG_FAST_SERIALIZATION', True)
+
+def feed_queryset(blogs, fields=None):
+    # Cards show the excerpt; the content column is only read when a
+    # client asks for it by name. In the fast mode the rows are values()
+    # dicts holding just the card's columns.
+    if fast_serialization():
+        return compiled_blog_list_serializer(fields).rows(blogs)
+    if fields is None or 'content' not in fields:
+        blogs = blogs.defer('content')
+    return blogs
+
+def feed_data(page, fields=None):
+    """Serialize rows of feed_queryset() as feed cards."""
+    if fast_serialization():
+        return compiled_blog_list_serializer(fields).serialize(page)
+    return BlogListSerializer(page, many=True, fields=fields).data
+
+def blog_list_queryset(user, filter_status=None):
+    if user.is_authenticated:
+        if filter_status == 'published':
+            blogs = blog_queryset().filter(status=Blog.PUBLISHED)
+        elif filter_status == 'draft':
+            blogs = blog_queryset().filter(author=user, status=Blog.DRAFT)
+        elif filter_status == 'myblogs':
+            blogs = blog_queryset().filter(author=user)
+        else:
+            # One indexed OR filter instead of a UNION: the database can
+            # walk the (status, updated_at) / (author, status, updated_at)
+            # indexes and the count stays a plain COUNT(*).
+            blogs = blog_queryset().filter(
+                Q(status=Blog.PUBLISHED) | Q(author=user, status=Blog.DRAFT)
+            )
+    else:
+        blogs = blog_queryset().filter(status=Blog.PUBLISHED)
+    return blogs.order_by('-updated_at', '-id')
+
 class BlogPagination(PageNumberPagination):
     page_size = 9
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+class BlogCursorPagination(CursorPagination):
+    # No COUNT(*) and no page-number OFFSET: DRF positions the cursor on
+    # updated_at alone and skips rows sharing that timestamp with a small
+    # offset, with id only making the order stable. The (updated_at, id)
+    # index serves the ORDER BY; ties on updated_at are rare, so deep pages
+    # cost about the same as the first one.
+    page_size = 9
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-updated_at', '-id')
+
+def wants_cursor_pagination(request):
+    return request.query_params.get('pagination') == 'cursor'
+
+def cursor_paginated_response(blogs, request, view):
+    fields = feed_fields(request)
+    paginator = BlogCursorPagination()
+    page = paginator.paginate_queryset(feed_queryset(blogs, fields), request, view=view)
+    return Response({
+        'success': True,
+        'data': feed_data(page, fields),
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+    }, status=status.HTTP_200_OK)
+
+def page_payload(paginator, blogs, request, fields=None):
+    """The page-number list payload; also run by the async list view."""
+    page = paginator.paginate_queryset(blogs, request)
+    
+    if page is not None:
+        data = feed_data(page, fields)
+        result = paginator.get_paginated_response(data)
+        return {
+            'success': True,
+            'data': data,
+            'count': result.data['count'],
+            'next': result.data['next'],
+            'previous': result.data['previous'],
+            'total_pages': (result.data['count'] + paginator.page_size - 1) // paginator.page_size
+        }
+    
+    return {
+        'success': True,
+        'data': feed_data(blogs, fields)
+    }
+
+@use_primary()
+def cacheable_page_payload(paginator, blogs, request, fields=None):
+    """page_payload() read from the primary, for pages that go into the cache.
+
+    The cache key carries the content version of the moment, so a page built
+    from replica rows that lag behind that version would be served as fresh
+    until the next write.
+    """
+    return page_payload(paginator, blogs, request, fields)
+
 class BlogListView(APIView):
     permission_classes = [AllowAny]
     pagination_class = BlogPagination
 
     def get(self, request):
+        etag_key = list_etag_key(request)
+        remembered = remembered_etag(etag_key)
+        if remembered is not None and etag_matches(request, remembered['etag']):
+            return not_modified(remembered['etag'])
+
+        response = self.page_response(request)
+        etag = list_etag(response.data)
+        remember_etag(etag_key, etag)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return with_etag(response, etag)
+
+    def page_response(self, request):
         paginator = self.pagination_class()
+        fields = feed_fields(request)
         
-        if request.user.is_authenticated:
-            published_blogs = Blog.objects.filter(status=Blog.PUBLISHED).select_related('author')
-            draft_blogs = Blog.objects.filter(author=request.user, status=Blog.DRAFT).select_related('author')
-            
-            filter_status = request.query_params.get('status')
-            if filter_status:
-                if filter_status == 'published':
-                    blogs = published_blogs.order_by('-updated_at')
-                elif filter_status == 'draft':
-                    blogs = draft_blogs.order_by('-updated_at')
-                elif filter_status == 'myblogs':
-                    blogs = Blog.objects.filter(author=request.user).select_related('author').order_by('-updated_at')
-                elif filter_status == 'all':
-                    combined_queryset = published_blogs.union(draft_blogs)
-                    blogs = combined_queryset.order_by('-updated_at')
-            else:
-                combined_queryset = published_blogs.union(draft_blogs)
-                blogs = combined_queryset.order_by('-updated_at')
-        else:
-            blogs = Blog.objects.filter(status=Blog.PUBLISHED).select_related('author').order_by('-updated_at')
-        
-        page = paginator.paginate_queryset(blogs, request)
-        
-        if page is not None:
-            serializer = BlogSerializer(page, many=True)
-            result = paginator.get_paginated_response(serializer.data)
+        blogs = feed_queryset(blog_list_queryset(request.user, request.query_params.get('status')), fields)
+
+        if wants_cursor_pagination(request):
+            return cursor_paginated_response(blogs, request, self)
+
+        if not request.user.is_authenticated:
+            # Anonymous pages are identical for everyone; serve them from the
+            # versioned cache until blog or comment content changes.
+            cache_key = list_page_cache_key(
+                request.get_host(),
+                request.query_params.get(paginator.page_query_param, '1'),
+                paginator.get_page_size(request),
+                fields,
+            )
+            payload = get_cached_page(cache_key)
+            if payload is not None:
+                return Response(payload, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+            payload = cacheable_page_payload(paginator, blogs, request, fields)
+            set_cached_page(cache_key, payload)
+            return Response(payload, status=status.HTTP_200_OK, headers={'X-Cache': 'MISS'})
+
+        return Response(page_payload(paginator, blogs, request, fields), status=status.HTTP_200_OK)
+
+class BlogSearchView(APIView):
+    permission_classes = [AllowAny]
+    pagination_class = BlogPagination
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
             return Response({
-                'success': True,
-                'data': serializer.data,
-                'count': result.data['count'],
-                'next': result.data['next'],
-                'previous': result.data['previous'],
-                'total_pages': (result.data['count'] + paginator.page_size - 1) // paginator.page_size
-            }, status=status.HTTP_200_OK)
-        
-        serializer = BlogSerializer(blogs, many=True)
+                'success': False,
+                'message': 'Search query is required.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        after = None
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                return Response({
+                    'success': False,
+                    'message': 'Invalid cursor.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = feed_fields(request)
+        page_size = self.pagination_class().get_page_size(request)
+        # One extra row tells us whether there is a next page.
+        results = search_blogs(query, page_size + 1, after)
+        has_next = len(results) > page_size
+        results = results[:page_size]
+
+        blogs = feed_queryset(blog_queryset(), fields).filter(id__in=[blog_id for blog_id, _ in results])
+        if fast_serialization():
+            blogs = {blog['id']: blog for blog in blogs}
+        else:
+            blogs = {blog.id: blog for blog in blogs}
+        ranked = [(blogs[blog_id], rank) for blog_id, rank in results if blog_id in blogs]
+        data = feed_data([blog for blog, _ in ranked], fields)
+        for item, (_, rank) in zip(data, ranked):
+            item['rank'] = rank
+
+        next_link = None
+        if has_next:
+            last_id, last_rank = results[-1]
+            next_link = replace_query_param(request.build_absolute_uri(), 'cursor', encode_cursor(last_rank, last_id))
         return Response({
             'success': True,
-            'data': serializer.data
+            'data': data,
+            'next': next_link,
         }, status=status.HTTP_200_OK)
 
 class BlogCreateView(APIView):
@@ -89,8 +255,16 @@ class BlogDetailView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, blog_id):
+        etag_key = detail_etag_key(blog_id)
+        remembered = remembered_etag(etag_key)
+        if (remembered is not None and etag_matches(request, remembered['etag'])
+                and (remembered['status'] == Blog.PUBLISHED or remembered['author_id'] == request.user.id)):
+            if remembered['status'] == Blog.PUBLISHED and remembered['author_id'] != request.user.id:
+                record_view(blog_id)
+            return not_modified(remembered['etag'])
+
         try:
-            blog =Blog.objects.get(id=blog_id)
+            blog = blog_queryset().get(id=blog_id)
 
             if blog.status == Blog.DRAFT and blog.author != request.user:
                 response = Response({'success': False,
@@ -99,18 +273,21 @@ class BlogDetailView(APIView):
                 return response
             
             if blog.status == Blog.PUBLISHED and blog.author != request.user:
-                blog.views += 1
-                blog.save(update_fields=['views'])
+                record_view(blog.id)
+
+            etag = blog_etag(blog)
+            remember_etag(etag_key, etag, status=blog.status, author_id=blog.author_id)
+            if etag_matches(request, etag):
+                return not_modified(etag)
 
             serializer = BlogSerializer(blog)
-            comments = Comment.objects.filter(blog=blog, parent = None).select_related('user')
-            comment_data = CommentSerializer(comments, many = True).data
+            comment_data = CommentSerializer(build_comment_tree(blog), many = True).data
             response = Response({
                 'success': True,
                 'blog': serializer.data,
                 'comments': comment_data
             },status = status.HTTP_200_OK)
-            return response
+            return with_etag(response, etag)
         except Blog.DoesNotExist:
             return Response({'success': False,'message': 'Blog not found'}, status = status.HTTP_404_NOT_FOUND)
 
@@ -247,10 +424,12 @@ class UserBlogsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user_blogs = Blog.objects.filter(author=request.user).select_related('author').order_by('-updated_at')
-        serializer = BlogSerializer(user_blogs, many=True)
-        
+        user_blogs = blog_queryset().filter(author=request.user).order_by('-updated_at', '-id')
+        if wants_cursor_pagination(request):
+            return cursor_paginated_response(user_blogs, request, self)
+
+        fields = feed_fields(request)
         return Response({
             'success': True,
-            'data': serializer.data
+            'data': feed_data(feed_queryset(user_blogs, fields), fields)
         }, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class BlogifyConfig(AppConfig):
+    name = 'blogify'
+
+    def ready(self):
+        from .middleware import record_new_connection
+        connection_created.connect(record_new_connection, dispatch_uid='blogify.record_new_connection')
@@ -0,0 +1,57 @@
+# backend/blogify/blogify/db.py
+"""Connection persistence and pooling for every DATABASES profile.
+
+settings.py builds the default database from DATABASE_URL, the DB_* variables
+or SQLite, then passes it through configure_connections():
+
+    DB_CONN_MAX_AGE        seconds to keep a connection open between requests
+                           (default 600 for database servers, 0 for SQLite,
+                           where opening a file costs next to nothing; 0
+                           closes it after every request)
+    DB_CONN_HEALTH_CHECKS  ping a reused connection before its first query in
+                           a request (default true for database servers)
+    DB_POOL                use psycopg's connection pool (PostgreSQL only);
+                           sized by DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE and
+                           waiting at most DB_POOL_TIMEOUT seconds for a
+                           connection
+    DB_PGBOUNCER           talking to PgBouncer in transaction pooling mode:
+                           no server-side cursors and no prepared statements
+"""
+import os
+
+
+def _env_flag(name, default):
+    return os.getenv(name, str(default)).lower() in ('true', '1', 'yes')
+
+
+def configure_connections(database):
+    database = dict(database)
+    is_postgres = 'postgresql' in database.get('ENGINE', '')
+    is_server = 'sqlite' not in database.get('ENGINE', '')
+    options = dict(database.get('OPTIONS', {}))
+
+    default_max_age = database.get('CONN_MAX_AGE') or (600 if is_server else 0)
+    database['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', default_max_age))
+    database['CONN_HEALTH_CHECKS'] = _env_flag('DB_CONN_HEALTH_CHECKS', is_server)
+
+    if is_postgres and _env_flag('DB_POOL', False):
+        options['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+        # Django refuses persistent connections on top of a pool; the pool
+        # keeps them open and health-checks them on checkout instead.
+        database['CONN_MAX_AGE'] = 0
+        database['CONN_HEALTH_CHECKS'] = False
+
+    if is_postgres and _env_flag('DB_PGBOUNCER', False):
+        # In transaction pooling mode consecutive statements may run on
+        # different server connections, which breaks named cursors and
+        # prepared statements.
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+        options['prepare_threshold'] = None
+
+    if options:
+        database['OPTIONS'] = options
+    return database
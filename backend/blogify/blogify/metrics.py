@@ -0,0 +1,172 @@
+# backend/blogify/blogify/metrics.py
+"""Per-request performance metrics, aggregated per view.
+
+PerformanceMiddleware opens a RequestMetrics for every request and keeps it
+in a context variable while the view runs, which the ORM reaches whether the
+view is sync, async or in a sync_to_async thread. Database queries are
+counted and timed by time_query(), an execute wrapper the middleware puts on
+the request's connections for the length of the request; cache lookups and
+response rendering report into it through record_cache() and
+timed_serialization(). When the response is ready the totals are added to
+the process-wide ``registry`` under the resolved view name, which the
+/metrics endpoint exposes in the Prometheus text format.
+
+The registry lives in process memory: with several gunicorn workers each
+scrape sees one worker, so scrape per worker or sum the counters over time.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('db_queries', 'db_seconds', 'cache_hits', 'cache_misses', 'serialize_seconds')
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serialize_seconds = 0.0
+
+    def time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+
+def time_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.time_query(execute, sql, params, many, context)
+
+
+@contextmanager
+def collect_request_metrics():
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def record_cache(hit):
+    """Count a cache lookup against the current request, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+@contextmanager
+def timed_serialization():
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.serialize_seconds += time.perf_counter() - started
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, status_code, seconds, metrics):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = {
+                    'responses': {}, 'buckets': [0] * len(DURATION_BUCKETS), 'count': 0, 'seconds': 0.0,
+                    'db_queries': 0, 'db_seconds': 0.0, 'cache_hits': 0, 'cache_misses': 0,
+                    'serialize_seconds': 0.0,
+                }
+            stats['responses'][status_code] = stats['responses'].get(status_code, 0) + 1
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    stats['buckets'][index] += 1
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['db_queries'] += metrics.db_queries
+            stats['db_seconds'] += metrics.db_seconds
+            stats['cache_hits'] += metrics.cache_hits
+            stats['cache_misses'] += metrics.cache_misses
+            stats['serialize_seconds'] += metrics.serialize_seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {view: {**stats, 'responses': dict(stats['responses']), 'buckets': list(stats['buckets'])}
+                    for view, stats in self._views.items()}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _counter(lines, name, help_text, samples):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} counter')
+    for labels, value in samples:
+        label_text = ','.join(f'{key}="{_label(label)}"' for key, label in labels)
+        lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+
+def render_prometheus(connection_stats=None):
+    """Return the registry (and the connection totals) as Prometheus text."""
+    views = sorted(registry.snapshot().items())
+    lines = []
+    _counter(lines, 'blogify_http_responses_total', 'Responses by view and status code.', [
+        ((('view', view), ('status', code)), count)
+        for view, stats in views for code, count in sorted(stats['responses'].items())
+    ])
+
+    lines.append('# HELP blogify_http_request_duration_seconds Wall time spent handling requests.')
+    lines.append('# TYPE blogify_http_request_duration_seconds histogram')
+    for view, stats in views:
+        for bound, count in zip(DURATION_BUCKETS, stats['buckets']):
+            lines.append(f'blogify_http_request_duration_seconds_bucket{{view="{_label(view)}",le="{bound}"}} {count}')
+        lines.append(f'blogify_http_request_duration_seconds_bucket{{view="{_label(view)}",le="+Inf"}} {stats["count"]}')
+        lines.append(f'blogify_http_request_duration_seconds_sum{{view="{_label(view)}"}} {stats["seconds"]:.6f}')
+        lines.append(f'blogify_http_request_duration_seconds_count{{view="{_label(view)}"}} {stats["count"]}')
+
+    for name, key, help_text in (
+        ('blogify_db_queries_total', 'db_queries', 'Database queries run by requests.'),
+        ('blogify_db_query_seconds_total', 'db_seconds', 'Time requests spent in database queries.'),
+        ('blogify_cache_hits_total', 'cache_hits', 'Cache lookups that found an entry.'),
+        ('blogify_cache_misses_total', 'cache_misses', 'Cache lookups that found nothing.'),
+        ('blogify_serialize_seconds_total', 'serialize_seconds', 'Time spent rendering response bodies.'),
+    ):
+        _counter(lines, name, help_text, [
+            ((('view', view),), f'{stats[key]:.6f}' if isinstance(stats[key], float) else stats[key])
+            for view, stats in views
+        ])
+
+    if connection_stats is not None:
+        _counter(lines, 'blogify_db_connections_opened_total', 'Database connections opened by requests.',
+                 [((), connection_stats['new_connections'])])
+        _counter(lines, 'blogify_db_connection_requests_total', 'Requests seen by the connection reporting.',
+                 [((), connection_stats['requests'])])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,192 @@
+# backend/blogify/blogify/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from contextlib import AsyncExitStack, ExitStack, contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from .metrics import collect_request_metrics, registry, time_query
+import threading
+import time
+
+_connection_stats = {'requests': 0, 'new_connections': 0}
+_connection_stats_lock = threading.Lock()
+# alias -> 'opened' or 'reused' for the current request, see DBConnectionTimingMiddleware.
+_connection_setup = ContextVar('db_connection_setup', default=None)
+
+
+def connection_stats():
+    with _connection_stats_lock:
+        return dict(_connection_stats)
+
+
+def record_new_connection(sender, connection, **kwargs):
+    """connection_created receiver, connected in BlogifyConfig.ready()."""
+    setup = _connection_setup.get()
+    if setup is not None:
+        setup[connection.alias] = 'opened'
+
+
+def _record_alias_used(execute, sql, params, many, context):
+    setup = _connection_setup.get()
+    if setup is not None:
+        setup.setdefault(context['connection'].alias, 'reused')
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def wrap_queries(wrapper):
+    """Install ``wrapper`` on every database alias of the current thread."""
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(wrapper))
+        yield
+
+
+async def awrap_queries(stack, wrapper):
+    """wrap_queries() for async requests, unwound by the AsyncExitStack ``stack``.
+
+    Async views reach the ORM through sync_to_async, which runs them in the
+    request's thread-sensitive thread; its connections are the ones to wrap.
+    """
+    queries = wrap_queries(wrapper)
+    await sync_to_async(queries.__enter__)()
+    stack.push_async_callback(sync_to_async(queries.__exit__), None, None, None)
+
+
+@contextmanager
+def context_value(variable, value):
+    """Set a context variable for the duration of the block."""
+    token = variable.set(value)
+    try:
+        yield value
+    finally:
+        variable.reset(token)
+
+
+class RequestContextMiddleware:
+    """Base for middleware that works in both the WSGI and ASGI stacks.
+
+    Without async support Django would run the whole async chain, async blog
+    views included, through sync_to_async. Subclasses override
+    ``enter(stack, request)``, which sets up per-request state (usually
+    context variables entered on ``stack``, unwound once the view returns)
+    and returns it, or None to stay out of the request; and
+    ``finish(request, response, state)``, which returns the response. The
+    async path calls ``aenter``/``afinish``, which default to the sync ones;
+    there ``stack`` is an AsyncExitStack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.acall(request)
+        with ExitStack() as stack:
+            state = self.enter(stack, request)
+            response = self.get_response(request)
+        return response if state is None else self.finish(request, response, state)
+
+    async def acall(self, request):
+        async with AsyncExitStack() as stack:
+            state = await self.aenter(stack, request)
+            response = await self.get_response(request)
+        return response if state is None else await self.afinish(request, response, state)
+
+    def enter(self, stack, request):
+        return None
+
+    def finish(self, request, response, state):
+        return response
+
+    async def aenter(self, stack, request):
+        return self.enter(stack, request)
+
+    async def afinish(self, request, response, state):
+        return self.finish(request, response, state)
+
+
+class DBConnectionTimingMiddleware(RequestContextMiddleware):
+    """Report which database connections each request had to open.
+
+    For every alias the request queries, a ``Server-Timing`` entry
+    (``db-connect`` for default, ``db-connect-<alias>`` for the others) says
+    whether it reused a persistent connection or opened one (or checked one
+    out of the pool); the connection_created signal tells the two apart.
+    Requests that never touch the database are not made to connect. The
+    totals are added to connection_stats().
+    """
+
+    def enter(self, stack, request):
+        if not getattr(settings, 'DB_CONNECTION_TIMING', True):
+            return None
+        setup = stack.enter_context(context_value(_connection_setup, {}))
+        stack.enter_context(wrap_queries(_record_alias_used))
+        return setup
+
+    async def aenter(self, stack, request):
+        if not getattr(settings, 'DB_CONNECTION_TIMING', True):
+            return None
+        setup = stack.enter_context(context_value(_connection_setup, {}))
+        await awrap_queries(stack, _record_alias_used)
+        return setup
+
+    def finish(self, request, response, setup):
+        with _connection_stats_lock:
+            _connection_stats['requests'] += 1
+            _connection_stats['new_connections'] += sum(state == 'opened' for state in setup.values())
+
+        for alias, state in setup.items():
+            name = 'db-connect' if alias == 'default' else f'db-connect-{alias}'
+            _add_server_timing(response, f'{name};desc="{state}"')
+        return response
+
+
+def _add_server_timing(response, entry):
+    existing = response.get('Server-Timing')
+    response['Server-Timing'] = f'{existing}, {entry}' if existing else entry
+
+
+class PerformanceMiddleware(RequestContextMiddleware):
+    """Record wall time, queries, cache use and render time per view.
+
+    Totals go to blogify.metrics.registry (served at /metrics) and the
+    request's own numbers are added to its ``Server-Timing`` header.
+    """
+
+    def enter(self, stack, request):
+        if not getattr(settings, 'PERF_METRICS', True):
+            return None
+        metrics = stack.enter_context(collect_request_metrics())
+        stack.enter_context(wrap_queries(time_query))
+        return time.perf_counter(), metrics
+
+    async def aenter(self, stack, request):
+        if not getattr(settings, 'PERF_METRICS', True):
+            return None
+        metrics = stack.enter_context(collect_request_metrics())
+        await awrap_queries(stack, time_query)
+        return time.perf_counter(), metrics
+
+    def finish(self, request, response, state):
+        started, metrics = state
+        elapsed = time.perf_counter() - started
+
+        # Unresolved paths share one label so scanners cannot blow up the
+        # number of series.
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match is not None and match.view_name else 'unmatched'
+        registry.observe(view, response.status_code, elapsed, metrics)
+
+        _add_server_timing(response, ', '.join([
+            f'app;dur={elapsed * 1000:.2f}',
+            f'db;dur={metrics.db_seconds * 1000:.2f};desc="{metrics.db_queries} queries"',
+            f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+            f'serialize;dur={metrics.serialize_seconds * 1000:.2f}',
+        ]))
+        return response
@@ -0,0 +1,43 @@
+# backend/blogify/blogify/renderers.py
+from rest_framework.renderers import JSONRenderer
+from .metrics import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see ORJSONRenderer
+    orjson = None
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that reports its time to the request's performance metrics."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONRenderer(TimedJSONRenderer):
+    """TimedJSONRenderer that encodes with orjson when it is installed.
+
+    The output matches JSONRenderer's: compact UTF-8 with U+2028/U+2029
+    escaped, and datetimes, Decimals, lazy strings and the like go through
+    DRF's own encoder. Only float spelling can differ (``1e-6`` for
+    ``1e-06``). Indented output (the browsable API, ``; indent=N``),
+    non-default UNICODE_JSON/COMPACT_JSON settings and anything orjson
+    refuses, such as non-string keys, use JSONRenderer.
+    """
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (data is None or orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        with timed_serialization():
+            try:
+                ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+            except orjson.JSONEncodeError:
+                ret = None
+            if ret is not None:
+                return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return super().render(data, accepted_media_type, renderer_context)
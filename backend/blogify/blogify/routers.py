@@ -0,0 +1,137 @@
+# backend/blogify/blogify/routers.py
+"""Send blog reads to the ``replica`` database and everything else to ``default``.
+
+Only blog_module models are read from the replica. Users, tokens and
+EmailDelivery records are read right after they are written, often without
+a signed-in user to make the read sticky (activation after registering, the
+PIN email task), so they always come from the primary.
+
+Blog reads fall back to the primary when:
+
+* the current request, or the user making it, wrote recently: after a write
+  the user stays on the primary for REPLICA_STICKY_SECONDS so they read
+  their own changes despite replication lag;
+* the read happens inside a transaction on the primary;
+* the code runs under ``use_primary()``, usable as a context manager or a
+  decorator.
+
+The per-request state is kept in a context variable that
+ReplicaRoutingMiddleware sets up, so it works the same for sync and async
+views. Outside requests (Celery, management commands) blog reads use the
+replica unless ``use_primary()`` says otherwise.
+"""
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from .middleware import RequestContextMiddleware, context_value
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+REPLICA_APPS = {'blog_module'}
+STICKY_KEY = 'blogify:sticky_primary:{}'
+
+_routing_state = ContextVar('db_routing_state', default=None)
+_force_primary = ContextVar('db_force_primary', default=False)
+
+
+class use_primary(ContextDecorator):
+    """Route every read in the block (or decorated function) to the primary."""
+
+    def __enter__(self):
+        self._token = _force_primary.set(True)
+        return self
+
+    def __exit__(self, *exc):
+        _force_primary.reset(self._token)
+        return False
+
+    def _recreate_cm(self):
+        # A decorated function may run in several threads at once; each call
+        # needs its own token.
+        return type(self)()
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICA_APPS:
+            return None
+        if not replica_configured() or _force_primary.get():
+            return PRIMARY
+        state = _routing_state.get()
+        if state is not None and (state['sticky'] or state['wrote']):
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state['wrote'] = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        if {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema by replicating the primary.
+        if db == REPLICA:
+            return False
+        return None
+
+
+def _token_user_id(request):
+    header = request.headers.get('Authorization', '')
+    parts = header.split()
+    if len(parts) != 2 or parts[0] not in jwt_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        return AccessToken(parts[1]).get(jwt_settings.USER_ID_CLAIM)
+    except Exception:
+        return None
+
+
+class ReplicaRoutingMiddleware(RequestContextMiddleware):
+    """Tracks writes per request and keeps recent writers on the primary."""
+
+    def enter(self, stack, request):
+        if not replica_configured():
+            return None
+        user_id = _token_user_id(request)
+        return self._start(stack, user_id, bool(user_id and cache.get(STICKY_KEY.format(user_id))))
+
+    async def aenter(self, stack, request):
+        if not replica_configured():
+            return None
+        user_id = _token_user_id(request)
+        return self._start(stack, user_id, bool(user_id and await cache.aget(STICKY_KEY.format(user_id))))
+
+    def _start(self, stack, user_id, sticky):
+        # The user is only authenticated later, inside the view, so the
+        # sticky lookup uses the id claim of the (signature-checked) token.
+        state = stack.enter_context(context_value(_routing_state, {'sticky': sticky, 'wrote': False}))
+        return user_id, state
+
+    def finish(self, request, response, state):
+        user_id, state = state
+        if state['wrote'] and user_id:
+            cache.set(STICKY_KEY.format(user_id), True, timeout=getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+        return response
+
+    async def afinish(self, request, response, state):
+        user_id, state = state
+        if state['wrote'] and user_id:
+            await cache.aset(STICKY_KEY.format(user_id), True, timeout=getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+        return response
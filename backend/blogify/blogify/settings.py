@@ -4,6 +4,7 @@ import os
 from dotenv import load_dotenv
 from datetime import timedelta
 import dj_database_url
+from .db import configure_connections
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +42,11 @@ AUTH_USER_MODEL = 'user_module.CustomUser'
 
 ENABLE_CELERY = os.getenv('ENABLE_CELERY', 'False').lower() in ('true', '1', 'yes')
 
+# 'wsgi' (gunicorn sync workers) or 'asgi' (gunicorn + uvicorn workers), see
+# gunicorn.conf.py. Under ASGI the blog read endpoints use the async views.
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi').lower()
+BLOG_ASYNC_VIEWS = os.getenv('BLOG_ASYNC_VIEWS', str(SERVER_MODE == 'asgi')).lower() in ('true', '1', 'yes')
+
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
@@ -48,6 +54,16 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Blog detail views are buffered and flushed in bulk. Use
+# blog_module.view_counter.RedisViewCounter to share the buffer between
+# workers; Celery beat then flushes it with the flush_blog_views task.
+BLOG_VIEW_COUNTER_BACKEND = os.getenv('BLOG_VIEW_COUNTER_BACKEND', 'blog_module.view_counter.LocalViewCounter')
+BLOG_VIEW_COUNTER_REDIS_URL = os.getenv('BLOG_VIEW_COUNTER_REDIS_URL', CELERY_BROKER_URL)
+BLOG_VIEW_FLUSH_INTERVAL = int(os.getenv('BLOG_VIEW_FLUSH_INTERVAL', '10'))
+
+# Recipients per notify_users_of_new_blog subtask (one mail connection each).
+BLOG_NOTIFICATION_CHUNK_SIZE = int(os.getenv('BLOG_NOTIFICATION_CHUNK_SIZE', '500'))
+
 if ENABLE_CELERY:
     CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
@@ -60,6 +76,8 @@ EMAIL_USE_SSL = os.getenv('EMAIL_USE_SSL', 'False').lower() in ('true', '1', 'ye
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '10'))
+# Idle seconds after which the pooled SMTP session is NOOP-checked before reuse.
+EMAIL_CONNECTION_HEALTH_CHECK_INTERVAL = int(os.getenv('EMAIL_CONNECTION_HEALTH_CHECK_INTERVAL', '30'))
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'noreply@blogify.local')
 SERVER_EMAIL = DEFAULT_FROM_EMAIL
 
@@ -67,14 +85,47 @@ SERVER_EMAIL = DEFAULT_FROM_EMAIL
 EMAIL_DELIVERY_PROVIDER = os.getenv('EMAIL_DELIVERY_PROVIDER', 'smtp').lower()
 RESEND_API_KEY = os.getenv('RESEND_API_KEY', '')
 RESEND_FROM_EMAIL = os.getenv('RESEND_FROM_EMAIL', DEFAULT_FROM_EMAIL)
+RESEND_API_URL = os.getenv('RESEND_API_URL', 'https://api.resend.com')
+RESEND_BATCH_SIZE = int(os.getenv('RESEND_BATCH_SIZE', '100'))
 BREVO_API_KEY = os.getenv('BREVO_API_KEY', '')
 BREVO_FROM_EMAIL = os.getenv('BREVO_FROM_EMAIL', DEFAULT_FROM_EMAIL)
 BREVO_SENDER_NAME = os.getenv('BREVO_SENDER_NAME', 'Blogify')
+BREVO_API_URL = os.getenv('BREVO_API_URL', 'https://api.brevo.com/v3')
+BREVO_BATCH_SIZE = int(os.getenv('BREVO_BATCH_SIZE', '1000'))
+
+# Per-worker circuit breakers for the delivery providers: after this many
+# consecutive failures a provider is skipped for EMAIL_CIRCUIT_COOLDOWN seconds.
+EMAIL_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('EMAIL_CIRCUIT_FAILURE_THRESHOLD', '3'))
+EMAIL_CIRCUIT_COOLDOWN = int(os.getenv('EMAIL_CIRCUIT_COOLDOWN', '60'))
+
+# Activation and password-reset PIN emails: 'async' hands them to Celery (or a
+# small in-process thread pool when ENABLE_CELERY is off) after the request
+# commits; 'sync' sends them inline as before.
+EMAIL_DISPATCH_MODE = os.getenv('EMAIL_DISPATCH_MODE', 'async').lower()
+EMAIL_DISPATCH_THREADS = int(os.getenv('EMAIL_DISPATCH_THREADS', '4'))
+EMAIL_DISPATCH_MAX_RETRIES = int(os.getenv('EMAIL_DISPATCH_MAX_RETRIES', '3'))
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "user_module.serializers.ClaimsTokenObtainPairSerializer",
 }
+
+# Tokens carry signed username/email claims, so auth/token/verify/ needs no
+# query. Set JWT_VERIFY_CHECK_USER to also reject tokens of deactivated or
+# deleted users; that check reads a per-user cache entry kept for
+# JWT_VERIFY_USER_CACHE_TTL seconds and dropped whenever the user is saved.
+JWT_VERIFY_CHECK_USER = os.getenv('JWT_VERIFY_CHECK_USER', 'False').lower() in ('true', '1', 'yes')
+JWT_VERIFY_USER_CACHE_TTL = int(os.getenv('JWT_VERIFY_USER_CACHE_TTL', '30'))
+
+# Authenticated requests resolve their user from a per-process LRU of
+# USER_AUTH_CACHE_SIZE users, invalidated through a per-user version stamp
+# on save and expired after USER_AUTH_CACHE_TTL seconds (0 disables it).
+# USER_AUTH_SHARED_CACHE also stores them in the default cache (id, email,
+# username, is_active and a password stamp; never the password hash or PIN).
+USER_AUTH_CACHE_SIZE = int(os.getenv('USER_AUTH_CACHE_SIZE', '1024'))
+USER_AUTH_CACHE_TTL = int(os.getenv('USER_AUTH_CACHE_TTL', '60'))
+USER_AUTH_SHARED_CACHE = os.getenv('USER_AUTH_SHARED_CACHE', 'False').lower() in ('true', '1', 'yes')
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -87,6 +138,8 @@ INSTALLED_APPS = [
     'user_module',
     'corsheaders',
     'blog_module',
+    # Project-level hooks (database connection timing), see blogify.apps.
+    'blogify',
 ]
 
 if ENABLE_CELERY:
@@ -97,6 +150,9 @@ if ENABLE_CELERY:
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  
+    'blogify.middleware.PerformanceMiddleware',
+    'blogify.middleware.DBConnectionTimingMiddleware',
+    'blogify.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',  
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -107,12 +163,16 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_module.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
 
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'blogify.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 ROOT_URLCONF = 'blogify.urls'
@@ -174,6 +234,50 @@ else:
                 'PORT': os.getenv('DB_PORT', '5432'),
             }
         }
+
+# Persistent connections, health checks, psycopg pool and PgBouncer mode for
+# whichever database was picked above; see blogify/db.py for the variables.
+DATABASES['default'] = configure_connections(DATABASES['default'])
+
+# Optional read replica, e.g. DATABASE_REPLICA_URL=postgresql://...@replica/blogify
+# or, to try it locally, sqlite:///replica.sqlite3 (a copy of db.sqlite3).
+# Blog reads go there; writes, and reads by a user within
+# REPLICA_STICKY_SECONDS of their last write, stay on default.
+replica_url = os.getenv('DATABASE_REPLICA_URL')
+if replica_url:
+    DATABASES['replica'] = configure_connections(dj_database_url.parse(replica_url))
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['blogify.routers.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '5'))
+DB_CONNECTION_TIMING = os.getenv('DB_CONNECTION_TIMING', 'True').lower() in ('true', '1', 'yes')
+# Per-view timings, query/cache counts and render time, served at /metrics
+# and in the Server-Timing header. /metrics requires
+# `Authorization: Bearer <METRICS_TOKEN>`; without a token it only answers
+# when DEBUG is on.
+PERF_METRICS = os.getenv('PERF_METRICS', 'True').lower() in ('true', '1', 'yes')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# Local memory by default; point CACHE_URL at Redis to share cached pages
+# between workers, e.g. CACHE_URL=redis://redis:6379/1
+cache_url = os.getenv('CACHE_URL')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': cache_url,
+    } if cache_url else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+BLOG_LIST_CACHE_TIMEOUT = int(os.getenv('BLOG_LIST_CACHE_TIMEOUT', '300'))
+# How long an issued blog ETag is remembered for 304s without a query.
+BLOG_ETAG_CACHE_TIMEOUT = int(os.getenv('BLOG_ETAG_CACHE_TIMEOUT', '300'))
+# Feed endpoints build their cards from values() rows instead of
+# BlogListSerializer (same output, a fraction of the cost).
+BLOG_FAST_SERIALIZATION = os.getenv('BLOG_FAST_SERIALIZATION', 'True').lower() in ('true', '1', 'yes')
+
+# Text search configuration for the PostgreSQL blog search index. Changing it
+# needs `manage.py rebuild_search_index` to re-stem existing blogs.
+BLOG_SEARCH_CONFIG = os.getenv('BLOG_SEARCH_CONFIG', 'english')
+
 # read doc
 # swagger 
 # helping 
@@ -185,6 +289,18 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.ScryptPasswordHasher",  
 ]
 
+# Hash and verify passwords in a process pool of this size per gunicorn worker
+# ('auto' = the host's cores split between the WEB_CONCURRENCY workers, 0 =
+# inline on the request thread). Once PASSWORD_HASH_QUEUE_DEPTH hashes are
+# waiting, logins and registrations are answered with a 503.
+# Only useful with threaded (gthread) gunicorn workers, see user_module.hashing.
+_hash_workers = os.getenv('PASSWORD_HASH_WORKERS', '0').lower()
+if _hash_workers == 'auto':
+    PASSWORD_HASH_WORKERS = max(1, (os.cpu_count() or 1) // int(os.getenv('WEB_CONCURRENCY', '3')))
+else:
+    PASSWORD_HASH_WORKERS = int(_hash_workers)
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH') or PASSWORD_HASH_WORKERS * 4)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
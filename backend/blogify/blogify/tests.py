@@ -0,0 +1,342 @@
+# backend/blogify/blogify/tests.py
+import datetime
+import os
+import random
+import tempfile
+import uuid
+from decimal import Decimal
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections, router
+from django.test.utils import override_settings
+from django.urls import URLPattern, path
+from django.utils.translation import gettext_lazy
+from django.test import TestCase, TransactionTestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnList
+from rest_framework_simplejwt.tokens import AccessToken
+from unittest.mock import patch
+from benchmarks.api import Fixture, build_cases, find_regressions, run_cases
+from blog_module import urls as blog_urls
+from blog_module.async_views import AsyncBlogListView
+from blog_module.models import Blog
+from user_module import urls as user_urls
+from user_module.models import EmailDelivery
+from .db import configure_connections
+from .metrics import registry
+from .middleware import (DBConnectionTimingMiddleware, PerformanceMiddleware, RequestContextMiddleware,
+                         _connection_setup, connection_stats)
+from .renderers import ORJSONRenderer
+from .routers import REPLICA, STICKY_KEY, PrimaryReplicaRouter, ReplicaRoutingMiddleware, use_primary
+
+User = get_user_model()
+
+# Routes the async blog views for the ASGI tests below.
+urlpatterns = [
+    path('async/blogs/', AsyncBlogListView.as_view(), name='blog_list'),
+]
+
+POSTGRES = {'ENGINE': 'django.db.backends.postgresql', 'NAME': 'blogify'}
+
+
+class ConfigureConnectionsTests(TestCase):
+
+    def configure(self, database, **env):
+        with patch.dict(os.environ, env):
+            return configure_connections(database)
+
+    def test_persistent_connections_for_database_servers(self):
+        configured = self.configure(POSTGRES)
+        self.assertEqual(configured['CONN_MAX_AGE'], 600)
+        self.assertTrue(configured['CONN_HEALTH_CHECKS'])
+
+        configured = self.configure({'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'db.sqlite3'})
+        self.assertEqual(configured['CONN_MAX_AGE'], 0)
+        self.assertFalse(configured['CONN_HEALTH_CHECKS'])
+
+    def test_env_overrides_max_age_and_health_checks(self):
+        configured = self.configure(POSTGRES, DB_CONN_MAX_AGE='0', DB_CONN_HEALTH_CHECKS='false')
+        self.assertEqual(configured['CONN_MAX_AGE'], 0)
+        self.assertFalse(configured['CONN_HEALTH_CHECKS'])
+
+    def test_pool_replaces_persistent_connections(self):
+        configured = self.configure(POSTGRES, DB_POOL='true', DB_POOL_MAX_SIZE='20')
+        self.assertEqual(configured['OPTIONS']['pool']['max_size'], 20)
+        self.assertEqual(configured['CONN_MAX_AGE'], 0)
+
+    def test_pool_is_ignored_for_sqlite(self):
+        configured = self.configure({'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'db.sqlite3'}, DB_POOL='true')
+        self.assertNotIn('OPTIONS', configured)
+
+    def test_pgbouncer_mode_disables_cursors_and_prepared_statements(self):
+        configured = self.configure(POSTGRES, DB_PGBOUNCER='true')
+        self.assertTrue(configured['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertIsNone(configured['OPTIONS']['prepare_threshold'])
+
+
+class DBConnectionTimingMiddlewareTests(TestCase):
+
+    def test_connection_setup_is_reported(self):
+        before = connection_stats()
+
+        response = self.client.get('/api/blogs/')
+
+        self.assertRegex(response['Server-Timing'], r'(^|, )db-connect;desc="(reused|opened)"(, |$)')
+        self.assertEqual(connection_stats()['requests'], before['requests'] + 1)
+        # The query wrappers only last as long as the request.
+        self.assertEqual(connections['default'].execute_wrappers, [])
+
+    def test_requests_without_queries_do_not_connect(self):
+        before = connection_stats()
+
+        with patch.object(type(connections['default']), 'ensure_connection') as ensure_connection:
+            response = self.client.get('/metrics')
+
+        ensure_connection.assert_not_called()
+        self.assertNotIn('db-connect', response['Server-Timing'])
+        self.assertEqual(connection_stats()['requests'], before['requests'] + 1)
+        self.assertEqual(connection_stats()['new_connections'], before['new_connections'])
+
+    def test_opening_a_connection_is_reported_per_alias(self):
+        setup = {}
+        token = _connection_setup.set(setup)
+        fresh = connections.create_connection('default')
+        try:
+            fresh.ensure_connection()
+        finally:
+            _connection_setup.reset(token)
+            fresh.connection.close()
+
+        self.assertEqual(setup, {'default': 'opened'})
+
+
+class PerformanceMiddlewareTests(TestCase):
+
+    def setUp(self):
+        registry.reset()
+        cache.clear()
+        author = User.objects.create_user(username='metrics', email='metrics@gmail.com', password='metrics@gmail.com')
+        Blog.objects.create(author=author, title='Measured', content='Body', status=Blog.PUBLISHED)
+
+    def test_server_timing_reports_the_request(self):
+        response = self.client.get('/api/blogs/')
+
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'app;dur=\d+\.\d\d')
+        self.assertRegex(timing, r'db;dur=\d+\.\d\d;desc="[1-9]\d* queries"')
+        # The remembered ETag and the page cache.
+        self.assertIn('cache;desc="0 hits, 2 misses"', timing)
+        self.assertRegex(timing, r'serialize;dur=\d+\.\d\d')
+
+    def test_metrics_are_aggregated_per_view(self):
+        self.client.get('/api/blogs/')
+        self.client.get('/api/blogs/')
+        self.client.get('/no-such-page/')
+
+        with override_settings(DEBUG=True):
+            response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('blogify_http_responses_total{view="blog_list",status="200"} 2', body)
+        self.assertIn('blogify_http_request_duration_seconds_count{view="blog_list"} 2', body)
+        self.assertIn('blogify_cache_hits_total{view="blog_list"} 2', body)
+        self.assertIn('blogify_cache_misses_total{view="blog_list"} 2', body)
+        self.assertRegex(body, r'blogify_db_queries_total\{view="blog_list"\} [1-9]')
+        self.assertIn('blogify_http_responses_total{view="unmatched",status="404"} 1', body)
+
+    def test_middleware_runs_natively_under_asgi(self):
+        async def get_response(request):
+            return None
+
+        for middleware_class in (PerformanceMiddleware, DBConnectionTimingMiddleware, ReplicaRoutingMiddleware):
+            self.assertTrue(iscoroutinefunction(middleware_class(get_response)), middleware_class)
+
+    def test_base_middleware_passes_requests_through(self):
+        response = object()
+        self.assertIs(RequestContextMiddleware(lambda request: response)(None), response)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    async def test_async_views_are_measured_through_the_asgi_handler(self):
+        response = await self.async_client.get('/async/blogs/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'db;dur=\d+\.\d\d;desc="[1-9]\d* queries"')
+        self.assertRegex(response['Server-Timing'], r'(^|, )db-connect;desc=')
+        stats = registry.snapshot()['blog_list']
+        self.assertGreater(stats['db_queries'], 0)
+        self.assertGreater(stats['serialize_seconds'], 0)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_without_token_need_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+class ORJSONRendererTests(TestCase):
+
+    def test_output_matches_json_renderer(self):
+        payload = {
+            'success': True,
+            'data': ReturnList([{'id': 1, 'title': 'Ünïcode \u2028 and \u2029', 'rank': 1.5, 'tags': ('a', 'b')}],
+                               serializer=None),
+            'at': datetime.datetime(2026, 10, 18, 12, 30, 1, 250, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2026, 10, 18),
+            'price': Decimal('9.90'),
+            'uuid': uuid.UUID(int=7),
+            'lazy': gettext_lazy('Not found.'),
+            'missing': None,
+        }
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_falls_back_to_json_renderer(self):
+        for payload, media_type in (({1: 'integer key'}, None), ({'big': 2 ** 70}, None),
+                                    ({'title': 'Indented'}, 'application/json; indent=4')):
+            self.assertEqual(ORJSONRenderer().render(payload, media_type), JSONRenderer().render(payload, media_type))
+
+
+class PrimaryReplicaRouterTests(TransactionTestCase):
+    """Runs against a second SQLite file standing in for the replica."""
+
+    @classmethod
+    def setUpClass(cls):
+        # The alias only exists while this class runs, so it is added to
+        # ``databases`` here rather than where the test runner would see it.
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.settings[REPLICA] = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.dummy'},
+            REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(cls.directory.name, 'replica.sqlite3')},
+        })[REPLICA]
+        cls.settings_patcher = patch.dict(settings.DATABASES, {REPLICA: connections.settings[REPLICA]})
+        cls.settings_patcher.start()
+        # A real replica gets its tables by replicating the primary; this one
+        # is migrated, and flushed between tests, directly.
+        cls.router_patcher = patch.object(PrimaryReplicaRouter, 'allow_migrate', return_value=None)
+        cls.router_patcher.start()
+        call_command('migrate', database=REPLICA, verbosity=0)
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.router_patcher.stop()
+        cls.settings_patcher.stop()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', email='writer@gmail.com',
+                                               password='WriterPassword123', is_active=True)
+        User.objects.using(REPLICA).create(id=self.author.id, username='writer', email='writer@gmail.com',
+                                           password='!', is_active=True)
+        Blog.objects.using(REPLICA).create(title='Replica blog', content='Only on the replica',
+                                           status=Blog.PUBLISHED, author_id=self.author.id)
+        self.client = APIClient()
+
+    def titles(self, response):
+        return [blog['title'] for blog in response.data['data']]
+
+    def test_reads_go_to_the_replica_and_writes_to_the_primary(self):
+        self.assertEqual(self.titles(self.client.get('/api/blogs/', {'pagination': 'cursor'})), ['Replica blog'])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.author)}')
+        response = self.client.post('/api/blogs/create/', {
+            'title': 'Primary blog', 'content': 'Written to the primary', 'status': Blog.PUBLISHED}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Blog.objects.using('default').filter(title='Primary blog').exists())
+        self.assertFalse(Blog.objects.using(REPLICA).filter(title='Primary blog').exists())
+
+    def test_cached_anonymous_pages_are_built_from_the_primary(self):
+        response = self.client.get('/api/blogs/')
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.titles(response), [])
+
+    def test_writer_sticks_to_the_primary(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.author)}')
+        self.client.post('/api/blogs/create/', {
+            'title': 'Primary blog', 'content': 'Written to the primary', 'status': Blog.PUBLISHED}, format='json')
+
+        self.assertEqual(self.titles(self.client.get('/api/blogs/user/')), ['Primary blog'])
+
+        cache.delete(STICKY_KEY.format(self.author.id))
+        self.assertEqual(self.titles(self.client.get('/api/blogs/user/')), ['Replica blog'])
+
+    def test_user_module_reads_stay_on_the_primary(self):
+        User.objects.using(REPLICA).create(username='replica-only', email='replica-only@gmail.com', password='!')
+        delivery = EmailDelivery.objects.create(user=self.author, email=self.author.email,
+                                                purpose=EmailDelivery.ACTIVATION)
+
+        self.assertEqual(router.db_for_read(User), 'default')
+        self.assertEqual(router.db_for_read(EmailDelivery), 'default')
+        self.assertEqual(router.db_for_read(Blog), REPLICA)
+        self.assertFalse(User.objects.filter(username='replica-only').exists())
+        self.assertTrue(EmailDelivery.objects.filter(id=delivery.id).exists())
+
+    def test_migrations_skip_the_replica(self):
+        self.assertFalse(PrimaryReplicaRouter().allow_migrate(REPLICA, 'blog_module', model_name='blog'))
+        self.assertIsNone(PrimaryReplicaRouter().allow_migrate('default', 'blog_module', model_name='blog'))
+
+    def test_use_primary_forces_reads_to_default(self):
+        self.assertEqual(Blog.objects.count(), 1)
+        with use_primary():
+            self.assertEqual(Blog.objects.count(), 0)
+
+
+@override_settings(PASSWORD_HASH_WORKERS=0)
+class ApiBenchmarkTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixture = Fixture(users=3, blogs=10, comments=9, reply_depth=2, rng=random.Random(1))
+
+    def test_every_route_has_a_case(self):
+        routes = {pattern.name for module in (blog_urls, user_urls)
+                  for pattern in module.urlpatterns if isinstance(pattern, URLPattern)}
+        covered = {url_name for url_name, _ in build_cases(self.fixture).values()}
+
+        self.assertEqual(routes - covered, set())
+
+    def test_cases_succeed_and_report_query_counts(self):
+        cases = build_cases(self.fixture)
+        results = run_cases(cases, iterations=2, warmup=0,
+                            only={'blog_detail', 'blog_delete', 'comment_reply', 'activate', 'token_verify'})
+
+        self.assertEqual(set(results), {'blog_detail', 'blog_delete', 'comment_reply', 'activate', 'token_verify'})
+        for name, result in results.items():
+            self.assertTrue(all(200 <= code < 300 for code in result['status']), (name, result))
+        self.assertGreater(results['blog_detail']['queries'], 0)
+
+    def test_regressions_against_the_baseline(self):
+        baseline = {'cases': {
+            'blog_list': {'queries': 2, 'p95_ms': 10.0},
+            'login': {'queries': 1, 'p95_ms': 100.0},
+        }}
+        results = {
+            'blog_list': {'queries': 3, 'p95_ms': 10.0},
+            'login': {'queries': 1, 'p95_ms': 140.0},
+        }
+
+        regressions = find_regressions(results, baseline, p95_tolerance=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertIn('blog_list: 3 queries', regressions[0])
+        self.assertIn('login: p95', regressions[1])
+        self.assertEqual(find_regressions(results, baseline, p95_tolerance=0.5), regressions[:1])
@@ -1,14 +1,30 @@
 # backend/blogify/blogify/urls.py
 from django.contrib import admin
+from django.conf import settings
 from django.urls import path,include
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from .metrics import render_prometheus
+from .middleware import connection_stats
 
 
 def health_check(_request):
     return JsonResponse({'status': 'ok'})
 
+
+def metrics(request):
+    # Open only in development; anywhere else scrapers need METRICS_TOKEN.
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(render_prometheus(connection_stats()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 urlpatterns = [
     path('', health_check),
+    path('metrics', metrics, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/',include('user_module.urls')),
     path('api/',include('blog_module.urls')),
@@ -0,0 +1,27 @@
+# backend/blogify/gunicorn.conf.py
+"""Gunicorn deployment profiles, picked with SERVER_MODE.
+
+    SERVER_MODE=wsgi gunicorn -c gunicorn.conf.py   # threaded workers (default)
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py   # uvicorn workers + async blog views
+
+The wsgi profile runs GUNICORN_THREADS threads per worker (gthread), so a
+worker keeps serving reads while some of its threads wait on a password
+hash in the PASSWORD_HASH_WORKERS pool (see user_module.hashing). Under ASGI
+each worker serves many concurrent connections from one event loop, so
+fewer workers are needed than with the wsgi profile.
+"""
+import os
+
+server_mode = os.getenv('SERVER_MODE', 'wsgi').lower()
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', '3'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+
+if server_mode == 'asgi':
+    wsgi_app = 'blogify.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'blogify.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
@@ -0,0 +1,149 @@
+# backend/blogify/user_module/authentication.py
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from blogify.metrics import record_cache
+import threading
+import time
+
+USER_VERSION_KEY = 'user_module:auth_version:{}'
+SHARED_USER_KEY = 'user_module:auth_user:{}:v{}'
+# What a request needs from its user; anything else is loaded on first access.
+CACHED_USER_FIELDS = ('id', 'email', 'username', 'is_active')
+
+
+def user_version(user_id):
+    key = USER_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Clock seed, as for the blog content version: an evicted stamp can
+        # never come back as a value an old entry was stored under.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_user_version(user_id):
+    try:
+        cache.incr(USER_VERSION_KEY.format(user_id))
+    except ValueError:
+        cache.add(USER_VERSION_KEY.format(user_id), time.time_ns(), timeout=None)
+
+
+def user_state(user):
+    """The cacheable part of ``user``: CACHED_USER_FIELDS and a password stamp.
+
+    The stamp is the hash simplejwt puts in revocable tokens, so neither the
+    password hash nor the PIN ever reaches the cache.
+    """
+    state = {name: getattr(user, name) for name in CACHED_USER_FIELDS}
+    state['password_stamp'] = get_md5_hash_password(user.password)
+    return state
+
+
+def user_from_state(state):
+    # The other fields are deferred: reading one queries the row, and a save
+    # only writes the fields that were loaded.
+    User = get_user_model()
+    return User.from_db(router.db_for_read(User), CACHED_USER_FIELDS, [state[name] for name in CACHED_USER_FIELDS])
+
+
+class UserLRUCache:
+    """Bounded per-process map of user id -> (version stamp, expiry, user state)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            entry_version, expires, state = entry
+            if entry_version != version or expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return state
+
+    def set(self, user_id, version, state, ttl):
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + ttl, state)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserLRUCache(getattr(settings, 'USER_AUTH_CACHE_SIZE', 1024))
+
+
+def invalidate_cached_user(user_id):
+    bump_user_version(user_id)
+    user_cache.discard(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user from a cache instead of a query.
+
+    Entries are keyed by the user's version stamp, which every save or delete
+    of the user bumps, and also expire after USER_AUTH_CACHE_TTL seconds. The
+    stamp lives in the default cache: with a shared backend (CACHE_URL) a
+    save in one worker invalidates every worker at once, with local memory
+    other workers catch up within the TTL. USER_AUTH_SHARED_CACHE also keeps
+    the entries in the shared cache so a fresh worker starts warm.
+
+    Only user_state() is cached, never the model instance: each request gets
+    a user built from it, with the remaining fields deferred.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        ttl = getattr(settings, 'USER_AUTH_CACHE_TTL', 60)
+        if user_id is None or ttl <= 0:
+            return super().get_user(validated_token)
+
+        version = user_version(user_id)
+        state = user_cache.get(user_id, version)
+        if state is None and getattr(settings, 'USER_AUTH_SHARED_CACHE', False):
+            state = cache.get(SHARED_USER_KEY.format(user_id, version))
+            if state is not None:
+                user_cache.set(user_id, version, state, ttl)
+        record_cache(state is not None)
+
+        if state is None:
+            user = super().get_user(validated_token)
+            state = user_state(user)
+            user_cache.set(user_id, version, state, ttl)
+            if getattr(settings, 'USER_AUTH_SHARED_CACHE', False):
+                cache.set(SHARED_USER_KEY.format(user_id, version), state, timeout=ttl)
+            return user
+
+        self.check_user(state, validated_token)
+        return user_from_state(state)
+
+    def check_user(self, state, validated_token):
+        # The token-dependent checks JWTAuthentication.get_user runs after
+        # its query.
+        if api_settings.CHECK_USER_IS_ACTIVE and not state['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != state['password_stamp']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
@@ -0,0 +1,167 @@
+# backend/blogify/user_module/hashing.py
+"""Run password hashing in a bounded process pool instead of on the request thread.
+
+Argon2 is deliberately slow. When PASSWORD_HASH_WORKERS is set the work
+is handed to a process pool of that size. At most PASSWORD_HASH_QUEUE_DEPTH
+further hashes may wait for a free process; past that, callers get
+PasswordHashingBusy straight away so a login storm turns into quick 503s
+instead of piling up in front of the blog read endpoints.
+
+The pool only helps when a gunicorn worker serves several requests at once,
+i.e. under the gthread workers of the wsgi profile in gunicorn.conf.py:
+while one thread waits on a hash the others keep serving reads, and the
+queue depth bounds how many threads a login storm can tie up. A plain sync
+worker handles one request at a time and still blocks on the hash, so the
+queue never fills and nothing is gained. Under the asgi profile the sync
+auth views run one at a time per worker, which gains nothing either.
+
+Every gunicorn worker starts its own pool, so PASSWORD_HASH_WORKERS=auto
+gives each one its share of the host's cores (cores / WEB_CONCURRENCY).
+The pool processes are started with forkserver (spawn where that is not
+available), never by forking the multi-threaded gunicorn worker itself.
+
+With PASSWORD_HASH_WORKERS=0 (the default) everything runs inline, exactly
+as Django would.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy. Please try again in a moment.'
+    default_code = 'password_hashing_busy'
+    retry_after = 1
+
+
+def _mp_context():
+    # A fork would copy locks that other request threads hold at that moment.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _init_worker(settings_module):
+    # Pool processes start from a fresh interpreter and need Django set up.
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _check_password(password, encoded):
+    return hashers.check_password(password, encoded)
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+class HashingPool:
+    def __init__(self, workers, queue_depth):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            # The pid check gives each forked gunicorn worker its own pool.
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=_mp_context(),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'blogify.settings'),),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        try:
+            executor = self._get_executor()
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start over with a fresh pool.
+                logger.warning('Password hashing pool broke, restarting it.')
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """Return the configured HashingPool, or None when hashing runs inline."""
+    global _pool
+    workers = getattr(settings, 'PASSWORD_HASH_WORKERS', 0)
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(workers, getattr(settings, 'PASSWORD_HASH_QUEUE_DEPTH', workers * 4))
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def make_password(password):
+    pool = get_hashing_pool()
+    if pool is None or password is None:
+        return hashers.make_password(password)
+    return pool.run(_make_password, password)
+
+
+def check_password(user, password):
+    """Pool-backed equivalent of ``user.check_password(password)``.
+
+    Like the model method, a valid password stored with an outdated hasher
+    or work factor is rehashed and saved.
+    """
+    pool = get_hashing_pool()
+    if pool is None:
+        return user.check_password(password)
+
+    encoded = user.password
+    if not encoded or not hashers.is_password_usable(encoded):
+        # Still pay for one hash so accounts without a usable password take
+        # as long as real ones, as Django's own check does.
+        pool.run(_make_password, password)
+        return False
+    if not pool.run(_check_password, password, encoded):
+        return False
+
+    preferred = hashers.get_hasher('default')
+    try:
+        hasher = hashers.identify_hasher(encoded)
+        must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    except ValueError:
+        must_update = False
+    if must_update:
+        user.password = make_password(password)
+        user.save(update_fields=['password'])
+    return True
@@ -2,6 +2,7 @@
 from django.contrib.auth.models import BaseUserManager
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
+from .hashing import make_password
 
 class CustomUserManager(BaseUserManager):
 
@@ -13,7 +14,8 @@ class CustomUserManager(BaseUserManager):
         validate_email(email)
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        # Hash through the pool (when configured) instead of set_password().
+        user.password = make_password(password)
         user.save(using=self._db)
 
         # print(f"User created with email: {email}") 
@@ -3,6 +3,7 @@ from django.db import models
 from .managers import CustomUserManager
 from django.contrib.auth.models import AbstractBaseUser,PermissionsMixin
 from django.contrib.auth import get_user_model
+import uuid
 
 # Create your models here.
 
@@ -20,3 +21,31 @@ class CustomUser(AbstractBaseUser,PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class EmailDelivery(models.Model):
+    """Tracks an activation or password-reset PIN email sent off the request path."""
+    ACTIVATION = 'activation'
+    PASSWORD_RESET = 'password_reset'
+    PURPOSES = [(ACTIVATION, 'Activation'),
+                (PASSWORD_RESET, 'Password reset')]
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = [(PENDING, 'Pending'),
+                (SENT, 'Sent'),
+                (FAILED, 'Failed')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # SET_NULL keeps the record when a failed activation removes the user.
+    user = models.ForeignKey(CustomUser, null=True, on_delete=models.SET_NULL, related_name='email_deliveries')
+    email = models.EmailField()
+    purpose = models.CharField(max_length=20, choices=PURPOSES)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.purpose} email to {self.email}: {self.status}'
@@ -2,7 +2,9 @@
 from rest_framework import serializers
 # from .models import CustomUser
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .utils import account_activate
+from .tokens import tokens_for_user
 
 User = get_user_model()
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -53,4 +55,12 @@ class ActivationSerializer(serializers.Serializer):
         user, message = account_activate(data['email'],data['pin'])
         if user is None:
             raise serializers.ValidationError(message)
-        return user
\ No newline at end of file
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """auth/token/ issues the same username/email claims as the login view."""
+
+    @classmethod
+    def get_token(cls, user):
+        return tokens_for_user(user)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import invalidate_cached_user
+from .models import CustomUser
+from .tokens import forget_user_state
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user_state(sender, instance, **kwargs):
+    forget_user_state(instance.id)
+    invalidate_cached_user(instance.id)
@@ -0,0 +1,16 @@
+# backend/blogify/user_module/tasks.py
+from celery import shared_task
+from django.conf import settings
+from .utils import deliver_pin_email, fail_pin_delivery, pin_retry_countdown
+
+@shared_task(bind=True)
+def send_pin_email(self, delivery_id):
+    if deliver_pin_email(delivery_id):
+        return f"PIN email {delivery_id} sent"
+
+    max_retries = getattr(settings, 'EMAIL_DISPATCH_MAX_RETRIES', 3)
+    if self.request.retries < max_retries:
+        raise self.retry(countdown=pin_retry_countdown(self.request.retries), max_retries=max_retries)
+
+    fail_pin_delivery(delivery_id)
+    return f"PIN email {delivery_id} failed"
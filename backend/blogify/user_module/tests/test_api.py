@@ -1,11 +1,14 @@
 # backend/blogify/user_module/tests/test_api.py
 import json
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from unittest.mock import patch
 from rest_framework import status
+from ..models import EmailDelivery
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
 
 User = get_user_model()
 
@@ -35,8 +38,9 @@ class UserAPITests(TestCase):
         self.test_user.is_active = True
         self.test_user.save()
 
-    @patch('user_module.views.send_pin_number')
+    @patch('user_module.views.dispatch_pin_email')
     def test_user_registration(self, mock_send_pin):
+        mock_send_pin.return_value = EmailDelivery(purpose=EmailDelivery.ACTIVATION)
         
         response = self.client.post(self.register_url, self.user_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -143,8 +147,9 @@ class UserAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertFalse(response.data['success'])
 
-    @patch('user_module.views.send_pin_number')
+    @patch('user_module.views.dispatch_pin_email')
     def test_password_reset_request(self, mock_send_pin):
+        mock_send_pin.return_value = EmailDelivery(purpose=EmailDelivery.PASSWORD_RESET)
         reset_data = {
             'email': 'existing@gmail.com'
         }
@@ -282,4 +287,151 @@ class TokenEndpointsTests(TestCase):
         self.assertEqual(verify_response.status_code, status.HTTP_200_OK)
         self.assertEqual(verify_response.data['message'], 'Token is valid')
         self.assertEqual(verify_response.data['username'], 'jwtuser')
-        self.assertEqual(verify_response.data['email'], 'jwt@gmail.com')
\ No newline at end of file
+        self.assertEqual(verify_response.data['email'], 'jwt@gmail.com')
+
+class PinEmailDispatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user_data = {
+            'username': 'pinuser',
+            'email': 'pinuser@gmail.com',
+            'password': 'TestPassword123',
+            'password2': 'TestPassword123'
+        }
+
+    @patch('user_module.utils._enqueue_pin_delivery')
+    @patch('user_module.utils.send_plain_email')
+    def test_registration_returns_before_email_is_sent(self, mock_send, mock_enqueue):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(reverse('register'), self.user_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['delivery_status'], EmailDelivery.PENDING)
+        self.assertFalse(mock_send.called)
+        self.assertEqual(len(callbacks), 1)
+        mock_enqueue.assert_called_once()
+
+        delivery = EmailDelivery.objects.get(id=response.data['delivery_id'])
+        self.assertEqual(delivery.purpose, EmailDelivery.ACTIVATION)
+        self.assertEqual(delivery.user.email, self.user_data['email'])
+
+    @override_settings(ENABLE_CELERY=True)
+    @patch('user_module.tasks.send_pin_email.delay')
+    def test_pending_delivery_is_queued_as_celery_task(self, mock_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('register'), self.user_data, format='json')
+
+        mock_delay.assert_called_once_with(response.data['delivery_id'])
+
+    @patch('user_module.utils.send_plain_email', return_value=True)
+    def test_delivery_status_endpoint_reports_sent(self, mock_send):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(reverse('register'), self.user_data, format='json')
+        delivery_id = response.data['delivery_id']
+
+        from ..utils import deliver_pin_email
+        self.assertTrue(deliver_pin_email(delivery_id))
+
+        user = User.objects.get(email=self.user_data['email'])
+        self.assertIn(user.activation_pin, mock_send.call_args[0][1])
+        status_response = self.client.get(reverse('email_delivery_status', args=[delivery_id]))
+        self.assertEqual(status_response.data['status'], EmailDelivery.SENT)
+        self.assertEqual(status_response.data['attempts'], 1)
+
+    @patch('user_module.utils.send_plain_email', return_value=False)
+    def test_failed_activation_delivery_removes_inactive_user(self, mock_send):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(reverse('register'), self.user_data, format='json')
+
+        from ..tasks import send_pin_email
+        with override_settings(EMAIL_DISPATCH_MAX_RETRIES=0):
+            send_pin_email.apply(args=[response.data['delivery_id']])
+
+        delivery = EmailDelivery.objects.get(id=response.data['delivery_id'])
+        self.assertEqual(delivery.status, EmailDelivery.FAILED)
+        self.assertIsNone(delivery.user)
+        self.assertFalse(User.objects.filter(email=self.user_data['email']).exists())
+
+    @patch('user_module.utils.db_connection')
+    @patch('user_module.utils.threading.Timer')
+    @patch('user_module.utils.send_plain_email', return_value=False)
+    def test_in_process_delivery_retries_before_removing_the_user(self, mock_send, mock_timer, mock_db_connection):
+        from ..utils import _deliver_in_thread, _submit_pin_delivery
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(reverse('register'), self.user_data, format='json')
+        delivery_id = response.data['delivery_id']
+
+        with override_settings(EMAIL_DISPATCH_MAX_RETRIES=1):
+            _deliver_in_thread(delivery_id)
+            mock_timer.assert_called_once_with(10, _submit_pin_delivery, args=(delivery_id, 1))
+            self.assertTrue(User.objects.filter(email=self.user_data['email']).exists())
+
+            _deliver_in_thread(delivery_id, retries=1)
+
+        mock_timer.assert_called_once()
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(EmailDelivery.objects.get(id=delivery_id).status, EmailDelivery.FAILED)
+        self.assertFalse(User.objects.filter(email=self.user_data['email']).exists())
+
+    @override_settings(EMAIL_DISPATCH_MODE='sync')
+    @patch('user_module.utils.send_plain_email', return_value=False)
+    def test_sync_mode_keeps_old_failure_response(self, mock_send):
+        response = self.client.post(reverse('register'), self.user_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(User.objects.filter(email=self.user_data['email']).exists())
+
+
+class TokenClaimsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.verify_url = reverse('token_verify')
+        self.user = User.objects.create_user(username='claimuser', email='claim@gmail.com',
+                                             password='ClaimPassword123', is_active=True)
+
+    def login(self):
+        response = self.client.post(reverse('login'), {
+            'email': 'claim@gmail.com', 'password': 'ClaimPassword123'}, format='json')
+        return response.data
+
+    def verify(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return self.client.get(self.verify_url)
+
+    def test_verify_answers_from_claims_without_queries(self):
+        token = self.login()['access']
+
+        with self.assertNumQueries(0):
+            response = self.verify(token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], 'claimuser')
+        self.assertEqual(response.data['email'], 'claim@gmail.com')
+
+    def test_token_and_refresh_endpoints_issue_claims(self):
+        pair = self.client.post(reverse('token'), {
+            'email': 'claim@gmail.com', 'password': 'ClaimPassword123'}, format='json').data
+        self.assertEqual(AccessToken(pair['access'])['username'], 'claimuser')
+
+        refreshed = self.client.post(reverse('token_refresh'), {'refresh': pair['refresh']}, format='json').data
+        self.assertEqual(AccessToken(refreshed['access'])['email'], 'claim@gmail.com')
+
+    def test_token_without_claims_falls_back_to_user_lookup(self):
+        token = AccessToken.for_user(self.user)
+
+        response = self.verify(token)
+
+        self.assertEqual(response.data['username'], 'claimuser')
+
+    @override_settings(JWT_VERIFY_CHECK_USER=True)
+    def test_user_check_is_cached_and_sees_deactivation(self):
+        token = self.login()['access']
+        self.assertEqual(self.verify(token).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.verify(token).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.verify(token).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,90 @@
+# backend/blogify/user_module/tests/test_authentication.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from ..authentication import SHARED_USER_KEY, CachedJWTAuthentication, UserLRUCache, user_cache, user_version
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(username='authuser', email='auth@gmail.com',
+                                             password='AuthPassword123', is_active=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_user_row_is_loaded_once(self):
+        url = reverse('user-blogs')
+        with self.assertNumQueries(2):
+            # The user, then the blog list.
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        url = reverse('user-blogs')
+        self.client.get(url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_not_served_from_cache(self):
+        url = reverse('user-blogs')
+        self.client.get(url)
+
+        self.user.delete()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(USER_AUTH_SHARED_CACHE=True)
+    def test_shared_cache_warms_an_empty_process_cache(self):
+        url = reverse('user-blogs')
+        self.client.get(url)
+        user_cache.clear()
+
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    @override_settings(USER_AUTH_SHARED_CACHE=True)
+    def test_shared_cache_holds_no_secrets(self):
+        self.client.get(reverse('user-blogs'))
+
+        state = cache.get(SHARED_USER_KEY.format(self.user.id, user_version(self.user.id)))
+        self.assertEqual(set(state), {'id', 'email', 'username', 'is_active', 'password_stamp'})
+        self.assertNotIn(self.user.password, state.values())
+
+    def test_cached_user_loads_other_fields_on_access(self):
+        url = reverse('user-blogs')
+        self.client.get(url)
+
+        user = CachedJWTAuthentication().get_user(AccessToken.for_user(self.user))
+        with self.assertNumQueries(0):
+            self.assertEqual((user.id, user.email, user.username), (self.user.id, 'auth@gmail.com', 'authuser'))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.password, self.user.password)
+
+    @override_settings(USER_AUTH_CACHE_TTL=0)
+    def test_zero_ttl_disables_the_cache(self):
+        url = reverse('user-blogs')
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+    def test_lru_is_bounded(self):
+        lru = UserLRUCache(maxsize=2)
+        for user_id in (1, 2, 3):
+            lru.set(user_id, 1, f'user{user_id}', ttl=60)
+
+        self.assertIsNone(lru.get(1, 1))
+        self.assertEqual(lru.get(3, 1), 'user3')
+        self.assertIsNone(lru.get(3, 2))
@@ -0,0 +1,277 @@
+# backend/blogify/user_module/tests/test_email.py
+import json
+import smtplib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.test import TestCase, override_settings
+from unittest.mock import MagicMock, patch
+from ..utils import CircuitBreaker, SMTPConnectionPool, circuit_breakers, send_plain_email, send_plain_email_batch, smtp_pool
+
+
+def reset_circuit_breakers():
+    for breaker in circuit_breakers.values():
+        breaker.reset()
+
+
+def fake_smtp_connection(noop_code=250):
+    connection = MagicMock()
+    connection.connection.noop.return_value = (noop_code, b'OK')
+    connection.send_messages.return_value = 1
+    return connection
+
+
+class SMTPConnectionPoolTests(TestCase):
+
+    def setUp(self):
+        self.pool = SMTPConnectionPool()
+
+    def test_connection_is_reused_between_messages(self):
+        connection = fake_smtp_connection()
+        with patch('user_module.utils.get_connection', return_value=connection) as mock_get_connection:
+            self.assertTrue(self.pool.send(MagicMock()))
+            self.assertTrue(self.pool.send(MagicMock()))
+
+        mock_get_connection.assert_called_once()
+        connection.open.assert_called_once()
+        self.assertEqual(connection.send_messages.call_count, 2)
+
+    @override_settings(EMAIL_CONNECTION_HEALTH_CHECK_INTERVAL=0)
+    def test_unhealthy_idle_connection_is_replaced(self):
+        stale, fresh = fake_smtp_connection(noop_code=421), fake_smtp_connection()
+        with patch('user_module.utils.get_connection', side_effect=[stale, fresh]):
+            self.pool.send(MagicMock())
+            self.pool.send(MagicMock())
+
+        stale.close.assert_called_once()
+        fresh.send_messages.assert_called_once()
+
+    def test_dropped_session_is_reopened_once(self):
+        dropped, fresh = fake_smtp_connection(), fake_smtp_connection()
+        dropped.send_messages.side_effect = smtplib.SMTPServerDisconnected('gone')
+        with patch('user_module.utils.get_connection', side_effect=[dropped, fresh]):
+            self.assertEqual(self.pool.send_many([MagicMock(), MagicMock()]), [True, True])
+
+        self.assertEqual(fresh.send_messages.call_count, 2)
+
+    def test_single_send_raises_when_server_is_unreachable(self):
+        connection = fake_smtp_connection()
+        connection.open.side_effect = OSError(101, 'Network is unreachable')
+        with patch('user_module.utils.get_connection', return_value=connection):
+            with self.assertRaises(OSError):
+                self.pool.send(MagicMock())
+
+    def test_concurrent_senders_do_not_share_a_session(self):
+        started, release = threading.Event(), threading.Event()
+        slow, fast = fake_smtp_connection(), fake_smtp_connection()
+        slow.send_messages.side_effect = lambda messages: started.set() or release.wait(5)
+        with patch('user_module.utils.get_connection', side_effect=[slow, fast]):
+            sender = threading.Thread(target=self.pool.send, args=(MagicMock(),))
+            sender.start()
+            started.wait(5)
+            self.assertTrue(self.pool.send(MagicMock()))
+            self.assertFalse(release.is_set())
+            release.set()
+            sender.join()
+
+        fast.send_messages.assert_called_once()
+
+    def test_refused_recipient_only_fails_that_message(self):
+        connection = fake_smtp_connection()
+        connection.send_messages.side_effect = [1, smtplib.SMTPRecipientsRefused({}), 1]
+        with patch('user_module.utils.get_connection', return_value=connection):
+            self.assertEqual(self.pool.send_many([MagicMock(), MagicMock(), MagicMock()]), [True, False, True])
+
+
+@override_settings(EMAIL_DELIVERY_PROVIDER='smtp', RESEND_API_KEY='', BREVO_API_KEY='')
+class SendPlainEmailBatchTests(TestCase):
+
+    def setUp(self):
+        smtp_pool.close()
+        reset_circuit_breakers()
+
+    def test_batch_maps_results_per_recipient(self):
+        connection = fake_smtp_connection()
+        connection.send_messages.side_effect = [1, 0, 1, 0]
+        with patch('user_module.utils.get_connection', return_value=connection):
+            results = send_plain_email_batch('Subject', 'Body', ['a@gmail.com', 'b@gmail.com', 'c@gmail.com'])
+
+        self.assertEqual(results, {'a@gmail.com': True, 'b@gmail.com': False, 'c@gmail.com': True})
+        self.assertEqual(connection.send_messages.call_count, 3)
+
+
+class ProviderStandIn(BaseHTTPRequestHandler):
+    """Local stand-in for the Resend and Brevo HTTP APIs."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append((self.path, dict(self.headers), body, self.client_address))
+        status_code = self.server.status_codes.pop(0) if self.server.status_codes else 200
+        if status_code is None:
+            # Drop the connection after reading the request, before answering.
+            self.close_connection = True
+            return
+        payload = json.dumps({'data': [{'id': 'x'}]}).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class EmailProviderHTTPTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ProviderStandIn)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.settings_override = override_settings(
+            RESEND_API_URL=base_url, RESEND_API_KEY='re_test', RESEND_FROM_EMAIL='noreply@blogify.test',
+            BREVO_API_URL=base_url + '/v3', BREVO_API_KEY='brevo_test', BREVO_FROM_EMAIL='noreply@blogify.test',
+            RESEND_BATCH_SIZE=2, BREVO_BATCH_SIZE=2,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.status_codes = []
+        reset_circuit_breakers()
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='resend')
+    def test_resend_reuses_one_keep_alive_connection(self):
+        for index in range(3):
+            self.assertTrue(send_plain_email('Subject', 'Body', f'reader{index}@gmail.com'))
+
+        self.assertEqual([request[0] for request in self.server.requests], ['/emails'] * 3)
+        self.assertEqual(len({request[3] for request in self.server.requests}), 1)
+        self.assertEqual(self.server.requests[0][1]['Authorization'], 'Bearer re_test')
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='resend')
+    def test_lost_resend_response_is_retried_with_the_same_idempotency_key(self):
+        self.server.status_codes = [None]
+
+        self.assertTrue(send_plain_email('Subject', 'Body', 'a@gmail.com'))
+
+        self.assertEqual([request[0] for request in self.server.requests], ['/emails'] * 2)
+        keys = {request[1]['Idempotency-Key'] for request in self.server.requests}
+        self.assertEqual(len(keys), 1)
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='brevo')
+    def test_lost_brevo_response_is_not_sent_again(self):
+        self.server.status_codes = [None]
+
+        send_plain_email('Subject', 'Body', 'a@gmail.com')
+
+        self.assertEqual([request[0] for request in self.server.requests], ['/v3/smtp/email', '/emails'])
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='resend')
+    def test_resend_batch_packs_recipients_per_request(self):
+        recipients = [f'reader{index}@gmail.com' for index in range(5)]
+
+        results = send_plain_email_batch('Subject', 'Body', recipients)
+
+        self.assertEqual(results, dict.fromkeys(recipients, True))
+        self.assertEqual([request[0] for request in self.server.requests], ['/emails/batch'] * 3)
+        self.assertEqual([email['to'] for email in self.server.requests[0][2]], [['reader0@gmail.com'], ['reader1@gmail.com']])
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='brevo')
+    def test_brevo_batch_uses_message_versions(self):
+        results = send_plain_email_batch('Subject', 'Body', ['a@gmail.com', 'b@gmail.com'])
+
+        self.assertEqual(results, {'a@gmail.com': True, 'b@gmail.com': True})
+        path, headers, body, _ = self.server.requests[0]
+        self.assertEqual(path, '/v3/smtp/email')
+        self.assertEqual(headers['api-key'], 'brevo_test')
+        self.assertEqual(body['messageVersions'], [{'to': [{'email': 'a@gmail.com'}]}, {'to': [{'email': 'b@gmail.com'}]}])
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='brevo')
+    def test_rejected_batch_falls_back_to_next_provider(self):
+        self.server.status_codes = [400]
+
+        results = send_plain_email_batch('Subject', 'Body', ['a@gmail.com', 'b@gmail.com'])
+
+        self.assertEqual(results, {'a@gmail.com': True, 'b@gmail.com': True})
+        self.assertEqual([request[0] for request in self.server.requests], ['/v3/smtp/email', '/emails/batch'])
+
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='brevo', EMAIL_CIRCUIT_FAILURE_THRESHOLD=2)
+    def test_failing_provider_is_skipped_once_its_circuit_opens(self):
+        self.server.status_codes = [503, 200, 503, 200]
+        send_plain_email('Subject', 'Body', 'a@gmail.com')
+        send_plain_email('Subject', 'Body', 'b@gmail.com')
+        self.server.requests = []
+
+        self.assertTrue(send_plain_email('Subject', 'Body', 'c@gmail.com'))
+
+        self.assertEqual(circuit_breakers['brevo'].state, CircuitBreaker.OPEN)
+        self.assertEqual([request[0] for request in self.server.requests], ['/emails'])
+
+
+@override_settings(EMAIL_CIRCUIT_FAILURE_THRESHOLD=2, EMAIL_CIRCUIT_COOLDOWN=60)
+class CircuitBreakerTests(TestCase):
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker('smtp')
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_half_open_probe_closes_or_reopens(self):
+        breaker = CircuitBreaker('smtp')
+        breaker.record_failure()
+        breaker.record_failure()
+
+        with override_settings(EMAIL_CIRCUIT_COOLDOWN=0):
+            self.assertTrue(breaker.allow())
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        with override_settings(EMAIL_CIRCUIT_COOLDOWN=0):
+            self.assertTrue(breaker.allow())
+            breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_lets_one_probe_through_at_a_time(self):
+        breaker = CircuitBreaker('smtp')
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.opened_at -= 60
+
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.probe_started_at -= 60
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    @override_settings(EMAIL_DELIVERY_PROVIDER='smtp', RESEND_API_KEY='', BREVO_API_KEY='')
+    def test_blocked_smtp_is_not_retried_while_open(self):
+        reset_circuit_breakers()
+        with patch.object(smtp_pool, 'send', side_effect=OSError(101, 'Network is unreachable')) as mock_send:
+            for _ in range(4):
+                self.assertFalse(send_plain_email('Subject', 'Body', 'a@gmail.com'))
+
+        self.assertEqual(mock_send.call_count, 2)
+        reset_circuit_breakers()
@@ -0,0 +1,69 @@
+# backend/blogify/user_module/tests/test_hashing.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password as django_make_password
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from ..hashing import HashingPool, PasswordHashingBusy, check_password, make_password
+
+User = get_user_model()
+
+
+class HashingPoolTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = HashingPool(workers=1, queue_depth=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def setUp(self):
+        patcher = patch('user_module.hashing.get_hashing_pool', return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(email='hash@gmail.com', username='hash',
+                                             password='TestPassword123', is_active=True)
+
+    def test_password_hashed_and_checked_in_worker_process(self):
+        self.assertTrue(self.user.password.startswith('argon2$'))
+        self.assertTrue(check_password(self.user, 'TestPassword123'))
+        self.assertFalse(check_password(self.user, 'wrong-password'))
+
+    def test_worker_processes_are_not_forked_from_the_web_worker(self):
+        self.assertIn(self.pool._get_executor()._mp_context.get_start_method(), ('forkserver', 'spawn'))
+
+    def test_outdated_hash_is_upgraded_after_successful_check(self):
+        self.user.password = django_make_password('TestPassword123', hasher='pbkdf2_sha256')
+        self.user.save()
+
+        self.assertTrue(check_password(self.user, 'TestPassword123'))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('argon2$'))
+
+    def test_full_queue_rejects_instead_of_waiting(self):
+        full = HashingPool(workers=1, queue_depth=0)
+        full._slots.acquire()
+        with self.assertRaises(PasswordHashingBusy):
+            full.run(make_password, 'TestPassword123')
+
+    def test_login_returns_503_when_pool_is_saturated(self):
+        with patch.object(self.pool, 'run', side_effect=PasswordHashingBusy()):
+            response = APIClient().post(reverse('login'), {
+                'email': 'hash@gmail.com', 'password': 'TestPassword123'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(response.data['success'])
+
+    def test_login_succeeds_through_pool(self):
+        response = APIClient().post(reverse('login'), {
+            'email': 'hash@gmail.com', 'password': 'TestPassword123'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
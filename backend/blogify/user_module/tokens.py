@@ -0,0 +1,44 @@
+# backend/blogify/user_module/tokens.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import RefreshToken
+from blogify.metrics import record_cache
+
+User = get_user_model()
+
+USER_STATE_KEY = 'user_module:token_user:{}'
+
+
+def tokens_for_user(user):
+    """Return a refresh token carrying the user's username and email claims.
+
+    The claims are set on the refresh token, so the access token derived from
+    it now, and every one minted later by the refresh endpoint, carries them
+    too. TokenVerifyView can then answer from the signed token alone.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh['username'] = user.username
+    refresh['email'] = user.email
+    return refresh
+
+
+def cached_user_state(user_id):
+    """Return ``{'is_active', 'username', 'email'}`` for ``user_id``, or None.
+
+    Kept for JWT_VERIFY_USER_CACHE_TTL seconds, and dropped as soon as the
+    user is saved or deleted, so deactivation is seen by token verification
+    without a query per call.
+    """
+    key = USER_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    record_cache(state is not None)
+    if state is None:
+        state = (User.objects.filter(id=user_id)
+                 .values('is_active', 'username', 'email').first()) or {}
+        cache.set(key, state, timeout=getattr(settings, 'JWT_VERIFY_USER_CACHE_TTL', 30))
+    return state or None
+
+
+def forget_user_state(user_id):
+    cache.delete(USER_STATE_KEY.format(user_id))
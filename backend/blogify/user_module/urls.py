@@ -1,6 +1,6 @@
 # backend/blogify/user_module/urls.py
 from django.urls import path,include
-from .views import UserLoginView, UserRegistrationView, AccountActivationView,PasswordResetRequestView,PasswordResetConfirmView,TokenVerifyView,UserLogoutView
+from .views import UserLoginView, UserRegistrationView, AccountActivationView,PasswordResetRequestView,PasswordResetConfirmView,TokenVerifyView,UserLogoutView,EmailDeliveryStatusView
 # from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.permissions import AllowAny
@@ -17,6 +17,7 @@ urlpatterns = [
     # path('', include(router.urls)),
     path('auth/password-reset/',PasswordResetRequestView.as_view(), name='password_reset'),
     path('auth/password-reset-confirm/',PasswordResetConfirmView.as_view(), name='password_reset_confirmation'),
+    path('auth/email-delivery/<uuid:delivery_id>/', EmailDeliveryStatusView.as_view(), name='email_delivery_status'),
 
     path('auth/token/', TokenObtainPairView.as_view(), name='token'), 
     path('auth/token/verify/',  TokenVerifyView.as_view(), name='token_verify'), 
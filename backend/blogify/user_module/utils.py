@@ -1,109 +1,482 @@
 # backend/blogify/user_module/utils.py
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
-from .models import CustomUser
+from django.db import connection as db_connection, transaction
+from .models import CustomUser, EmailDelivery
+from concurrent.futures import ThreadPoolExecutor
 from django.utils.crypto import get_random_string
+import atexit
+import http.client
 import json
 import logging
-import urllib.error
-import urllib.request
+import os
+import select
+import smtplib
+import threading
+import time
+import urllib.parse
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Errors after which the pooled SMTP session is unusable and worth reopening.
+SMTP_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+# SMTP errors about one message rather than the server; they do not count
+# against the SMTP circuit breaker.
+SMTP_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class CircuitBreaker:
+    """Per-process health of one delivery provider.
+
+    After EMAIL_CIRCUIT_FAILURE_THRESHOLD consecutive provider failures the
+    circuit opens and the provider is skipped without a network call. After
+    EMAIL_CIRCUIT_COOLDOWN seconds it goes half-open: the next send is let
+    through as a probe, which closes the circuit on success or re-opens it
+    for another cooldown on failure. Other sends are refused while the
+    probe is in flight.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.probe_started_at = 0.0
+
+    def allow(self):
+        with self._lock:
+            cooldown = getattr(settings, 'EMAIL_CIRCUIT_COOLDOWN', 60)
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN and self.probe_in_flight:
+                # A probe that never reported back (its caller gave up before
+                # sending) stops blocking after another cooldown.
+                if time.monotonic() - self.probe_started_at < cooldown:
+                    return False
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = True
+                self.probe_started_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.probe_in_flight = False
+            self.failures += 1
+            threshold = getattr(settings, 'EMAIL_CIRCUIT_FAILURE_THRESHOLD', 3)
+            if self.state == self.HALF_OPEN or self.failures >= threshold:
+                if self.state != self.OPEN:
+                    logger.warning('Opening %s email circuit after %s consecutive failures.', self.name, self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+circuit_breakers = {name: CircuitBreaker(name) for name in ('smtp', 'resend', 'brevo')}
+
+
+class SMTPConnectionPool:
+    """Reusable mail connections, shared by the threads of a worker process.
+
+    Opening an SMTP session (TCP, STARTTLS, AUTH) costs several round trips,
+    so sessions are kept open between messages. A sender checks a session
+    out for its messages and hands it back afterwards; the lock only guards
+    the list of idle sessions, so concurrent senders never wait on each
+    other's SMTP conversation. A NOOP health check runs when a session has
+    been idle for EMAIL_CONNECTION_HEALTH_CHECK_INTERVAL seconds, and a
+    dropped session is reopened once before giving up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = []
+        self._pid = None
+
+    def _is_healthy(self, connection, last_used):
+        idle = time.monotonic() - last_used
+        if idle < getattr(settings, 'EMAIL_CONNECTION_HEALTH_CHECK_INTERVAL', 30):
+            return True
+        # Non-SMTP backends (console, locmem) have no session to check.
+        smtp = getattr(connection, 'connection', False)
+        if smtp is False:
+            return True
+        if smtp is None:
+            return False
+        try:
+            return smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the inherited sockets belong to the parent.
+                self._idle = []
+                self._pid = os.getpid()
+            connection, last_used = self._idle.pop() if self._idle else (None, 0.0)
+        if connection is not None and not self._is_healthy(connection, last_used):
+            self._discard(connection)
+            connection = None
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+        return connection
+
+    def _checkin(self, connection):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._discard(connection)
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def send(self, email_message):
+        return self.send_many([email_message])[0]
+
+    def send_many(self, email_messages):
+        """Send each message over one pooled session; returns a list of bools.
+
+        A session that drops mid-send is reopened once per message. Errors
+        that concern one message, such as a refused recipient, only mark that
+        message as failed. If the server cannot be reached at all, the
+        remaining messages are marked failed, and if nothing was sent yet the
+        error is raised so callers can move on to another provider.
+        """
+        single = len(email_messages) == 1
+        results = []
+        connection = None
+        try:
+            for email_message in email_messages:
+                sent = False
+                for attempt in (1, 2):
+                    if connection is None:
+                        try:
+                            connection = self._checkout()
+                        except Exception:
+                            if not results:
+                                raise
+                            logger.exception('Could not reopen SMTP session; %s messages left unsent',
+                                             len(email_messages) - len(results))
+                            return results + [False] * (len(email_messages) - len(results))
+                    try:
+                        sent = bool(connection.send_messages([email_message]))
+                        break
+                    except SMTP_CONNECTION_ERRORS as exc:
+                        self._discard(connection)
+                        connection = None
+                        if attempt == 2:
+                            if single:
+                                raise
+                            logger.warning('SMTP session lost while sending to %s: %s', email_message.to, exc)
+                    except Exception as exc:
+                        if single:
+                            raise
+                        logger.exception('Failed to send email to %s via SMTP: %s', email_message.to, exc)
+                        break
+                results.append(sent)
+        finally:
+            if connection is not None:
+                self._checkin(connection)
+        return results
+
+
+smtp_pool = SMTPConnectionPool()
+atexit.register(smtp_pool.close)
+
+
+def _smtp_from_email():
+    return settings.DEFAULT_FROM_EMAIL or settings.EMAIL_HOST_USER
+
 
 def _send_with_smtp(subject, message, recipient_email):
-    from_email = settings.DEFAULT_FROM_EMAIL or settings.EMAIL_HOST_USER
-    send_mail(
-        subject,
-        message,
-        from_email,
-        [recipient_email],
-        fail_silently=False,
-    )
-    return True
+    try:
+        sent = smtp_pool.send(EmailMessage(subject, message, _smtp_from_email(), [recipient_email]))
+    except SMTP_MESSAGE_ERRORS:
+        circuit_breakers['smtp'].record_success()
+        raise
+    except Exception:
+        circuit_breakers['smtp'].record_failure()
+        raise
+    circuit_breakers['smtp'].record_success()
+    return sent
+
+
+class KeepAliveHTTPClient:
+    """Persistent HTTP/1.1 connections to one email provider API.
+
+    Requests reuse open TCP/TLS sessions instead of paying a new handshake
+    per recipient. Like SMTPConnectionPool, a caller checks a session out
+    for one request, so concurrent callers each get their own. Use one
+    client per API host.
+    """
+
+    RECONNECT_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                        http.client.BadStatusLine, ConnectionError)
+
+    def __init__(self, base_url):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self._lock = threading.Lock()
+        self._idle = []
+        self._pid = None
+
+    def _is_stale(self, connection):
+        # An idle session has nothing to read unless the server closed it.
+        if connection.sock is None:
+            return False
+        try:
+            return bool(select.select([connection.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def _checkout(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the inherited sockets belong to the parent.
+                self._idle = []
+                self._pid = os.getpid()
+            connection = self._idle.pop() if self._idle else None
+        if connection is not None and self._is_stale(connection):
+            connection.close()
+            connection = None
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            connection = connection_class(self.host, self.port, timeout=getattr(settings, 'EMAIL_TIMEOUT', 10))
+        return connection
+
+    def _checkin(self, connection):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def post_json(self, path, payload, headers, idempotency_key=None):
+        """POST ``payload`` as JSON; returns ``(status, decoded_json_or_text)``.
+
+        A session the server dropped while the request was being sent is
+        reopened and the request sent once more. A session lost while
+        waiting for the response is only retried with an ``idempotency_key``:
+        the server may already have acted on the request, and the key lets
+        it recognise the repeat instead of sending the email twice.
+        """
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json', **headers}
+        if idempotency_key:
+            headers['Idempotency-Key'] = idempotency_key
+        for attempt in (1, 2):
+            connection = self._checkout()
+            sent = False
+            try:
+                connection.request('POST', self.base_path + path, body=body, headers=headers)
+                sent = True
+                response = connection.getresponse()
+                content = response.read().decode('utf-8', errors='replace')
+            except self.RECONNECT_ERRORS:
+                connection.close()
+                if attempt == 2 or (sent and not idempotency_key):
+                    raise
+                continue
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(connection)
+            try:
+                return response.status, json.loads(content)
+            except ValueError:
+                return response.status, content
 
 
-def _send_with_resend(subject, message, recipient_email):
+_http_clients = {}
+_http_clients_lock = threading.Lock()
+
+
+def _http_client(base_url):
+    with _http_clients_lock:
+        client = _http_clients.get(base_url)
+        if client is None:
+            client = _http_clients[base_url] = KeepAliveHTTPClient(base_url)
+        return client
+
+
+def _resend_config():
     api_key = getattr(settings, 'RESEND_API_KEY', '')
     from_email = getattr(settings, 'RESEND_FROM_EMAIL', '') or getattr(settings, 'DEFAULT_FROM_EMAIL', '')
 
     if not api_key or not from_email:
         logger.error('Resend fallback is not configured. Set RESEND_API_KEY and RESEND_FROM_EMAIL.')
-        return False
+        return None
+    return api_key, from_email
 
-    payload = json.dumps({
-        'from': from_email,
-        'to': [recipient_email],
-        'subject': subject,
-        'text': message,
-    }).encode('utf-8')
-
-    request = urllib.request.Request(
-        'https://api.resend.com/emails',
-        data=payload,
-        headers={
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json',
-        },
-        method='POST',
-    )
 
+def _post_to_provider(provider, base_url, path, payload, headers, recipients_label, idempotency_key=None):
+    breaker = circuit_breakers[provider.lower()]
     try:
-        with urllib.request.urlopen(request, timeout=getattr(settings, 'EMAIL_TIMEOUT', 10)) as response:
-            if 200 <= response.status < 300:
-                return True
-            logger.error('Resend API returned status %s for %s', response.status, recipient_email)
-    except urllib.error.HTTPError as exc:
-        details = exc.read().decode('utf-8', errors='replace')
-        logger.error('Resend API HTTP error %s for %s: %s', exc.code, recipient_email, details)
+        status_code, content = _http_client(base_url).post_json(path, payload, headers, idempotency_key)
     except Exception as exc:
-        logger.exception('Failed to send activation PIN via Resend to %s: %s', recipient_email, exc)
+        breaker.record_failure()
+        logger.exception('Failed to send email via %s to %s: %s', provider, recipients_label, exc)
+        return False
 
+    # Rate limiting, bad credentials and server errors mean the provider is
+    # unusable right now; other 4xx responses only concern this request.
+    if status_code in (401, 403, 429) or status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if 200 <= status_code < 300:
+        return True
+    logger.error('%s API returned status %s for %s: %s', provider, status_code, recipients_label, content)
     return False
 
 
-def _send_with_brevo(subject, message, recipient_email):
+def _send_with_resend(subject, message, recipient_email):
+    config = _resend_config()
+    if config is None:
+        return False
+    api_key, from_email = config
+
+    return _post_to_provider(
+        'Resend', settings.RESEND_API_URL, '/emails',
+        {
+            'from': from_email,
+            'to': [recipient_email],
+            'subject': subject,
+            'text': message,
+        },
+        {'Authorization': f'Bearer {api_key}'},
+        recipient_email,
+        # Resend ignores a repeated key, so a lost response can be retried.
+        idempotency_key=uuid.uuid4().hex,
+    )
+
+
+def _send_batch_with_resend(subject, message, recipient_emails):
+    """Send through /emails/batch, which takes up to 100 emails per request."""
+    config = _resend_config()
+    if config is None:
+        return {}
+    api_key, from_email = config
+
+    results = {}
+    batch_size = getattr(settings, 'RESEND_BATCH_SIZE', 100)
+    for start in range(0, len(recipient_emails), batch_size):
+        chunk = recipient_emails[start:start + batch_size]
+        if not circuit_breakers['resend'].allow():
+            results.update(dict.fromkeys(chunk, False))
+            continue
+        delivered = _post_to_provider(
+            'Resend', settings.RESEND_API_URL, '/emails/batch',
+            [{'from': from_email, 'to': [recipient_email], 'subject': subject, 'text': message}
+             for recipient_email in chunk],
+            {'Authorization': f'Bearer {api_key}'},
+            f'{len(chunk)} recipients',
+            idempotency_key=uuid.uuid4().hex,
+        )
+        # Resend validates a batch as a whole: it is accepted or rejected
+        # for every recipient in it.
+        results.update(dict.fromkeys(chunk, delivered))
+    return results
+
+
+def _brevo_config():
     api_key = getattr(settings, 'BREVO_API_KEY', '')
     sender_email = getattr(settings, 'BREVO_FROM_EMAIL', '') or getattr(settings, 'DEFAULT_FROM_EMAIL', '')
     sender_name = getattr(settings, 'BREVO_SENDER_NAME', 'Blogify')
 
     if not api_key or not sender_email:
         logger.error('Brevo fallback is not configured. Set BREVO_API_KEY and BREVO_FROM_EMAIL.')
-        return False
+        return None
+    return api_key, {'name': sender_name, 'email': sender_email}
 
-    payload = json.dumps({
-        'sender': {
-            'name': sender_name,
-            'email': sender_email,
-        },
-        'to': [{'email': recipient_email}],
-        'subject': subject,
-        'textContent': message,
-    }).encode('utf-8')
-
-    request = urllib.request.Request(
-        'https://api.brevo.com/v3/smtp/email',
-        data=payload,
-        headers={
-            'api-key': api_key,
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
+
+def _send_with_brevo(subject, message, recipient_email):
+    config = _brevo_config()
+    if config is None:
+        return False
+    api_key, sender = config
+
+    return _post_to_provider(
+        'Brevo', settings.BREVO_API_URL, '/smtp/email',
+        {
+            'sender': sender,
+            'to': [{'email': recipient_email}],
+            'subject': subject,
+            'textContent': message,
         },
-        method='POST',
+        {'api-key': api_key},
+        recipient_email,
     )
 
-    try:
-        with urllib.request.urlopen(request, timeout=getattr(settings, 'EMAIL_TIMEOUT', 10)) as response:
-            if 200 <= response.status < 300:
-                return True
-            logger.error('Brevo API returned status %s for %s', response.status, recipient_email)
-    except urllib.error.HTTPError as exc:
-        details = exc.read().decode('utf-8', errors='replace')
-        logger.error('Brevo API HTTP error %s for %s: %s', exc.code, recipient_email, details)
-    except Exception as exc:
-        logger.exception('Failed to send activation PIN via Brevo to %s: %s', recipient_email, exc)
 
-    return False
+def _send_batch_with_brevo(subject, message, recipient_emails):
+    """Send through messageVersions, up to 1000 recipients per request."""
+    config = _brevo_config()
+    if config is None:
+        return {}
+    api_key, sender = config
+
+    results = {}
+    batch_size = getattr(settings, 'BREVO_BATCH_SIZE', 1000)
+    for start in range(0, len(recipient_emails), batch_size):
+        chunk = recipient_emails[start:start + batch_size]
+        if not circuit_breakers['brevo'].allow():
+            results.update(dict.fromkeys(chunk, False))
+            continue
+        delivered = _post_to_provider(
+            'Brevo', settings.BREVO_API_URL, '/smtp/email',
+            {
+                'sender': sender,
+                'subject': subject,
+                'textContent': message,
+                'messageVersions': [{'to': [{'email': recipient_email}]} for recipient_email in chunk],
+            },
+            {'api-key': api_key},
+            f'{len(chunk)} recipients',
+        )
+        # Like Resend, Brevo accepts or rejects all versions of a request.
+        results.update(dict.fromkeys(chunk, delivered))
+    return results
 
 
 def _log_render_smtp_hint(exc):
@@ -116,7 +489,7 @@ def _log_render_smtp_hint(exc):
         )
 
 
-def send_plain_email(subject, message, recipient_email):
+def _delivery_order():
     provider = getattr(settings, 'EMAIL_DELIVERY_PROVIDER', 'smtp').lower()
     if provider not in {'smtp', 'resend', 'brevo'}:
         logger.warning('Unknown EMAIL_DELIVERY_PROVIDER=%s. Falling back to smtp.', provider)
@@ -127,19 +500,46 @@ def send_plain_email(subject, message, recipient_email):
         'resend': ['resend', 'brevo', 'smtp'],
         'brevo': ['brevo', 'resend', 'smtp'],
     }
-    delivery_order = fallback_routes[provider]
+    return fallback_routes[provider]
+
+
+def _send_batch_with_smtp(subject, message, recipient_emails):
+    from_email = _smtp_from_email()
+    email_messages = [EmailMessage(subject, message, from_email, [recipient_email])
+                      for recipient_email in recipient_emails]
+    try:
+        sent = smtp_pool.send_many(email_messages)
+    except Exception as exc:
+        circuit_breakers['smtp'].record_failure()
+        _log_render_smtp_hint(exc)
+        logger.exception('SMTP batch send failed: %s', exc)
+        return {}
+    circuit_breakers['smtp'].record_success()
+    return dict(zip(recipient_emails, sent))
+
+
+def _provider_available(delivery_provider):
+    if delivery_provider == 'brevo' and not getattr(settings, 'BREVO_API_KEY', ''):
+        return False
+    if delivery_provider == 'resend' and not getattr(settings, 'RESEND_API_KEY', ''):
+        return False
+    if not circuit_breakers[delivery_provider].allow():
+        logger.info('Skipping %s email delivery: circuit is open after repeated failures.', delivery_provider)
+        return False
+    return True
+
+
+def send_plain_email(subject, message, recipient_email):
+    for delivery_provider in _delivery_order():
+        if not _provider_available(delivery_provider):
+            continue
 
-    for delivery_provider in delivery_order:
         if delivery_provider == 'brevo':
-            if not getattr(settings, 'BREVO_API_KEY', ''):
-                continue
             if _send_with_brevo(subject, message, recipient_email):
                 return True
             continue
 
         if delivery_provider == 'resend':
-            if not getattr(settings, 'RESEND_API_KEY', ''):
-                continue
             if _send_with_resend(subject, message, recipient_email):
                 return True
             continue
@@ -155,15 +555,171 @@ def send_plain_email(subject, message, recipient_email):
     return False
 
 
-def send_pin_number(user):
+def send_plain_email_batch(subject, message, recipient_emails):
+    """Send the same message to many recipients; returns {email: delivered}.
+
+    Providers are tried in the same order as send_plain_email, each with its
+    bulk path: one pooled SMTP session, or batch API requests for Resend and
+    Brevo. Only recipients a provider failed to reach move on to the next one.
+    """
+    recipient_emails = list(recipient_emails)
+    results = dict.fromkeys(recipient_emails, False)
+    batch_senders = {
+        'smtp': _send_batch_with_smtp,
+        'resend': _send_batch_with_resend,
+        'brevo': _send_batch_with_brevo,
+    }
+
+    pending = recipient_emails
+    for delivery_provider in _delivery_order():
+        if not pending:
+            break
+        if not _provider_available(delivery_provider):
+            continue
+
+        for recipient_email, delivered in batch_senders[delivery_provider](subject, message, pending).items():
+            if delivered:
+                results[recipient_email] = True
+        pending = [recipient_email for recipient_email in pending if not results[recipient_email]]
+
+    if pending:
+        logger.error('All email delivery methods failed for %s of %s recipients', len(pending), len(recipient_emails))
+    return results
+
+
+def _pin_email(pin):
+    subject = 'Your PIN number to activate your account'
+    message = f'Your activation PIN is {pin}. Do not share it with anyone.'
+    return subject, message
+
+
+def _assign_pin(user):
     pin = get_random_string(length=6, allowed_chars='ABIR0123456789')
     user.activation_pin = pin
     user.save()
-    subject = 'Your PIN number to activate your account'
-    message = f'Your activation PIN is {pin}. Do not share it with anyone.'
+    return pin
+
+
+def send_pin_number(user):
+    pin = _assign_pin(user)
+    subject, message = _pin_email(pin)
     return send_plain_email(subject, message, user.email)
 
 
+def deliver_pin_email(delivery_id):
+    """Make one delivery attempt for an EmailDelivery; returns True once sent."""
+    try:
+        delivery = EmailDelivery.objects.select_related('user').get(id=delivery_id)
+    except EmailDelivery.DoesNotExist:
+        return False
+    if delivery.status != EmailDelivery.PENDING or delivery.user is None:
+        return delivery.status == EmailDelivery.SENT
+
+    subject, message = _pin_email(delivery.user.activation_pin)
+    sent = send_plain_email(subject, message, delivery.email)
+    delivery.attempts += 1
+    if sent:
+        delivery.status = EmailDelivery.SENT
+    delivery.save(update_fields=['attempts', 'status', 'updated_at'])
+    return sent
+
+
+def fail_pin_delivery(delivery_id):
+    """Mark a delivery failed and undo what depended on it.
+
+    A registration whose activation PIN never arrived is removed (unless the
+    user somehow activated meanwhile), so the address can register again.
+    A password reset only keeps the failed status for the client to see.
+    """
+    delivery = EmailDelivery.objects.select_related('user').filter(id=delivery_id).first()
+    if delivery is None or delivery.status != EmailDelivery.PENDING:
+        return
+    delivery.status = EmailDelivery.FAILED
+    delivery.save(update_fields=['status', 'updated_at'])
+    logger.error('Giving up on %s email to %s after %s attempts', delivery.purpose, delivery.email, delivery.attempts)
+
+    if delivery.purpose == EmailDelivery.ACTIVATION and delivery.user and not delivery.user.is_active:
+        delivery.user.delete()
+
+
+def pin_retry_countdown(retries):
+    """Seconds before retrying a PIN email that failed ``retries + 1`` times."""
+    # Back off 10s, 20s, 40s... before trying the provider chain again.
+    return 10 * 2 ** retries
+
+
+def _deliver_in_thread(delivery_id, retries=0):
+    # The in-process counterpart of tasks.send_pin_email, with the same
+    # retries before the delivery is given up on.
+    try:
+        if deliver_pin_email(delivery_id):
+            return
+        if retries < getattr(settings, 'EMAIL_DISPATCH_MAX_RETRIES', 3):
+            # Wait on a timer, not in a pool thread that new deliveries need.
+            timer = threading.Timer(pin_retry_countdown(retries), _submit_pin_delivery, args=(delivery_id, retries + 1))
+            timer.daemon = True
+            timer.start()
+            return
+        fail_pin_delivery(delivery_id)
+    except Exception as exc:
+        logger.exception('PIN email delivery %s crashed: %s', delivery_id, exc)
+    finally:
+        db_connection.close()
+
+
+_dispatch_executor = None
+_dispatch_executor_pid = None
+_dispatch_executor_lock = threading.Lock()
+
+
+def _get_dispatch_executor():
+    global _dispatch_executor, _dispatch_executor_pid
+    with _dispatch_executor_lock:
+        if _dispatch_executor is None or _dispatch_executor_pid != os.getpid():
+            _dispatch_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'EMAIL_DISPATCH_THREADS', 4),
+                thread_name_prefix='pin-email',
+            )
+            _dispatch_executor_pid = os.getpid()
+        return _dispatch_executor
+
+
+def _submit_pin_delivery(delivery_id, retries=0):
+    _get_dispatch_executor().submit(_deliver_in_thread, delivery_id, retries)
+
+
+def _enqueue_pin_delivery(delivery_id):
+    if getattr(settings, 'ENABLE_CELERY', False):
+        from .tasks import send_pin_email
+        try:
+            send_pin_email.delay(str(delivery_id))
+            return
+        except Exception as exc:
+            logger.warning('PIN email task enqueue failed, sending in-process instead: %s', exc)
+    _submit_pin_delivery(delivery_id)
+
+
+def dispatch_pin_email(user, purpose):
+    """Assign a fresh PIN and send it to ``user`` according to EMAIL_DISPATCH_MODE.
+
+    In ``async`` mode (the default) the email goes to a Celery task, or to an
+    in-process thread pool when ENABLE_CELERY is off, once the surrounding
+    transaction commits. The returned EmailDelivery is still pending at that
+    point. In ``sync`` mode it is sent inline and comes back sent or failed.
+    """
+    _assign_pin(user)
+    delivery = EmailDelivery.objects.create(user=user, email=user.email, purpose=purpose)
+
+    if getattr(settings, 'EMAIL_DISPATCH_MODE', 'async') == 'sync':
+        if not deliver_pin_email(delivery.id):
+            fail_pin_delivery(delivery.id)
+        delivery.refresh_from_db()
+        return delivery
+
+    transaction.on_commit(lambda: _enqueue_pin_delivery(delivery.id))
+    return delivery
+
+
 def account_activate(email, pin):
 
     try:
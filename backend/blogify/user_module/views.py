@@ -1,5 +1,6 @@
 # backend/blogify/user_module/views.py
 from django.shortcuts import render
+from django.conf import settings
 # from .models import CustomUser
 from rest_framework.generics import CreateAPIView
 from rest_framework import serializers,status,viewsets
@@ -7,13 +8,22 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model, authenticate, logout
 from .serializers import UserRegistrationSerializer, ActivationSerializer
-from .utils import account_activate,send_pin_number
-from rest_framework_simplejwt.tokens import RefreshToken
+from .utils import account_activate,dispatch_pin_email
+from .models import EmailDelivery
+from .hashing import PasswordHashingBusy, check_password, make_password
+from .tokens import cached_user_state, tokens_for_user
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.exceptions import ValidationError
 
 User = get_user_model()
+
+def hashing_busy_response(exc):
+    return Response({
+        'success': False,
+        'message': str(exc.detail),
+    }, status=exc.status_code, headers={'Retry-After': str(exc.retry_after)})
+
 class UserRegistrationView(CreateAPIView):
     permission_classes = [AllowAny]
 
@@ -27,10 +37,10 @@ class UserRegistrationView(CreateAPIView):
             # print(f'perform_create called')
             user = serializer.save()
             # print(f'user - {user} , {user.password}')
-            pin_sent = send_pin_number(user)
+            delivery = dispatch_pin_email(user, EmailDelivery.ACTIVATION)
 
-            if not pin_sent:
-                user.delete()
+            if delivery.status == EmailDelivery.FAILED:
+                # fail_pin_delivery has already removed the inactive user.
                 return Response({
                     'success': False,
                     'message': 'Registration failed because activation email could not be sent. Please try again later.',
@@ -40,7 +50,9 @@ class UserRegistrationView(CreateAPIView):
             return Response({
                     'success': True,
                     'message': 'Registration successful! Please check your email to activate your account.',
-                    'pin_sent': True,
+                    'pin_sent': delivery.status == EmailDelivery.SENT,
+                    'delivery_id': str(delivery.id),
+                    'delivery_status': delivery.status,
                     'username': user.username,
                     'email': user.email,
             }, status=status.HTTP_200_OK)
@@ -49,6 +61,8 @@ class UserRegistrationView(CreateAPIView):
                 'success': False,
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
+        except PasswordHashingBusy as e:
+            return hashing_busy_response(e)
         
 
 class AccountActivationView(APIView):
@@ -95,10 +109,13 @@ class UserLoginView(APIView):
         # print(f'userpassword - {user.password}')
         # print(f'check_password - {user.check_password(password)}')
         
-        if user.check_password(password) and user.is_active:
-            refresh = RefreshToken.for_user(user)
-            access_token = refresh.access_token
-            access_token['username'] = user.username
+        try:
+            password_ok = check_password(user, password)
+        except PasswordHashingBusy as e:
+            return hashing_busy_response(e)
+
+        if password_ok and user.is_active:
+            refresh = tokens_for_user(user)
             return Response({
                 'success':True,
                 'message':'Login successful',
@@ -126,10 +143,31 @@ class PasswordResetRequestView(APIView):
         except User.DoesNotExist:
             return Response({"error": "Email does not exist."}, status=status.HTTP_400_BAD_REQUEST)
         
-        pin_sent = send_pin_number(user)
-        if not pin_sent:
+        delivery = dispatch_pin_email(user, EmailDelivery.PASSWORD_RESET)
+        if delivery.status == EmailDelivery.FAILED:
             return Response({"error": "Could not send reset email right now. Please try again later."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-        return Response({"message":"Password reset PIN sent to your email address."},status=status.HTTP_200_OK)
+        return Response({
+            "message":"Password reset PIN sent to your email address.",
+            "delivery_id": str(delivery.id),
+            "delivery_status": delivery.status,
+        },status=status.HTTP_200_OK)
+
+class EmailDeliveryStatusView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, delivery_id):
+        # The id is an unguessable UUID handed out only in the register/reset
+        # response, and the payload reveals nothing beyond the delivery state.
+        try:
+            delivery = EmailDelivery.objects.get(id=delivery_id)
+        except EmailDelivery.DoesNotExist:
+            return Response({"error": "Delivery not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "delivery_id": str(delivery.id),
+            "purpose": delivery.purpose,
+            "status": delivery.status,
+            "attempts": delivery.attempts,
+        }, status=status.HTTP_200_OK)
     
 class PasswordResetConfirmView(APIView):
     permission_classes = [AllowAny]
@@ -151,7 +189,10 @@ class PasswordResetConfirmView(APIView):
                 {"error":"Invalid pin number."}, 
                 status=status.HTTP_400_BAD_REQUEST)
         
-        user.set_password(new_password)
+        try:
+            user.password = make_password(new_password)
+        except PasswordHashingBusy as e:
+            return hashing_busy_response(e)
         user.activation_pin = ''
         user.save()
 
@@ -173,23 +214,30 @@ class TokenVerifyView(APIView):
         try:
             token = token_header.split(" ")[1]  
             decoded_token = JWTAuthentication().get_validated_token(token)
+        except Exception as e:
+            return Response({"error": "Invalid or expired token"}, status=status.HTTP_401_UNAUTHORIZED)
 
-            user_id = decoded_token.get('user_id')
-            if user_id:
-                try:
-                    user = User.objects.get(id=user_id)
-                    return Response({
-                        "message":"Token is valid",
-                        'username': user.username,
-                        'email': user.email
-                    }, status=status.HTTP_200_OK)
-                except User.DoesNotExist:
-                    return Response({"error":"User not found"}, status=status.HTTP_404_NOT_FOUND)
-            
+        user_id = decoded_token.get('user_id')
+        if not user_id:
             return Response({"message": "Token is valid"}, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            return Response({"error": "Invalid or expired token"}, status=status.HTTP_401_UNAUTHORIZED)
+        username = decoded_token.get('username')
+        email = decoded_token.get('email')
+        if getattr(settings, 'JWT_VERIFY_CHECK_USER', False) or username is None or email is None:
+            # Revocation check, and the only source of the profile for tokens
+            # issued before the claims existed. Served from a short-TTL cache.
+            user_state = cached_user_state(user_id)
+            if user_state is None:
+                return Response({"error":"User not found"}, status=status.HTTP_404_NOT_FOUND)
+            if not user_state['is_active']:
+                return Response({"error": "Invalid or expired token"}, status=status.HTTP_401_UNAUTHORIZED)
+            username, email = user_state['username'], user_state['email']
+
+        return Response({
+            "message":"Token is valid",
+            'username': username,
+            'email': email
+        }, status=status.HTTP_200_OK)
 
 class UserLogoutView(APIView):
     permission_classes = [AllowAny]
@@ -257,7 +257,7 @@ const BlogList = () => {
                       </div>
                       
                       <h3 className="text-lg font-bold mb-2 text-gray-800 mt-1">{blog.title}</h3>
-                      <p className="text-gray-600 mb-3 line-clamp-3 text-sm">{blog.content.slice(0, 30)}...</p>
+                      <p className="text-gray-600 mb-3 line-clamp-3 text-sm">{blog.excerpt.slice(0, 30)}...</p>
                       
                       <div className="text-xs text-gray-500 mt-1">
                         <p>Created {moment(blog.created_at).fromNow()}</p>
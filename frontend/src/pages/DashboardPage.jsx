@@ -140,7 +140,7 @@ const DashboardPage = () => {
                   )}
                   <div className="p-4 xs:p-5">
                     <h3 className="text-base xs:text-xl font-medium mb-2 text-black line-clamp-2">{blog.title}</h3>
-                    <p className="text-gray-800 text-sm xs:text-base mb-4 line-clamp-3">{blog.content.slice(0, 150)}...</p>
+                    <p className="text-gray-800 text-sm xs:text-base mb-4 line-clamp-3">{blog.excerpt.slice(0, 150)}...</p>
                     <div className="flex items-center justify-between">
                       <div className="flex items-center gap-3">
                         <span className="bg-gray-100 text-gray-700 text-xs xs:text-sm px-2 py-1 rounded">